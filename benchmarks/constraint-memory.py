@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+# This script measures how much memory it takes to build a model with many
+# linear constraints, with and without scip.solver(lean=True).  In lean
+# mode constraints don't keep their own copies of coefficients, so most of
+# the memory should be SCIP's.
+#
+# Each mode runs in a fresh process so peak resident set sizes don't get
+# mixed up.  The first argument is the number of constraints, which
+# defaults to 10000, and the second is the number of terms in each, which
+# defaults to 100.  Every constraint uses the same variables.
+
+from zibopt import scip
+import resource, subprocess, sys
+
+def peak_kb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def build(rows, terms, lean):
+    before = peak_kb()
+
+    solver = scip.solver(lean=lean)
+    x = [solver.variable() for _ in range(terms)]
+    for i in range(rows):
+        solver += sum((j+i) % 7 * v for j, v in enumerate(x)) <= terms
+
+    return peak_kb() - before
+
+if __name__ == '__main__':
+    rows  = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    terms = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    if len(sys.argv) > 3:
+        # Child process: build the model and report peak memory growth
+        print(build(rows, terms, sys.argv[3] == 'lean'))
+
+    else:
+        print('%d constraints x %d terms' % (rows, terms))
+        for mode in ('default', 'lean'):
+            kb = int(subprocess.check_output(
+                [sys.executable, __file__, str(rows), str(terms), mode]
+            ))
+            print('%-8s %10.1f MB' % (mode, kb / 1024.0))
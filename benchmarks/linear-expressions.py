@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+# This script compares ways of building a single long linear constraint:
+#
+# 1. sum(...) over python-algebraic expressions, which copies every term
+#    on every addition
+# 2. scip.quicksum(...) over the same expressions
+# 3. scip.linexpr(...) built directly from a variable block and an array
+#    of coefficients
+#
+# Times include adding the constraint to the solver.  Rows have 10, 1000,
+# and 100000 terms.  sum(...) takes quadratic time, so it is skipped for
+# rows longer than 10000 terms unless the --slow flag is given.
+
+from array import array
+from timeit import default_timer
+from zibopt import scip
+import sys
+
+def with_sum(solver, x, c):
+    solver += sum(c[i] * x[i] for i in range(len(x))) <= 1
+
+def with_quicksum(solver, x, c):
+    solver += scip.quicksum(c[i] * x[i] for i in range(len(x))) <= 1
+
+def with_linexpr(solver, x, c):
+    solver += scip.linexpr(x, c) <= 1
+
+if __name__ == '__main__':
+    slow = '--slow' in sys.argv
+
+    print('%-14s %10s %12s' % ('method', 'terms', 'seconds'))
+    for n in (10, 1000, 100000):
+        for f in (with_sum, with_quicksum, with_linexpr):
+            if f is with_sum and n > 10000 and not slow:
+                print('%-14s %10d %12s' % (f.__name__, n, 'skipped'))
+                continue
+
+            solver = scip.solver()
+            x = solver.add_variables(n)
+            c = array('d', (i % 10 + 1 for i in range(n)))
+
+            # Make sure variable objects exist before timing anything
+            for i in range(n):
+                x[i]
+
+            start = default_timer()
+            f(solver, x, c)
+            print('%-14s %10d %12.4f' % (f.__name__, n, default_timer() - start))
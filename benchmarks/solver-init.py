@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+# This script measures how long it takes to construct a scip.solver.  For
+# models with only a handful of variables, this can be most of the total
+# time spent per model, so it is worth tracking across releases.
+#
+# Three cases are timed:
+#
+# 1. Constructing a solver and throwing it away
+# 2. Constructing a solver and changing a single setting
+# 3. Constructing a solver and touching every setting object
+#
+# The first argument is the number of solvers to construct for each case.
+# It defaults to 1000.
+
+from timeit import timeit
+from zibopt import scip
+import sys
+
+def construct():
+    scip.solver()
+
+def one_setting():
+    solver = scip.solver()
+    solver.heuristics['octane'].priority = 500
+
+def all_settings():
+    solver = scip.solver()
+    for settings in (solver.branching, solver.conflict, solver.display,
+                     solver.heuristics, solver.presolvers, solver.propagators,
+                     solver.selectors, solver.separators):
+        for s in settings.values():
+            pass
+
+if __name__ == '__main__':
+    try:
+        n = int(sys.argv[1])
+    except IndexError:
+        n = 1000
+
+    for f in (construct, one_setting, all_settings):
+        t = timeit(f, number=n)
+        print('%-14s %8.1f us/solver' % (f.__name__, 1e6 * t / n))
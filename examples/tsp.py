@@ -4,7 +4,7 @@ from itertools import product
 from zibopt import scip
 import json, sys
 
-def walk_subtours(arcs, solution):
+def walk_subtours(arcs, value):
     l = len(arcs)
     
     # Unpack arcs into a connections dictionary
@@ -12,13 +12,13 @@ def walk_subtours(arcs, solution):
     for i in range(l):
         # Horizonal row up to node i
         for j in range(i):
-            if solution[arcs[i][j]] > 0.5:
+            if value(arcs[i][j]) > 0.5:
                 connects[i].add(j)
                 connects[j].add(i)
             
         # Vertical column below node i
         for j in range(i+1,l):
-            if solution[arcs[j][i]] > 0.5:
+            if value(arcs[j][i]) > 0.5:
                 connects[i].add(j)
                 connects[j].add(i)
         
@@ -76,40 +76,33 @@ if __name__ == '__main__':
         ) == 2
 
     # Our formulation thus far only represents a combinatorial relaxation of
-    # STSP as an assignment problem.  It is possible the solver will return
-    # disconnected subtours.
-    n = 0
-    while True:
-        solution = solver.minimize()
+    # STSP as an assignment problem.  It is possible the solver will find
+    # disconnected subtours.  Whenever it does, we add subtour elimination 
+    # constraints and let it continue.  These function by adding a knapsack
+    # constraint setting the sum of the arcs in each subtour to their 
+    # cardinality minus one.
+    @solver.lazy_constraints
+    def subtour_elimination(values):
+        subtours = walk_subtours(arcs, lambda v: values[v.index])
+        if len(subtours) == 1:
+            return []
 
-        if solution:
-            subtours = walk_subtours(arcs, solution)
-            print('-' * 80)
-            print('[%d] LENGTH:' % n, solution.objective, '/ SUBTOURS:', len(subtours))
-            for s in subtours:
-                print('   ', s)
- 
-            n += 1
-            if len(subtours) > 1:
-                solver.restart()
-                
-                # Generate subtour elimination constraints.  These function by
-                # adding a knapsack constraint setting the sum of the arcs
-                # in each subtour to their cardinality minus one.
-                for subtour in subtours:
-                    # n points in a tour have n arcs, not n-1.  That means we
-                    # have to include the arc going back to the start node.
-                    pairs = list(zip(subtour, subtour[1:]+[subtour[0]]))
-                    solver += sum(
-                        # Column # is the higher of the two
-                        arcs[max(*pair)][min(*pair)] for pair in pairs
-                    ) <= len(pairs) - 1
-
-            elif solution.optimal:
-                # Optimal tour found.  Stop.
-                break
-
-        else:
-            print('infeasible')
-            break
+        print('SUBTOURS:', len(subtours))
+        cuts = []
+        for subtour in subtours:
+            # n points in a tour have n arcs, not n-1.  That means we
+            # have to include the arc going back to the start node.
+            pairs = list(zip(subtour, subtour[1:]+[subtour[0]]))
+            cuts.append(sum(
+                # Column # is the higher of the two
+                arcs[max(*pair)][min(*pair)] for pair in pairs
+            ) <= len(pairs) - 1)
+        return cuts
 
+    solution = solver.minimize()
+    if solution:
+        print('-' * 80)
+        print('LENGTH:', solution.objective)
+        print('   ', walk_subtours(arcs, solution.__getitem__)[0])
+    else:
+        print('infeasible')
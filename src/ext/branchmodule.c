@@ -22,6 +22,7 @@ static int branching_rule_init(branching_rule *self, PyObject *args, PyObject *k
     
     solv = (solver *) s;
     self->scip = solv->scip;
+    self->solver = s;
     
     // Load the branching rule from SCIP
     r = SCIPfindBranchrule(self->scip, name);
@@ -55,6 +56,8 @@ static int branching_rule_setattr(branching_rule *self, PyObject *attr_name, PyO
     double d;
     int i;
     
+    PY_SCIP_CHECK_BUSY(error, -1, self->solver);
+
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
         PY_SCIP_SET_DBL_MIN("maxbounddist", self->branch->maxbounddist, -1); 
@@ -22,6 +22,7 @@ static int conflict_init(conflict *self, PyObject *args, PyObject *kwds) {
     
     solv = (solver *) s;
     self->scip = solv->scip;
+    self->solver = s;
     
     // Load the conflict handler from SCIP
     r = SCIPfindConflicthdlr(self->scip, name);
@@ -48,6 +49,8 @@ static PyObject* conflict_getattr(conflict *self, PyObject *attr_name) {
 }
 
 static int conflict_setattr(conflict *self, PyObject *attr_name, PyObject *value) {
+    PY_SCIP_CHECK_BUSY(error, -1, self->solver);
+
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
         PY_SCIP_SET_PRIORITY(SCIPconflicthdlrSetPriority, self->conflict);
@@ -3,9 +3,167 @@
 
 static PyObject *error;
 
+static int _grow_constraints(solver *solv, int n) {
+    // Makes room for n more constraints in the solver's constraint array
+    SCIP_CONS **conss;
+    int size;
+
+    if (solv->nconss + n <= solv->conss_size)
+        return 0;
+
+    size = solv->conss_size > 0 ? solv->conss_size : 64;
+    while (size < solv->nconss + n)
+        size *= 2;
+
+    conss = realloc(solv->conss, size * sizeof(SCIP_CONS *));
+    if (conss == NULL) {
+        PyErr_SetString(error, "ran out of memory");
+        return -1;
+    }
+
+    solv->conss = conss;
+    solv->conss_size = size;
+    return 0;
+}
+
+typedef struct {
+    SCIP_VAR *var1;
+    SCIP_VAR *var2;  // NULL for linear terms
+    SCIP_Real coef;
+    int pos;         // original position, so sums don't depend on qsort
+} _term;
+
+static int _compare_terms(const void *a, const void *b) {
+    const _term *s = a, *t = b;
+    int i, j;
+
+    i = SCIPvarGetIndex(s->var1);
+    j = SCIPvarGetIndex(t->var1);
+    if (i == j && s->var2 != NULL) {
+        i = SCIPvarGetIndex(s->var2);
+        j = SCIPvarGetIndex(t->var2);
+    }
+    if (i == j) {
+        i = s->pos;
+        j = t->pos;
+    }
+    return (i > j) - (i < j);
+}
+
+static bool _drop_coef(SCIP_Real coef, double tolerance) {
+    return coef == 0.0 || fabs(coef) < tolerance;
+}
+
+static int _canonicalize(SCIP_VAR **var1, SCIP_VAR **var2, SCIP_Real *coef, int n, double tolerance) {
+    // Sorts terms by variable index, adds up the coefficients of repeated
+    // variables, and drops terms whose coefficients are zero or smaller 
+    // than tolerance.  var2 is NULL for linear terms.  Each bilinear pair 
+    // is put in index order first, so x*y and y*x are the same term.  The
+    // arrays are rewritten in place, and the new number of terms is 
+    // returned, or -1 if there isn't enough memory.
+    SCIP_VAR *v;
+    _term *terms, t;
+    int i, m;
+
+    for (i = 0; var2 != NULL && i < n; i++) {
+        if (SCIPvarGetIndex(var1[i]) > SCIPvarGetIndex(var2[i])) {
+            v = var1[i];
+            var1[i] = var2[i];
+            var2[i] = v;
+        }
+    }
+
+    // Rows built in index order without zeros are left alone, which is
+    // the common case for linexprs over variable blocks
+    for (i = 0; i < n; i++) {
+        if (_drop_coef(coef[i], tolerance))
+            break;
+        if (i > 0) {
+            if (SCIPvarGetIndex(var1[i-1]) > SCIPvarGetIndex(var1[i]))
+                break;
+            if (var1[i-1] == var1[i] && (var2 == NULL || 
+                SCIPvarGetIndex(var2[i-1]) >= SCIPvarGetIndex(var2[i])))
+                break;
+        }
+    }
+    if (i == n)
+        return n;
+
+    terms = malloc((n > 0 ? n : 1) * sizeof(_term));
+    if (terms == NULL)
+        return -1;
+
+    for (i = 0; i < n; i++) {
+        terms[i].var1 = var1[i];
+        terms[i].var2 = var2 == NULL ? NULL : var2[i];
+        terms[i].coef = coef[i];
+        terms[i].pos = i;
+    }
+    qsort(terms, n, sizeof(_term), _compare_terms);
+
+    // Add up runs of the same term, and keep the sum if it isn't too small
+    for (i = m = 0; i < n; ) {
+        t = terms[i++];
+        while (i < n && terms[i].var1 == t.var1 && terms[i].var2 == t.var2)
+            t.coef += terms[i++].coef;
+        if (_drop_coef(t.coef, tolerance))
+            continue;
+
+        var1[m] = t.var1;
+        if (var2 != NULL)
+            var2[m] = t.var2;
+        coef[m++] = t.coef;
+    }
+
+    free(terms);
+    return m;
+}
+
 /*****************************************************************************/
 /* PYTHON TYPE METHODS                                                       */
 /*****************************************************************************/
+static int _linear_from_arrays(solver *solv, PyObject *indices_obj, PyObject *coef_obj,
+    int *nvars, SCIP_VAR ***vars, SCIP_Real **coef) {
+    // Converts arrays of variable indices and coefficients, as from a 
+    // linexpr, to the arrays SCIP wants.  The caller frees them.
+    py_scip_array indices, coefficients;
+    long long j;
+    int i;
+
+    if (PyScipArrayFromObject(error, indices_obj, "linear_vars", 0, -1, true, &indices) < 0)
+        return -1;
+    *nvars = (int) PyScipArrayLength(&indices);
+    if (PyScipArrayFromObject(error, coef_obj, "linear_coef", 0, *nvars, false, &coefficients) < 0) {
+        PyScipArrayRelease(&indices);
+        return -1;
+    }
+
+    *vars = malloc((*nvars > 0 ? *nvars : 1) * sizeof(SCIP_VAR *));
+    *coef = malloc((*nvars > 0 ? *nvars : 1) * sizeof(SCIP_Real));
+    if (*vars == NULL || *coef == NULL)
+        PyErr_SetString(error, "ran out of memory");
+
+    for (i = 0; i < *nvars && !PyErr_Occurred(); i++) {
+        j = PyScipArrayGetIndex(&indices, i);
+        if (j < 0 || j >= solv->nvars) {
+            PyErr_SetString(error, "variable index out of range");
+            break;
+        }
+        (*vars)[i] = solv->vars[j];
+        (*coef)[i] = PyScipArrayGet(&coefficients, i);
+    }
+
+    PyScipArrayRelease(&indices);
+    PyScipArrayRelease(&coefficients);
+
+    if (PyErr_Occurred()) {
+        free(*vars);
+        free(*coef);
+        return -1;
+    }
+    return 0;
+}
+
 static int constraint_init(constraint *self, PyObject *args, PyObject *kwds) {
     static char *argnames[] = {
         "solver", "linear_vars", "linear_coef", "bilin_var1", "bilin_var2",
@@ -19,6 +177,11 @@ static int constraint_init(constraint *self, PyObject *args, PyObject *kwds) {
     PyObject *bilin_var2;  // list of second bilinear terms in constraint
     PyObject *bilin_coef;  // list of their associated coefficients
     double lhs, rhs;       // lhs <= f(x) <= rhs
+    int linear_nvars, bilin_nvars;
+    SCIP_VAR **linear_vars_c, **bilin_var1_c, **bilin_var2_c;
+    SCIP_Real *linear_coef_c, *bilin_coef_c;
+    SCIP_RETCODE retcode;
+    bool indexed;
     int i;
 
     // SCIPinfinity requires self->scip, so we have to parse the args twice
@@ -33,31 +196,37 @@ static int constraint_init(constraint *self, PyObject *args, PyObject *kwds) {
     }
 
     solv = (solver *) s;
+    PY_SCIP_CHECK_BUSY(error, -1, solv);
     self->scip = solv->scip;
+    self->solver = s;
         
     lhs = -SCIPinfinity(self->scip);
     rhs = SCIPinfinity(self->scip);
 
+    // Linear terms can also come as arrays of variable indices and
+    // coefficients.  Those are checked when they are converted below.
+    indexed = !PyList_CheckExact(linear_vars) && PyObject_CheckBuffer(linear_vars);
+
     // Make sure that linear variables and coefficients are lists containing
     // variables and coefficients, respectively.  Also check that they are
     // the same length and reference the same solver.
-    if (!PyList_CheckExact(linear_vars)) {
+    if (!indexed && !PyList_CheckExact(linear_vars)) {
         PyErr_SetString(error, "linear_vars list required");
         return -1;
     }
 
-    if (!PyList_CheckExact(linear_coef)) {
+    if (!indexed && !PyList_CheckExact(linear_coef)) {
         PyErr_SetString(error, "linear_coef list required");
         return -1;
     }
  
-    self->linear_nvars = PyList_Size(linear_vars);
-    if (self->linear_nvars != PyList_Size(linear_coef)) {
+    linear_nvars = indexed ? 0 : PyList_Size(linear_vars);
+    if (!indexed && linear_nvars != PyList_Size(linear_coef)) {
         PyErr_SetString(error, "linear_vars and linear_coef must be the same length");
         return -1;
     }
 
-    for (i = 0; i < self->linear_nvars; i++ ) {
+    for (i = 0; i < linear_nvars; i++ ) {
         // Check that each element is a variable
         PyObject *v = PyList_GetItem(linear_vars, i);
         if (strcmp(v->ob_type->tp_name, VARIABLE_TYPE_NAME)) {
@@ -95,13 +264,13 @@ static int constraint_init(constraint *self, PyObject *args, PyObject *kwds) {
         return -1;
     }
  
-    self->bilin_nvars = PyList_Size(bilin_var1);
-    if (self->bilin_nvars != PyList_Size(bilin_var2) || self->bilin_nvars != PyList_Size(bilin_coef)) {
+    bilin_nvars = PyList_Size(bilin_var1);
+    if (bilin_nvars != PyList_Size(bilin_var2) || bilin_nvars != PyList_Size(bilin_coef)) {
         PyErr_SetString(error, "bilin_var1, bilin_var2, and bilin_coef must be the same length");
         return -1;
     }
 
-    for (i = 0; i < self->bilin_nvars; i++ ) {
+    for (i = 0; i < bilin_nvars; i++ ) {
         // Check that each element is a variable
         PyObject *v1 = PyList_GetItem(bilin_var1, i);
         PyObject *v2 = PyList_GetItem(bilin_var2, i);
@@ -130,104 +299,372 @@ static int constraint_init(constraint *self, PyObject *args, PyObject *kwds) {
         &linear_vars, &linear_coef, &bilin_var1, &bilin_var2, &bilin_coef, &lhs, &rhs))
         return -1;
 
-    // Store linear variables and coefficients to pass in to the constraint
-    if (self->linear_nvars > 0) {
-        self->linear_vars = malloc(self->linear_nvars * sizeof(SCIP_VAR *));
-        self->linear_coef = malloc(self->linear_nvars * sizeof(SCIP_Real));
-
-        // Add vars and coefficients into these lists
-        for (i = 0; i < self->linear_nvars; i++) {
-            self->linear_vars[i] = ((variable *) PyList_GetItem(linear_vars, i))->variable;
+    // Make room for the constraint first so it can't be lost
+    if (_grow_constraints(solv, 1) < 0)
+        return -1;
 
-            PyObject *coefficient_obj = PyList_GetItem(linear_coef, i);
-            SCIP_Real coefficient;
-            if (PyLong_Check(coefficient_obj)) {
-                coefficient = PyLong_AsDouble(coefficient_obj);
-            } else {
-                coefficient = PyFloat_AsDouble(coefficient_obj);
-            }
-            self->linear_coef[i] = coefficient;        
-        }
+    // Linear variables and coefficients to pass in to the constraint.  SCIP
+    // keeps its own copies, so these are only needed until it is created.
+    if (indexed) {
+        if (_linear_from_arrays(solv, linear_vars, linear_coef, &linear_nvars, &linear_vars_c, &linear_coef_c) < 0)
+            return -1;
 
     } else {
-        self->linear_vars = NULL;
-        self->linear_coef = NULL;
+        linear_vars_c = malloc((linear_nvars > 0 ? linear_nvars : 1) * sizeof(SCIP_VAR *));
+        linear_coef_c = malloc((linear_nvars > 0 ? linear_nvars : 1) * sizeof(SCIP_Real));
+        for (i = 0; linear_vars_c && linear_coef_c && i < linear_nvars; i++) {
+            linear_vars_c[i] = ((variable *) PyList_GetItem(linear_vars, i))->variable;
+            linear_coef_c[i] = PyFloat_AsDouble(PyList_GetItem(linear_coef, i));
+        }
     }
 
-    // Store bilinear variables and coefficients to pass in to the constraint
-    if (self->bilin_nvars > 0) {
-        self->bilin_var1 = malloc(self->bilin_nvars * sizeof(SCIP_VAR *));
-        self->bilin_var2 = malloc(self->bilin_nvars * sizeof(SCIP_VAR *));
-        self->bilin_coef = malloc(self->bilin_nvars * sizeof(SCIP_Real));
-
-        // Add vars and coefficients into these lists
-        for (i = 0; i < self->bilin_nvars; i++) {
-            self->bilin_var1[i] = ((variable *) PyList_GetItem(bilin_var1, i))->variable;
-            self->bilin_var2[i] = ((variable *) PyList_GetItem(bilin_var2, i))->variable;
-
-            PyObject *coefficient_obj = PyList_GetItem(bilin_coef, i);
-            SCIP_Real coefficient;
-            if (PyLong_Check(coefficient_obj)) {
-                coefficient = PyLong_AsDouble(coefficient_obj);
-            } else {
-                coefficient = PyFloat_AsDouble(coefficient_obj);
-            }
-            self->bilin_coef[i] = coefficient;        
-        }
+    // Same for bilinear variables and coefficients
+    bilin_var1_c = malloc((bilin_nvars > 0 ? bilin_nvars : 1) * sizeof(SCIP_VAR *));
+    bilin_var2_c = malloc((bilin_nvars > 0 ? bilin_nvars : 1) * sizeof(SCIP_VAR *));
+    bilin_coef_c = malloc((bilin_nvars > 0 ? bilin_nvars : 1) * sizeof(SCIP_Real));
+    for (i = 0; bilin_var1_c && bilin_var2_c && bilin_coef_c && i < bilin_nvars; i++) {
+        bilin_var1_c[i] = ((variable *) PyList_GetItem(bilin_var1, i))->variable;
+        bilin_var2_c[i] = ((variable *) PyList_GetItem(bilin_var2, i))->variable;
+        bilin_coef_c[i] = PyFloat_AsDouble(PyList_GetItem(bilin_coef, i));
+    }
 
-    } else {
-        self->bilin_var1 = NULL;
-        self->bilin_var2 = NULL;
-        self->bilin_coef = NULL;
+    // Put terms in a canonical order with no repeats or zeros, which gives
+    // SCIP smaller rows
+    retcode = SCIP_OKAY;
+    if (linear_vars_c && linear_coef_c && bilin_var1_c && bilin_var2_c && bilin_coef_c) {
+        self->ndropped = linear_nvars + bilin_nvars;
+        linear_nvars = _canonicalize(linear_vars_c, NULL, linear_coef_c, 
+            linear_nvars, solv->drop_tolerance);
+        bilin_nvars = _canonicalize(bilin_var1_c, bilin_var2_c, bilin_coef_c, 
+            bilin_nvars, solv->drop_tolerance);
+        if (linear_nvars < 0 || bilin_nvars < 0)
+            retcode = SCIP_NOMEMORY;
+        self->ndropped -= linear_nvars + bilin_nvars;
     }
 
     // If we have bilinear variables, instantiate a quadratic constraint.
     // Otherwise use the basic linear constraint.
-    if (self->bilin_nvars > 0) {
-        PY_SCIP_CALL(error, -1,
-            SCIPcreateConsQuadratic(self->scip, &self->constraint, "", 
-                self->linear_nvars, self->linear_vars, self->linear_coef, 
-                self->bilin_nvars, self->bilin_var1, self->bilin_var2, self->bilin_coef,
-                lhs, rhs, TRUE, TRUE, TRUE, TRUE, TRUE, FALSE, FALSE, FALSE, FALSE)
-        );
+    self->quadratic = bilin_nvars > 0;
+    if (retcode != SCIP_OKAY || !(linear_vars_c && linear_coef_c && bilin_var1_c && bilin_var2_c && bilin_coef_c)) {
+        retcode = SCIP_NOMEMORY;
+
+    } else if (self->quadratic) {
+        retcode = SCIPcreateConsQuadratic(self->scip, &self->constraint, "", 
+            linear_nvars, linear_vars_c, linear_coef_c, 
+            bilin_nvars, bilin_var1_c, bilin_var2_c, bilin_coef_c,
+            lhs, rhs, TRUE, TRUE, TRUE, TRUE, TRUE, FALSE, FALSE, FALSE, FALSE);
 
     } else {
-        PY_SCIP_CALL(error, -1,
-            SCIPcreateConsLinear(self->scip, &self->constraint, "", 
-                self->linear_nvars, self->linear_vars, self->linear_coef, 
-                lhs, rhs, TRUE, TRUE, TRUE, TRUE, TRUE, FALSE, FALSE, FALSE, FALSE, FALSE)
-        );
+        retcode = SCIPcreateConsLinear(self->scip, &self->constraint, "", 
+            linear_nvars, linear_vars_c, linear_coef_c, 
+            lhs, rhs, TRUE, TRUE, TRUE, TRUE, TRUE, FALSE, FALSE, FALSE, FALSE, FALSE);
     }
-    
 
-    // Put new constraint at head of linked list
-    self->next = (struct constraint *) solv->first_cons;
-    solv->first_cons = self;
+    free(linear_vars_c);
+    free(linear_coef_c);
+    free(bilin_var1_c);
+    free(bilin_var2_c);
+    free(bilin_coef_c);
+    PY_SCIP_CALL(error, -1, retcode);
+
+    // The solver releases the constraint when it is freed
+    solv->ndropped += self->ndropped;
+    self->index = solv->nconss;
+    solv->conss[solv->nconss++] = self->constraint;
 
     return 0;
 }
 
 static void constraint_dealloc(constraint *self) {
-    if (self->linear_vars != NULL) free(self->linear_vars);
-    if (self->linear_coef != NULL) free(self->linear_coef);
-    if (self->bilin_var1 != NULL) free(self->bilin_var1);
-    if (self->bilin_var2 != NULL) free(self->bilin_var2);
-    if (self->bilin_coef != NULL) free(self->bilin_coef);
+    ((PyObject *) self)->ob_type->tp_free(self);
+}
+
+static int constraint_block_init(constraint_block *self, PyObject *args, PyObject *kwds) {
+    static char *argnames[] = {"solver", "indptr", "indices", "data", "lower", "upper", NULL};
+    PyObject *s;             // solver Python object
+    solver *solv;            // solver C object
+    PyObject *indptr_obj, *indices_obj, *data_obj, *lhs_obj, *rhs_obj;
+    py_scip_array indptr;    // row r is in [indptr[r], indptr[r+1])
+    py_scip_array indices;   // variable index for each nonzero
+    py_scip_array data;      // coefficient for each nonzero
+    py_scip_array lhs, rhs;  // lhs <= Ax <= rhs
+    SCIP_VAR **row_vars = NULL;
+    SCIP_Real *row_coef = NULL;
+    SCIP_RETCODE retcode;
+    long long first, last, j;
+    Py_ssize_t nnz, k;
+    double inf, l, u;
+    int nrows, maxlen, r, n;
+
+    lhs_obj = rhs_obj = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOO|OO", argnames, &s,
+        &indptr_obj, &indices_obj, &data_obj, &lhs_obj, &rhs_obj))
+        return -1;
+
+    // Check solver type in the best way we seem to have available
+    if (strcmp(s->ob_type->tp_name, SOLVER_TYPE_NAME)) {
+        PyErr_SetString(error, "invalid solver type");
+        return -1;
+    }
+
+    if ((lhs_obj == NULL || lhs_obj == Py_None) && (rhs_obj == NULL || rhs_obj == Py_None)) {
+        PyErr_SetString(error, "at least one bound is required");
+        return -1;
+    }
+
+    solv = (solver *) s;
+    PY_SCIP_CHECK_BUSY(error, -1, solv);
+    self->scip = solv->scip;
+    Py_INCREF(s);
+    Py_XDECREF(self->solver);
+    self->solver = s;
+    inf = SCIPinfinity(self->scip);
+
+    // Acquire all the buffers.  The row pointers determine how many rows
+    // we have, and the number of nonzeros must agree with the index and
+    // coefficient arrays.
+    if (PyScipArrayFromObject(error, indptr_obj, "indptr", 0, -1, true, &indptr) < 0)
+        return -1;
+    if (PyScipArrayLength(&indptr) < 1) {
+        PyErr_SetString(error, "indptr must have at least one element");
+        PyScipArrayRelease(&indptr);
+        return -1;
+    }
+    nrows = (int) PyScipArrayLength(&indptr) - 1;
+
+    if (PyScipArrayFromObject(error, indices_obj, "indices", 0, -1, true, &indices) < 0) {
+        PyScipArrayRelease(&indptr);
+        return -1;
+    }
+    nnz = PyScipArrayLength(&indices);
+
+    if (PyScipArrayFromObject(error, data_obj, "data", 0, nnz, false, &data) < 0 || !data.is_buffer) {
+        if (!PyErr_Occurred())
+            PyErr_SetString(error, "data must be an array of numbers");
+        PyScipArrayRelease(&indptr);
+        PyScipArrayRelease(&indices);
+        PyScipArrayRelease(&data);
+        return -1;
+    }
+
+    if (PyScipArrayFromObject(error, lhs_obj, "lower", -inf, nrows, false, &lhs) < 0) {
+        PyScipArrayRelease(&indptr);
+        PyScipArrayRelease(&indices);
+        PyScipArrayRelease(&data);
+        return -1;
+    }
+
+    if (PyScipArrayFromObject(error, rhs_obj, "upper", inf, nrows, false, &rhs) < 0) {
+        PyScipArrayRelease(&indptr);
+        PyScipArrayRelease(&indices);
+        PyScipArrayRelease(&data);
+        PyScipArrayRelease(&lhs);
+        return -1;
+    }
+
+    // Validate everything before touching SCIP, so that a bad row doesn't
+    // leave half of the block in the problem.
+    maxlen = 0;
+    for (r = 0; r < nrows && !PyErr_Occurred(); r++) {
+        first = PyScipArrayGetIndex(&indptr, r);
+        last = PyScipArrayGetIndex(&indptr, r + 1);
+        if (first < 0 || last < first || last > nnz) {
+            PyErr_SetString(error, "invalid indptr array");
+            break;
+        }
+        if (last - first > maxlen)
+            maxlen = (int) (last - first);
+
+        if (PyScipArrayGet(&rhs, r) < PyScipArrayGet(&lhs, r))
+            PyErr_SetString(error, "invalid constraint: upper < lower");
+    }
+
+    for (k = 0; k < nnz && !PyErr_Occurred(); k++) {
+        j = PyScipArrayGetIndex(&indices, k);
+        if (j < 0 || j >= solv->nvars)
+            PyErr_SetString(error, "variable index out of range");
+    }
+
+    if (!PyErr_Occurred()) {
+        row_vars = malloc((maxlen > 0 ? maxlen : 1) * sizeof(SCIP_VAR *));
+        row_coef = malloc((maxlen > 0 ? maxlen : 1) * sizeof(SCIP_Real));
+        self->constraints = malloc((nrows > 0 ? nrows : 1) * sizeof(SCIP_CONS *));
+        if (row_vars == NULL || row_coef == NULL || self->constraints == NULL)
+            PyErr_SetString(error, "ran out of memory");
+    }
+
+    // In case constraints are being added after optimization, it may be
+    // necessary to restart the solver.  Do this once for the whole block.
+    retcode = SCIP_OKAY;
+    if (!PyErr_Occurred())
+        retcode = PyScipFreeTransform(solv);
+
+    for (r = 0; r < nrows && retcode == SCIP_OKAY && !PyErr_Occurred(); r++) {
+        first = PyScipArrayGetIndex(&indptr, r);
+        last = PyScipArrayGetIndex(&indptr, r + 1);
+        for (n = 0, k = (Py_ssize_t) first; k < last; k++, n++) {
+            row_vars[n] = solv->vars[PyScipArrayGetIndex(&indices, k)];
+            row_coef[n] = PyScipArrayGet(&data, k);
+        }
+
+        n = _canonicalize(row_vars, NULL, row_coef, n, solv->drop_tolerance);
+        if (n < 0) {
+            retcode = SCIP_NOMEMORY;
+            break;
+        }
+        self->ndropped += last - first - n;
+
+        l = PyScipArrayGet(&lhs, r);
+        u = PyScipArrayGet(&rhs, r);
+        if (l < -inf)
+            l = -inf;
+        if (u > inf)
+            u = inf;
+
+        // See constraint_init for the meaning of these arguments
+        retcode = SCIPcreateConsLinear(self->scip, &self->constraints[r], "", n, row_vars, row_coef,
+            l, u, TRUE, TRUE, TRUE, TRUE, TRUE, FALSE, FALSE, FALSE, FALSE, FALSE);
+        if (retcode != SCIP_OKAY)
+            break;
+
+        self->size++;
+        retcode = SCIPaddCons(self->scip, self->constraints[r]);
+    }
+
+    solv->ndropped += self->ndropped;
+    free(row_vars);
+    free(row_coef);
+    PyScipArrayRelease(&indptr);
+    PyScipArrayRelease(&indices);
+    PyScipArrayRelease(&data);
+    PyScipArrayRelease(&lhs);
+    PyScipArrayRelease(&rhs);
+
+    if (retcode != SCIP_OKAY)
+        PyScipSetError(error, retcode);
+
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+static void constraint_block_dealloc(constraint_block *self) {
+    int i;
+
+    // The solver is kept alive by the block, so SCIP is still around
+    if (self->constraints != NULL) {
+        for (i = 0; i < self->size; i++)
+            SCIPreleaseCons(self->scip, &self->constraints[i]);
+        free(self->constraints);
+    }
+    Py_XDECREF(self->solver);
     ((PyObject *) self)->ob_type->tp_free(self);
 }
 
 static PyObject *constraint_register(constraint *self) {
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+
     // In case a constraint is being re-added after optimization,
     // it may be necessary to restart the solver.
-    PY_SCIP_CALL(error, NULL, SCIPfreeTransform(self->scip));
+    PY_SCIP_CALL(error, NULL, PyScipFreeTransform((solver *) self->solver));
     PY_SCIP_CALL(error, NULL, SCIPaddCons(self->scip, self->constraint));
     Py_RETURN_NONE;
 }
 
+static int _append_term(PyObject *terms, solver *solv, SCIP_VAR *var1, SCIP_VAR *var2, double coef) {
+    // Appends ((index,), coef) or ((index1, index2), coef) to a list,
+    // with the solver indices of the variables
+    PyObject *term;
+    int i, j, result;
+
+    if (coef == 0)
+        return 0;
+    if ((i = PyScipVarIndex(error, solv, var1)) < 0)
+        return -1;
+    if (var2 == NULL) {
+        term = Py_BuildValue("((i)d)", i, coef);
+    } else {
+        if ((j = PyScipVarIndex(error, solv, var2)) < 0)
+            return -1;
+        term = Py_BuildValue("((ii)d)", i, j, coef);
+    }
+    if (term == NULL)
+        return -1;
+
+    result = PyList_Append(terms, term);
+    Py_DECREF(term);
+    return result;
+}
+
+static PyObject *constraint_terms(constraint *self) {
+    // Reads terms back out of SCIP as a list of (variable indices, coef),
+    // where the indices are positions in the solver.
+    solver *solv = (solver *) self->solver;
+    PyObject *terms;
+    SCIP_VAR **vars;
+    SCIP_Real *vals;
+    SCIP_QUADVARTERM *quadterms;
+    SCIP_BILINTERM *bilinterms;
+    const char *name;
+    int i, n;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+
+    // Problems read from files can have other kinds of constraints
+    name = SCIPconshdlrGetName(SCIPconsGetHdlr(self->constraint));
+    if (strcmp(name, "linear") && strcmp(name, "quadratic")) {
+        PyErr_Format(error, "can't read terms of %s constraints", name);
+        return NULL;
+    }
+
+    if ((terms = PyList_New(0)) == NULL)
+        return NULL;
+
+    if (self->quadratic) {
+        n = SCIPgetNLinearVarsQuadratic(self->scip, self->constraint);
+        vars = SCIPgetLinearVarsQuadratic(self->scip, self->constraint);
+        vals = SCIPgetCoefsLinearVarsQuadratic(self->scip, self->constraint);
+        for (i = 0; i < n; i++)
+            if (_append_term(terms, solv, vars[i], NULL, vals[i]) < 0)
+                goto fail;
+
+        // Variables in quadratic terms keep their linear coefficients 
+        // separately, along with coefficients for their squares.
+        n = SCIPgetNQuadVarTermsQuadratic(self->scip, self->constraint);
+        quadterms = SCIPgetQuadVarTermsQuadratic(self->scip, self->constraint);
+        for (i = 0; i < n; i++) {
+            if (_append_term(terms, solv, quadterms[i].var, NULL, quadterms[i].lincoef) < 0)
+                goto fail;
+            if (_append_term(terms, solv, quadterms[i].var, quadterms[i].var, quadterms[i].sqrcoef) < 0)
+                goto fail;
+        }
+
+        n = SCIPgetNBilinTermsQuadratic(self->scip, self->constraint);
+        bilinterms = SCIPgetBilinTermsQuadratic(self->scip, self->constraint);
+        for (i = 0; i < n; i++)
+            if (_append_term(terms, solv, bilinterms[i].var1, bilinterms[i].var2, bilinterms[i].coef) < 0)
+                goto fail;
+
+    } else {
+        n = SCIPgetNVarsLinear(self->scip, self->constraint);
+        vars = SCIPgetVarsLinear(self->scip, self->constraint);
+        vals = SCIPgetValsLinear(self->scip, self->constraint);
+        for (i = 0; i < n; i++)
+            if (_append_term(terms, solv, vars[i], NULL, vals[i]) < 0)
+                goto fail;
+    }
+
+    return terms;
+
+fail:
+    Py_DECREF(terms);
+    return NULL;
+}
+
 static PyObject* constraint_getattr(constraint *self, PyObject *attr_name) {
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
         if (PyUnicode_CompareWithASCIIString(attr_name, "dual_sol_linear") == 0) {
+            PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+
             // We have to get dual values off of the transformed problem
             SCIP_CONS *transformed;
             PY_SCIP_CALL(error, NULL, SCIPgetTransformedCons(self->scip, self->constraint, &transformed));
@@ -249,8 +686,15 @@ static PyObject* constraint_getattr(constraint *self, PyObject *attr_name) {
 /*****************************************************************************/
 /* MODULE INITIALIZATION                                                     */
 /*****************************************************************************/
+static PyMemberDef constraint_members[] = {
+    {"index", T_INT, offsetof(constraint, index), READONLY, "position of the constraint in its solver"},
+    {"ndropped", T_INT, offsetof(constraint, ndropped), READONLY, "number of terms merged or dropped when it was created"},
+    {NULL} /* Sentinel */
+};
+
 static PyMethodDef constraint_methods[] = {
     {"register", (PyCFunction) constraint_register, METH_NOARGS,  "registers the constraint with the solver"},
+    {"terms",    (PyCFunction) constraint_terms,    METH_NOARGS,  "returns (variable indices, coefficient) pairs stored in SCIP"},
     {NULL} /* Sentinel */
 };
 
@@ -283,7 +727,7 @@ static PyTypeObject constraint_type = {
     0,                               /* tp_iter */
     0,                               /* tp_iternext */
     constraint_methods,              /* tp_methods */
-    0,                               /* tp_members */
+    constraint_members,              /* tp_members */
     0,                               /* tp_getset */
     0,                               /* tp_base */
     0,                               /* tp_dict */
@@ -295,6 +739,53 @@ static PyTypeObject constraint_type = {
     0,                               /* tp_new */
 };
 
+static PyMemberDef constraint_block_members[] = {
+    {"size", T_INT, offsetof(constraint_block, size), READONLY, "number of constraints in the block"},
+    {"ndropped", T_LONGLONG, offsetof(constraint_block, ndropped), READONLY, "number of terms merged or dropped from its rows"},
+    {NULL} /* Sentinel */
+};
+
+static PyTypeObject constraint_block_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_cons.constraint_block",        /* tp_name */
+    sizeof(constraint_block),        /* tp_basicsize */
+    0,                               /* tp_itemsize */
+    (destructor) constraint_block_dealloc, /* tp_dealloc */
+    0,                               /* tp_print */
+    0,                               /* tp_getattr */
+    0,                               /* tp_setattr */
+    0,                               /* tp_compare */
+    0,                               /* tp_repr */
+    0,                               /* tp_as_number */
+    0,                               /* tp_as_sequence */
+    0,                               /* tp_as_mapping */
+    0,                               /* tp_hash */
+    0,                               /* tp_call */
+    0,                               /* tp_str */
+    0,                               /* tp_getattro */
+    0,                               /* tp_setattro */
+    0,                               /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+    "SCIP constraint blocks",        /* tp_doc */
+    0,                               /* tp_traverse */
+    0,                               /* tp_clear */
+    0,                               /* tp_richcompare */
+    0,                               /* tp_weaklistoffset */
+    0,                               /* tp_iter */
+    0,                               /* tp_iternext */
+    0,                               /* tp_methods */
+    constraint_block_members,        /* tp_members */
+    0,                               /* tp_getset */
+    0,                               /* tp_base */
+    0,                               /* tp_dict */
+    0,                               /* tp_descr_get */
+    0,                               /* tp_descr_set */
+    0,                               /* tp_dictoffset */
+    (initproc) constraint_block_init, /* tp_init */
+    0,                               /* tp_alloc */
+    0,                               /* tp_new */
+};
+
 #if PY_MAJOR_VERSION >= 3
 static PyModuleDef cons_module = {
     PyModuleDef_HEAD_INIT,
@@ -319,6 +810,14 @@ PyMODINIT_FUNC PyInit__cons(void) {
         return;
 #endif
 
+    constraint_block_type.tp_new = PyType_GenericNew;
+    if (PyType_Ready(&constraint_block_type) < 0)
+#if PY_MAJOR_VERSION >= 3
+        return NULL;
+#else
+        return;
+#endif
+
 #if PY_MAJOR_VERSION >= 3
     m = PyModule_Create(&cons_module); 
 #else
@@ -328,6 +827,9 @@ PyMODINIT_FUNC PyInit__cons(void) {
     Py_INCREF(&constraint_type);
     PyModule_AddObject(m, "constraint", (PyObject *) &constraint_type);
 
+    Py_INCREF(&constraint_block_type);
+    PyModule_AddObject(m, "constraint_block", (PyObject *) &constraint_block_type);
+
     // Initialize exception type
     error = PyErr_NewException("_cons.error", NULL, NULL);
     Py_INCREF(error);
@@ -22,6 +22,7 @@ static int display_column_init(display_column *self, PyObject *args, PyObject *k
     
     solv = (solver *) s;
     self->scip = solv->scip;
+    self->solver = s;
     
     // Load the display column from SCIP
     d = SCIPfindDisp(self->scip, name);
@@ -54,6 +55,8 @@ static PyObject* display_column_getattr(display_column *self, PyObject *attr_nam
 static int display_column_setattr(display_column *self, PyObject *attr_name, PyObject *value) {
     int i;
     
+    PY_SCIP_CHECK_BUSY(error, -1, self->solver);
+
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
          PY_SCIP_SET_INT_MIN("position", self->display->position, -1);
@@ -22,6 +22,7 @@ static int heuristic_init(heuristic *self, PyObject *args, PyObject *kwds) {
     
     solv = (solver *) s;
     self->scip = solv->scip;
+    self->solver = s;
     
     // Load the heuristic from SCIP
     r = SCIPfindHeur(self->scip, name);
@@ -56,6 +57,8 @@ static PyObject* heuristic_getattr(heuristic *self, PyObject *attr_name) {
 static int heuristic_setattr(heuristic *self, PyObject *attr_name, PyObject *value) {
     int i;
     
+    PY_SCIP_CHECK_BUSY(error, -1, self->solver);
+
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
         PY_SCIP_SET_INT_MIN("freqofs", self->heur->freqofs, 0); 
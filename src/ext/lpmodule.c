@@ -3,6 +3,16 @@
 
 static PyObject *error;
 
+// The LP can't be touched while another thread is solving it without the
+// GIL.  This is the same as PY_SCIP_CHECK_BUSY, for LPs.
+#define PY_SCIP_CHECK_LP_BUSY(fail_code, lp) \
+    do { \
+        if ((lp)->busy) { \
+            PyErr_SetString(error, "LP is busy"); \
+            return fail_code; \
+        } \
+    } while (FALSE);
+
 /*****************************************************************************/
 /* PYTHON TYPE METHODS                                                       */
 /*****************************************************************************/
@@ -34,10 +44,542 @@ static void lp_dealloc(lp *self) {
 /* ADDITONAL METHODS                                                         */
 /*****************************************************************************/
 
+static SCIP_Real *_read_reals(lp *self, PyObject *obj, const char *name, double default_value, int n) {
+    // Reads a number or an array of n numbers into a new array.  Values
+    // past infinity are clamped to the LP solver's infinity.  The caller
+    // frees the result.
+    py_scip_array a;
+    SCIP_Real *result, inf, d;
+    int i;
+
+    if (PyScipArrayFromObject(error, obj, name, default_value, n, false, &a) < 0)
+        return NULL;
+
+    result = malloc((n > 0 ? n : 1) * sizeof(SCIP_Real));
+    if (result == NULL) {
+        PyErr_SetString(error, "ran out of memory");
+        PyScipArrayRelease(&a);
+        return NULL;
+    }
+
+    inf = SCIPlpiInfinity(self->lpi);
+    for (i = 0; i < n; i++) {
+        d = PyScipArrayGet(&a, i);
+        result[i] = d > inf ? inf : (d < -inf ? -inf : d);
+    }
+
+    PyScipArrayRelease(&a);
+    return result;
+}
+
+static int *_read_indices(PyObject *obj, const char *name, int size, int *n) {
+    // Reads an integer array of column or row indices, each less than 
+    // size, into a new array.  The caller frees the result.
+    py_scip_array a;
+    long long j;
+    int *result;
+    int i;
+
+    if (PyScipArrayFromObject(error, obj, name, 0, -1, true, &a) < 0)
+        return NULL;
+    if (!a.is_buffer) {
+        PyErr_Format(error, "%s must be an array of integers", name);
+        return NULL;
+    }
+
+    *n = (int) PyScipArrayLength(&a);
+    result = malloc((*n > 0 ? *n : 1) * sizeof(int));
+    if (result == NULL)
+        PyErr_SetString(error, "ran out of memory");
+
+    for (i = 0; result != NULL && i < *n; i++) {
+        j = PyScipArrayGetIndex(&a, i);
+        if (j < 0 || j >= size) {
+            PyErr_Format(error, "%s index out of range", name);
+            free(result);
+            result = NULL;
+        } else {
+            result[i] = (int) j;
+        }
+    }
+
+    PyScipArrayRelease(&a);
+    return result;
+}
+
+static PyObject *lp_add_columns(lp *self, PyObject *args, PyObject *kwds) {
+    // Adds n columns without any nonzeros and returns the index of the
+    // first one.  Rows are added afterward.
+    static char *argnames[] = {"n", "objective", "lower", "upper", NULL};
+    PyObject *obj_obj, *lb_obj, *ub_obj;
+    SCIP_Real *obj, *lb, *ub;
+    SCIP_RETCODE retcode;
+    int n, start;
+
+    obj_obj = lb_obj = ub_obj = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i|OOO", argnames, &n, &obj_obj, &lb_obj, &ub_obj))
+        return NULL;
+
+    PY_SCIP_CHECK_LP_BUSY(NULL, self);
+    if (n < 0) {
+        PyErr_SetString(error, "can't add a negative number of columns");
+        return NULL;
+    }
+
+    obj = _read_reals(self, obj_obj, "objective", 0.0, n);
+    lb = obj == NULL ? NULL : _read_reals(self, lb_obj, "lower", 0.0, n);
+    ub = lb == NULL ? NULL : _read_reals(self, ub_obj, "upper", SCIPlpiInfinity(self->lpi), n);
+
+    retcode = SCIP_OKAY;
+    if (ub != NULL)
+        retcode = SCIPlpiAddCols(self->lpi, n, obj, lb, ub, NULL, 0, NULL, NULL, NULL);
+
+    free(obj);
+    free(lb);
+    free(ub);
+
+    if (PyErr_Occurred())
+        return NULL;
+    PY_SCIP_CALL(error, NULL, retcode);
+
+    start = self->ncols;
+    self->ncols += n;
+    return Py_BuildValue("i", start);
+}
+
+static PyObject *lp_add_rows(lp *self, PyObject *args, PyObject *kwds) {
+    // Adds rows in compressed sparse row format, with lhs <= Ax <= rhs, 
+    // and returns the index of the first one
+    static char *argnames[] = {"indptr", "indices", "data", "lower", "upper", NULL};
+    PyObject *indptr_obj, *indices_obj, *data_obj, *lhs_obj, *rhs_obj;
+    py_scip_array indptr, data;
+    SCIP_Real *lhs, *rhs, *val;
+    SCIP_RETCODE retcode;
+    long long first, last;
+    int *beg, *ind;
+    int nrows, nnz, r, k, start;
+
+    lhs_obj = rhs_obj = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOO|OO", argnames, &indptr_obj, 
+        &indices_obj, &data_obj, &lhs_obj, &rhs_obj))
+        return NULL;
+
+    PY_SCIP_CHECK_LP_BUSY(NULL, self);
+    if ((lhs_obj == NULL || lhs_obj == Py_None) && (rhs_obj == NULL || rhs_obj == Py_None)) {
+        PyErr_SetString(error, "at least one bound is required");
+        return NULL;
+    }
+
+    if (PyScipArrayFromObject(error, indptr_obj, "indptr", 0, -1, true, &indptr) < 0)
+        return NULL;
+    if (PyScipArrayLength(&indptr) < 1) {
+        PyErr_SetString(error, "indptr must have at least one element");
+        PyScipArrayRelease(&indptr);
+        return NULL;
+    }
+    nrows = (int) PyScipArrayLength(&indptr) - 1;
+
+    ind = _read_indices(indices_obj, "column", self->ncols, &nnz);
+    if (ind == NULL) {
+        PyScipArrayRelease(&indptr);
+        return NULL;
+    }
+
+    beg = malloc((nrows > 0 ? nrows : 1) * sizeof(int));
+    val = malloc((nnz > 0 ? nnz : 1) * sizeof(SCIP_Real));
+    lhs = rhs = NULL;
+    if (beg == NULL || val == NULL)
+        PyErr_SetString(error, "ran out of memory");
+
+    // The LP solver only takes row starts, so rows have to cover all of
+    // the nonzeros in order
+    if (PyScipArrayGetIndex(&indptr, 0) != 0 || PyScipArrayGetIndex(&indptr, nrows) != nnz)
+        PyErr_SetString(error, "invalid indptr array");
+    for (r = 0; r < nrows && !PyErr_Occurred(); r++) {
+        first = PyScipArrayGetIndex(&indptr, r);
+        last = PyScipArrayGetIndex(&indptr, r + 1);
+        if (last < first)
+            PyErr_SetString(error, "invalid indptr array");
+        else
+            beg[r] = (int) first;
+    }
+
+    if (!PyErr_Occurred() && PyScipArrayFromObject(error, data_obj, "data", 0, nnz, false, &data) == 0) {
+        if (!data.is_buffer)
+            PyErr_SetString(error, "data must be an array of numbers");
+        for (k = 0; k < nnz && !PyErr_Occurred(); k++)
+            val[k] = PyScipArrayGet(&data, k);
+        PyScipArrayRelease(&data);
+    }
+
+    if (!PyErr_Occurred())
+        lhs = _read_reals(self, lhs_obj, "lower", -SCIPlpiInfinity(self->lpi), nrows);
+    if (lhs != NULL)
+        rhs = _read_reals(self, rhs_obj, "upper", SCIPlpiInfinity(self->lpi), nrows);
+    for (r = 0; rhs != NULL && r < nrows && !PyErr_Occurred(); r++) {
+        if (rhs[r] < lhs[r])
+            PyErr_SetString(error, "invalid row: upper < lower");
+    }
+
+    retcode = SCIP_OKAY;
+    if (!PyErr_Occurred())
+        retcode = SCIPlpiAddRows(self->lpi, nrows, lhs, rhs, NULL, nnz, beg, ind, val);
+
+    PyScipArrayRelease(&indptr);
+    free(ind);
+    free(beg);
+    free(val);
+    free(lhs);
+    free(rhs);
+
+    if (PyErr_Occurred())
+        return NULL;
+    PY_SCIP_CALL(error, NULL, retcode);
+
+    start = self->nrows;
+    self->nrows += nrows;
+    return Py_BuildValue("i", start);
+}
+
+static PyObject *_change_ranges(lp *self, PyObject *args, bool columns) {
+    // Changes column bounds or row sides.  None or NaN keeps a value.
+    PyObject *ind_obj, *lower_obj, *upper_obj;
+    SCIP_Real *lower, *upper, l, u;
+    SCIP_RETCODE retcode;
+    int *ind;
+    int i, n;
+
+    lower_obj = upper_obj = NULL;
+    if (!PyArg_ParseTuple(args, "O|OO", &ind_obj, &lower_obj, &upper_obj))
+        return NULL;
+
+    PY_SCIP_CHECK_LP_BUSY(NULL, self);
+    ind = _read_indices(ind_obj, columns ? "column" : "row", columns ? self->ncols : self->nrows, &n);
+    if (ind == NULL)
+        return NULL;
+
+    lower = _read_reals(self, lower_obj, "lower", Py_NAN, n);
+    upper = lower == NULL ? NULL : _read_reals(self, upper_obj, "upper", Py_NAN, n);
+
+    // Fill in the values being kept, and make sure nothing crosses
+    retcode = SCIP_OKAY;
+    for (i = 0; upper != NULL && i < n && retcode == SCIP_OKAY; i++) {
+        if (columns)
+            retcode = SCIPlpiGetBounds(self->lpi, ind[i], ind[i], &l, &u);
+        else
+            retcode = SCIPlpiGetSides(self->lpi, ind[i], ind[i], &l, &u);
+
+        if (isnan(lower[i]))
+            lower[i] = l;
+        if (isnan(upper[i]))
+            upper[i] = u;
+        if (upper[i] < lower[i]) {
+            PyErr_Format(error, "lower above upper for %s %d", columns ? "column" : "row", ind[i]);
+            break;
+        }
+    }
+
+    if (upper != NULL && retcode == SCIP_OKAY && !PyErr_Occurred()) {
+        if (columns)
+            retcode = SCIPlpiChgBounds(self->lpi, n, ind, lower, upper);
+        else
+            retcode = SCIPlpiChgSides(self->lpi, n, ind, lower, upper);
+    }
+
+    free(ind);
+    free(lower);
+    free(upper);
+
+    if (PyErr_Occurred())
+        return NULL;
+    PY_SCIP_CALL(error, NULL, retcode);
+    Py_RETURN_NONE;
+}
+
+static PyObject *lp_change_bounds(lp *self, PyObject *args) {
+    return _change_ranges(self, args, true);
+}
+
+static PyObject *lp_change_sides(lp *self, PyObject *args) {
+    return _change_ranges(self, args, false);
+}
+
+static PyObject *lp_change_objective(lp *self, PyObject *args) {
+    PyObject *ind_obj, *obj_obj;
+    SCIP_Real *obj;
+    SCIP_RETCODE retcode;
+    int *ind;
+    int n;
+
+    if (!PyArg_ParseTuple(args, "OO", &ind_obj, &obj_obj))
+        return NULL;
+
+    PY_SCIP_CHECK_LP_BUSY(NULL, self);
+    ind = _read_indices(ind_obj, "column", self->ncols, &n);
+    if (ind == NULL)
+        return NULL;
+
+    obj = _read_reals(self, obj_obj, "objective", 0.0, n);
+    retcode = SCIP_OKAY;
+    if (obj != NULL)
+        retcode = SCIPlpiChgObj(self->lpi, n, ind, obj);
+
+    free(ind);
+    free(obj);
+
+    if (PyErr_Occurred())
+        return NULL;
+    PY_SCIP_CALL(error, NULL, retcode);
+    Py_RETURN_NONE;
+}
+
+static const char *_lp_status(lp *self) {
+    if (SCIPlpiIsOptimal(self->lpi))
+        return "optimal";
+    if (SCIPlpiIsPrimalInfeasible(self->lpi))
+        return "infeasible";
+    if (SCIPlpiIsPrimalUnbounded(self->lpi))
+        return "unbounded";
+    if (SCIPlpiIsDualInfeasible(self->lpi))
+        return "inforunbd";
+    return "stopped";
+}
+
+static PyObject *lp_optimize(lp *self, PyObject *args) {
+    // Solves the LP with the primal or dual simplex or the barrier method,
+    // starting from the current basis, and returns the status
+    const char *method;
+    SCIP_RETCODE retcode;
+    int m;
+
+    if (!PyArg_ParseTuple(args, "s", &method))
+        return NULL;
+
+    PY_SCIP_CHECK_LP_BUSY(NULL, self);
+    if (!strcmp(method, "primal"))
+        m = 0;
+    else if (!strcmp(method, "dual"))
+        m = 1;
+    else if (!strcmp(method, "barrier"))
+        m = 2;
+    else {
+        PyErr_SetString(error, "method must be 'primal', 'dual', or 'barrier'");
+        return NULL;
+    }
+
+    self->busy = true;
+    Py_BEGIN_ALLOW_THREADS
+    if (m == 0)
+        retcode = SCIPlpiSolvePrimal(self->lpi);
+    else if (m == 1)
+        retcode = SCIPlpiSolveDual(self->lpi);
+    else
+        retcode = SCIPlpiSolveBarrier(self->lpi, TRUE);
+    Py_END_ALLOW_THREADS
+    self->busy = false;
+
+    PY_SCIP_CALL(error, NULL, retcode);
+    PY_SCIP_CALL(error, NULL, SCIPlpiGetIterations(self->lpi, &self->iterations));
+    return Py_BuildValue("s", _lp_status(self));
+}
+
+typedef struct {
+    py_scip_array array;
+    SCIP_Real *buf;  // where the LP solver writes, or NULL if not wanted
+    bool copy;       // buf is a copy, because the array isn't SCIP_Real[]
+} _lp_output;
+
+static int _output_acquire(PyObject *obj, const char *name, int n, _lp_output *o) {
+    // Finds somewhere for n values to go on their way into obj
+    o->array.is_buffer = false;
+    o->buf = NULL;
+    o->copy = false;
+    if (obj == Py_None)
+        return 0;
+
+    if (PyScipArrayForOutput(error, obj, name, n, false, &o->array) < 0)
+        return -1;
+
+    if (PyScipArrayIsContiguousReal(&o->array)) {
+        o->buf = (SCIP_Real *) o->array.view.buf;
+    } else {
+        o->buf = malloc((n > 0 ? n : 1) * sizeof(SCIP_Real));
+        o->copy = true;
+        if (o->buf == NULL) {
+            PyErr_SetString(error, "ran out of memory");
+            PyScipArrayRelease(&o->array);
+            return -1;
+        }
+    }
+    return 0;
+}
+
+static void _output_release(_lp_output *o, int n, bool ok) {
+    int i;
+    if (o->copy) {
+        for (i = 0; ok && i < n; i++)
+            PyScipArraySet(&o->array, i, o->buf[i]);
+        free(o->buf);
+    }
+    PyScipArrayRelease(&o->array);
+}
+
+static PyObject *lp_fill_solution(lp *self, PyObject *args) {
+    // Writes primal values, dual values, and reduced costs from the last
+    // solve into caller-supplied arrays, any of which can be None.  
+    // Returns the objective value.
+    PyObject *primal_obj, *dual_obj, *redcost_obj;
+    _lp_output primal, dual, redcost;
+    SCIP_RETCODE retcode;
+    SCIP_Real objval;
+
+    if (!PyArg_ParseTuple(args, "OOO", &primal_obj, &dual_obj, &redcost_obj))
+        return NULL;
+
+    PY_SCIP_CHECK_LP_BUSY(NULL, self);
+    if (_output_acquire(primal_obj, "values", self->ncols, &primal) < 0)
+        return NULL;
+    if (_output_acquire(dual_obj, "duals", self->nrows, &dual) < 0) {
+        _output_release(&primal, 0, false);
+        return NULL;
+    }
+    if (_output_acquire(redcost_obj, "reduced_costs", self->ncols, &redcost) < 0) {
+        _output_release(&primal, 0, false);
+        _output_release(&dual, 0, false);
+        return NULL;
+    }
+
+    retcode = SCIPlpiGetSol(self->lpi, &objval, primal.buf, dual.buf, NULL, redcost.buf);
+
+    _output_release(&primal, self->ncols, retcode == SCIP_OKAY);
+    _output_release(&dual, self->nrows, retcode == SCIP_OKAY);
+    _output_release(&redcost, self->ncols, retcode == SCIP_OKAY);
+
+    PY_SCIP_CALL(error, NULL, retcode);
+    return Py_BuildValue("d", objval);
+}
+
+static PyObject *lp_fill_basis(lp *self, PyObject *args) {
+    // Writes the status of each column and row in the current basis into
+    // signed integer arrays
+    PyObject *cstat_obj, *rstat_obj;
+    py_scip_array cstat_out, rstat_out;
+    SCIP_RETCODE retcode;
+    int *cstat, *rstat;
+    int i;
+
+    if (!PyArg_ParseTuple(args, "OO", &cstat_obj, &rstat_obj))
+        return NULL;
+
+    PY_SCIP_CHECK_LP_BUSY(NULL, self);
+    if (PyScipArrayForOutput(error, cstat_obj, "columns", self->ncols, true, &cstat_out) < 0)
+        return NULL;
+    if (PyScipArrayForOutput(error, rstat_obj, "rows", self->nrows, true, &rstat_out) < 0) {
+        PyScipArrayRelease(&cstat_out);
+        return NULL;
+    }
+
+    cstat = malloc((self->ncols > 0 ? self->ncols : 1) * sizeof(int));
+    rstat = malloc((self->nrows > 0 ? self->nrows : 1) * sizeof(int));
+    retcode = SCIP_NOMEMORY;
+    if (cstat != NULL && rstat != NULL)
+        retcode = SCIPlpiGetBase(self->lpi, cstat, rstat);
+
+    for (i = 0; retcode == SCIP_OKAY && i < self->ncols; i++)
+        PyScipArraySet(&cstat_out, i, cstat[i]);
+    for (i = 0; retcode == SCIP_OKAY && i < self->nrows; i++)
+        PyScipArraySet(&rstat_out, i, rstat[i]);
+
+    free(cstat);
+    free(rstat);
+    PyScipArrayRelease(&cstat_out);
+    PyScipArrayRelease(&rstat_out);
+
+    PY_SCIP_CALL(error, NULL, retcode);
+    Py_RETURN_NONE;
+}
+
+static int *_read_basis(PyObject *obj, const char *name, int n) {
+    // Reads an array of n basis statuses into a new array
+    py_scip_array a;
+    long long status;
+    int *result;
+    int i;
+
+    if (PyScipArrayFromObject(error, obj, name, 0, n, true, &a) < 0)
+        return NULL;
+    if (!a.is_buffer) {
+        PyErr_Format(error, "%s must be an array of integers", name);
+        return NULL;
+    }
+
+    result = malloc((n > 0 ? n : 1) * sizeof(int));
+    if (result == NULL)
+        PyErr_SetString(error, "ran out of memory");
+
+    for (i = 0; result != NULL && i < n; i++) {
+        status = PyScipArrayGetIndex(&a, i);
+        if (status < SCIP_BASESTAT_LOWER || status > SCIP_BASESTAT_ZERO) {
+            PyErr_Format(error, "invalid basis status in %s", name);
+            free(result);
+            result = NULL;
+        } else {
+            result[i] = (int) status;
+        }
+    }
+
+    PyScipArrayRelease(&a);
+    return result;
+}
+
+static PyObject *lp_set_basis(lp *self, PyObject *args) {
+    // Sets the basis the next solve starts from
+    PyObject *cstat_obj, *rstat_obj;
+    SCIP_RETCODE retcode;
+    int *cstat, *rstat;
+
+    if (!PyArg_ParseTuple(args, "OO", &cstat_obj, &rstat_obj))
+        return NULL;
+
+    PY_SCIP_CHECK_LP_BUSY(NULL, self);
+    cstat = _read_basis(cstat_obj, "columns", self->ncols);
+    if (cstat == NULL)
+        return NULL;
+    rstat = _read_basis(rstat_obj, "rows", self->nrows);
+    if (rstat == NULL) {
+        free(cstat);
+        return NULL;
+    }
+
+    retcode = SCIPlpiSetBase(self->lpi, cstat, rstat);
+    free(cstat);
+    free(rstat);
+
+    PY_SCIP_CALL(error, NULL, retcode);
+    Py_RETURN_NONE;
+}
+
 /*****************************************************************************/
 /* MODULE INITIALIZATION                                                     */
 /*****************************************************************************/
+static PyMemberDef lp_members[] = {
+    {"busy", T_BOOL, offsetof(lp, busy), READONLY, "LP is being solved in another thread"},
+    {"ncols", T_INT, offsetof(lp, ncols), READONLY, "number of columns in the LP"},
+    {"nrows", T_INT, offsetof(lp, nrows), READONLY, "number of rows in the LP"},
+    {"iterations", T_INT, offsetof(lp, iterations), READONLY, "simplex iterations in the last solve"},
+    {NULL} /* Sentinel */
+};
+
 static PyMethodDef lp_methods[] = {
+    {"add_columns", (PyCFunction) lp_add_columns, METH_VARARGS | METH_KEYWORDS, "add columns with bounds and objective coefficients"},
+    {"add_rows", (PyCFunction) lp_add_rows, METH_VARARGS | METH_KEYWORDS, "add rows in compressed sparse row format"},
+    {"change_bounds", (PyCFunction) lp_change_bounds, METH_VARARGS, "change bounds on columns"},
+    {"change_sides", (PyCFunction) lp_change_sides, METH_VARARGS, "change left and right hand sides of rows"},
+    {"change_objective", (PyCFunction) lp_change_objective, METH_VARARGS, "change objective coefficients of columns"},
+    {"optimize", (PyCFunction) lp_optimize, METH_VARARGS, "solve the LP and return its status"},
+    {"fill_solution", (PyCFunction) lp_fill_solution, METH_VARARGS, "write primal values, duals, and reduced costs into arrays"},
+    {"fill_basis", (PyCFunction) lp_fill_basis, METH_VARARGS, "write basis statuses of columns and rows into arrays"},
+    {"set_basis", (PyCFunction) lp_set_basis, METH_VARARGS, "set basis statuses of columns and rows"},
     {NULL} /* Sentinel */
 };
 
@@ -70,7 +612,7 @@ static PyTypeObject lp_type = {
     0,                           /* tp_iter */
     0,                           /* tp_iternext */
     lp_methods,                  /* tp_methods */
-    0,                           /* tp_members */
+    lp_members,                  /* tp_members */
     0,                           /* tp_getset */
     0,                           /* tp_base */
     0,                           /* tp_dict */
@@ -116,6 +658,12 @@ PyMODINIT_FUNC PyInit__lp(void) {
     PyModule_AddIntConstant(m, "MAXIMIZE", SCIP_OBJSENSE_MAXIMIZE);
     PyModule_AddIntConstant(m, "MINIMIZE", SCIP_OBJSENSE_MINIMIZE);
 
+    // Basis statuses of columns and rows
+    PyModule_AddIntConstant(m, "LOWER", SCIP_BASESTAT_LOWER);
+    PyModule_AddIntConstant(m, "BASIC", SCIP_BASESTAT_BASIC);
+    PyModule_AddIntConstant(m, "UPPER", SCIP_BASESTAT_UPPER);
+    PyModule_AddIntConstant(m, "ZERO", SCIP_BASESTAT_ZERO);
+
     Py_INCREF(&lp_type);
     PyModule_AddObject(m, "lp", (PyObject *) &lp_type);
 
@@ -22,6 +22,7 @@ static int selector_init(selector *self, PyObject *args, PyObject *kwds) {
     
     solv = (solver *) s;
     self->scip = solv->scip;
+    self->solver = s;
     
     // Load the selector from SCIP
     r = SCIPfindNodesel(self->scip, name);
@@ -50,6 +51,8 @@ static PyObject* selector_getattr(selector *self, PyObject *attr_name) {
 }
 
 static int selector_setattr(selector *self, PyObject *attr_name, PyObject *value) {
+    PY_SCIP_CHECK_BUSY(error, -1, self->solver);
+
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
         if (PyUnicode_CompareWithASCIIString(attr_name, "memsavepriority") == 0) {
@@ -22,6 +22,7 @@ static int propagator_init(propagator *self, PyObject *args, PyObject *kwds) {
     
     solv = (solver *) s;
     self->scip = solv->scip;
+    self->solver = s;
     
     // Load the propagator from SCIP
     r = SCIPfindProp(self->scip, name);
@@ -52,6 +53,8 @@ static PyObject* propagator_getattr(propagator *self, PyObject *attr_name) {
 static int propagator_setattr(propagator *self, PyObject *attr_name, PyObject *value) {
     int i;
     
+    PY_SCIP_CHECK_BUSY(error, -1, self->solver);
+
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
         PY_SCIP_SET_INT_MIN("frequency", self->prop->freq, -1); 
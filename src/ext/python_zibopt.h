@@ -4,6 +4,7 @@
 #include <Python.h>
 #include <ctype.h>
 #include <stdbool.h>
+#include <stdint.h>
 #include <string.h>
 #include <structmember.h>
 
@@ -60,12 +61,11 @@
 #define PyInit__vars init_vars
 #endif
 
-// Note that the above macros must apply to the following:
-#include "python_zibopt_util.h"
-
 #define CONSTRAINT_TYPE_NAME "constraint"
+#define CONSTRAINT_BLOCK_TYPE_NAME "constraint_block"
 #define SOLVER_TYPE_NAME "solver"
 #define VARIABLE_TYPE_NAME "variable"
+#define VARIABLE_BLOCK_TYPE_NAME "variable_block"
 
 // These are from set.c in SCIP code
 #define SCIP_DEFAULT_LIMIT_TIME 1e+20 /**< maximal time in seconds to run */
@@ -78,36 +78,85 @@ typedef struct {
     PyObject_HEAD
     SCIP_VAR *variable;
     SCIP *scip;
+    PyObject *solver;      // owning solver (borrowed)
     double upper;          // upper bound
     double lower;          // lower bound
-    struct variable *next; // linked list next
+    int index;             // position in solver variable array
 } variable;
 
 typedef struct {
     PyObject_HEAD
     SCIP_CONS *constraint;
     SCIP *scip;
-    SCIP_VAR **linear_vars;  // linear terms
-    SCIP_Real *linear_coef;  // linear coefficients
-    int linear_nvars;        // number of linear terms
-    SCIP_VAR **bilin_var1;   // first bilinear terms
-    SCIP_VAR **bilin_var2;   // second bilinear terms
-    SCIP_Real *bilin_coef;   // bilinear coefficients
-    int bilin_nvars;         // number of bilinear terms
-    struct constraint *next; // linked list next
+    PyObject *solver;        // owning solver (borrowed)
+    bool quadratic;          // quadratic or linear constraint handler
+    int index;               // position in solver constraint array
+    int ndropped;            // terms merged or dropped when it was created
 } constraint;
 
 typedef struct {
     PyObject_HEAD
     SCIP *scip;
-    variable   *first_var;   // linked list head
-    constraint *first_cons;  // linked list head
+    SCIP_VAR  **vars;        // all variables, in order of creation
+    int nvars;               // number of variables
+    int vars_size;           // allocated length of vars
+    SCIP_CONS **conss;       // all constraints, in order of creation
+    int nconss;              // number of constraints
+    int conss_size;          // allocated length of conss
+    bool busy;               // solving in another thread
+    PyObject *incumbent;     // new solution callback, only set while solving
+    double *incumbent_values;// buffer of variable values for the callback
+    int incumbent_filterpos; // event filter position for new solutions
+    PyObject *lazy;          // lazy constraint callback, only set while solving
+    double *lazy_values;     // buffer of candidate values for lazy constraints
+    bool lazy_separate;      // whether the callback wants fractional LP solutions
+    SCIP_CONS *lazy_cons;    // locks variables while lazy constraints are on
+    double *history;         // time, primal and dual bound at each incumbent
+    int nhistory;            // number of incumbents in history
+    int history_size;        // allocated number of incumbents in history
+    double root_time;        // solving time when the root was solved, or -1
+    int stats_filterpos;     // event filter position for statistics
+    double *samples;         // ring buffer of progress samples, or NULL
+    int samples_size;        // number of samples the buffer holds
+    int samples_start;       // position of the oldest sample
+    int nsamples;            // number of samples in the buffer
+    double sample_interval;  // seconds between progress samples
+    SCIP_Longint sample_nodes; // nodes between progress samples, or 0
+    double last_sample_time; // solving time of the last sample
+    SCIP_Longint last_sample_node; // node count at the last sample
+    double drop_tolerance;   // smaller coefficients are left out of new constraints
+    long long ndropped;      // terms merged or dropped from all constraints
+    int nsolves;             // number of times SCIPsolve has been called
+    SCIP_CONS **trans_conss; // transformed constraints, looked up once per solve
+    int ntrans_conss;        // number of constraints in trans_conss
+    int trans_solve;         // value of nsolves when trans_conss was filled
+    SCIP_HASHMAP *var_index; // variables to solver index + 1, see PyScipVarIndex
+    int var_index_n;         // number of variables in var_index
+    int var_index_size;      // number of variables var_index was sized for
 } solver;
 
+typedef struct {
+    PyObject_HEAD
+    SCIP *scip;
+    PyObject *solver;        // owning solver, holds the variable array
+    int start;               // index of first variable in the solver
+    int size;                // number of variables in the block
+} variable_block;
+
+typedef struct {
+    PyObject_HEAD
+    SCIP *scip;
+    PyObject *solver;        // owning solver, kept alive for release
+    SCIP_CONS **constraints; // linear constraints, one per row
+    int size;                // number of constraints in the block
+    long long ndropped;      // terms merged or dropped from its rows
+} constraint_block;
+
 typedef struct {
     PyObject_HEAD
     SCIP_SOL *solution;
     SCIP *scip;
+    PyObject *solver; // owning solver (borrowed)
     double objective; // objective value
     bool optimal;     // solution status flags
     bool infeasible;
@@ -118,6 +167,10 @@ typedef struct {
 typedef struct {
     PyObject_HEAD
     SCIP_LPI *lpi;
+    int ncols;               // number of columns added
+    int nrows;               // number of rows added
+    int iterations;          // simplex iterations in the last solve
+    bool busy;               // solving in another thread
 } lp;
 
 #define PY_SCIP_SETTINGS_TYPE(setting_type, setting_field, struct_name) \
@@ -125,6 +178,7 @@ typedef struct { \
     PyObject_HEAD \
     setting_type *setting_field; \
     SCIP *scip; \
+    PyObject *solver; \
 } struct_name;
   
 PY_SCIP_SETTINGS_TYPE(SCIP_BRANCHRULE, branch, branching_rule);
@@ -136,5 +190,8 @@ PY_SCIP_SETTINGS_TYPE(SCIP_PROP, prop, propagator);
 PY_SCIP_SETTINGS_TYPE(SCIP_NODESEL, nodesel, selector);
 PY_SCIP_SETTINGS_TYPE(SCIP_SEPA, sepa, separator);
 
+// Note that the compatibility macros above must apply to the following:
+#include "python_zibopt_util.h"
+
 #endif
 
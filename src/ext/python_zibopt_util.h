@@ -12,6 +12,16 @@
         } \
     } while (FALSE);
 
+// Solves run without holding the GIL, so other Python threads can reach a
+// solver while SCIPsolve is working on it.  Anything that reads or changes
+// solver state checks this first and raises instead.
+#define PY_SCIP_CHECK_BUSY(error_type, fail_code, solv) \
+    do { \
+        if ((solv) != NULL && ((solver *) (solv))->busy) { \
+            PyErr_SetString(error_type, "solver is busy"); \
+            return fail_code; \
+        } \
+    } while (FALSE);
 
 // SCIP solver: utility to load setting names
 #define PY_SCIP_SETTING_NAMES(function_name, setting_count, setting) \
@@ -91,5 +101,338 @@ static PyObject *function_name(solver *self) { \
             } \
         }
 
-#endif
+// Bulk array arguments: either a single number that applies to every
+// element, or a one-dimensional buffer of numbers such as array.array
+// or a numpy array.  Elements are converted as they are read.
+typedef struct {
+    Py_buffer view;  // underlying buffer, if we were given one
+    char kind;       // 'f' for floating point, 'i' signed, 'u' unsigned
+    double scalar;   // value for every element otherwise
+    bool is_buffer;
+} py_scip_array;
+
+static char _py_scip_buffer_kind(Py_buffer *view) {
+    // Figures out what sort of numbers a buffer contains.  Byte order
+    // markers are fine so long as they agree with the machine, since
+    // itemsize tells us how large the elements are.
+    const char *f = view->format ? view->format : "B";
+    const int one = 1;
+    bool little = *((char *) &one) == 1;
+
+    if (*f == '@' || *f == '=' || (*f == '<' && little) || (*f == '>' && !little))
+        f++;
+    if (f[0] == '\0' || f[1] != '\0')
+        return 0;
+
+    switch (*f) {
+        case 'd':
+            return view->itemsize == sizeof(double) ? 'f' : 0;
+        case 'f':
+            return view->itemsize == sizeof(float) ? 'f' : 0;
+        case 'b': case 'h': case 'i': case 'l': case 'q': case 'n':
+            return 'i';
+        case 'B': case 'H': case 'I': case 'L': case 'Q': case 'N': case '?':
+            return 'u';
+    }
+    return 0;
+}
+
+static void PyScipArrayRelease(py_scip_array *a) {
+    if (a->is_buffer)
+        PyBuffer_Release(&a->view);
+    a->is_buffer = false;
+}
+
+static int PyScipArrayFromObject(PyObject *error_type, PyObject *obj, const char *name,
+    double default_value, Py_ssize_t length, bool integral, py_scip_array *a) {
+    // Fills in a py_scip_array from a Python object.  None or NULL means
+    // use the default value.  If length is nonnegative, buffers must have
+    // exactly that many elements.  Integral arrays are indices and have
+    // no default, so they must be buffers.  Returns -1 and sets an error 
+    // on failure.
+    a->is_buffer = false;
+    a->kind = 'f';
+    a->scalar = default_value;
+
+    if (integral && (obj == NULL || obj == Py_None)) {
+        PyErr_Format(error_type, "%s must be an array of integers", name);
+        return -1;
+    }
+
+    if (obj == NULL || obj == Py_None)
+        return 0;
+
+    if (!integral && (PyFloat_Check(obj) || PyLong_Check(obj))) {
+        a->scalar = PyFloat_AsDouble(obj);
+        return 0;
+    }
+
+    if (!PyObject_CheckBuffer(obj) || PyObject_GetBuffer(obj, &a->view, PyBUF_STRIDES | PyBUF_FORMAT) < 0) {
+        PyErr_Clear();
+        PyErr_Format(error_type, "%s must be an array of numbers", name);
+        return -1;
+    }
+    a->is_buffer = true;
+
+    a->kind = _py_scip_buffer_kind(&a->view);
+    if (a->view.ndim != 1 || !a->kind || (integral && a->kind == 'f')) {
+        PyErr_Format(error_type, "%s must be a one-dimensional array of %s",
+            name, integral ? "integers" : "numbers");
+        PyBuffer_Release(&a->view);
+        a->is_buffer = false;
+        return -1;
+    }
+
+    if (length >= 0 && a->view.shape[0] != length) {
+        PyErr_Format(error_type, "%s must have length %zd", name, length);
+        PyBuffer_Release(&a->view);
+        a->is_buffer = false;
+        return -1;
+    }
+
+    return 0;
+}
+
+static int PyScipArrayForOutput(PyObject *error_type, PyObject *obj, const char *name,
+    Py_ssize_t length, bool integral, py_scip_array *a) {
+    // Acquires a writable buffer with exactly length elements to store
+    // results in.  Floating point results need a floating point buffer,
+    // and indices need a signed integer buffer.
+    a->is_buffer = false;
+    a->scalar = 0;
+
+    if (!PyObject_CheckBuffer(obj) || PyObject_GetBuffer(obj, &a->view, PyBUF_STRIDES | PyBUF_FORMAT | PyBUF_WRITABLE) < 0) {
+        PyErr_Clear();
+        PyErr_Format(error_type, "%s must be a writable array", name);
+        return -1;
+    }
+    a->is_buffer = true;
+
+    a->kind = _py_scip_buffer_kind(&a->view);
+    if (a->view.ndim != 1 || a->kind != (integral ? 'i' : 'f')) {
+        PyErr_Format(error_type, "%s must be a one-dimensional array of %s",
+            name, integral ? "signed integers" : "floats");
+        PyScipArrayRelease(a);
+        return -1;
+    }
+
+    if (a->view.shape[0] != length) {
+        PyErr_Format(error_type, "%s must have length %zd", name, length);
+        PyScipArrayRelease(a);
+        return -1;
+    }
+
+    return 0;
+}
+
+static bool PyScipArrayIsContiguousReal(py_scip_array *a) {
+    // Whether SCIP can write straight into the buffer as SCIP_Real[]
+    return a->is_buffer && a->kind == 'f' && a->view.itemsize == sizeof(SCIP_Real) &&
+        a->view.strides[0] == sizeof(SCIP_Real);
+}
+
+static void PyScipArraySet(py_scip_array *a, Py_ssize_t i, double d) {
+    // Only valid for arrays acquired with PyScipArrayForOutput
+    char *p = (char *) a->view.buf + i * a->view.strides[0];
+    if (a->kind == 'f') {
+        if (a->view.itemsize == sizeof(double))
+            *((double *) p) = d;
+        else
+            *((float *) p) = (float) d;
+        return;
+    }
+
+    switch (a->view.itemsize) {
+        case 1:
+            *((int8_t *) p) = (int8_t) d;
+            break;
+        case 2:
+            *((int16_t *) p) = (int16_t) d;
+            break;
+        case 4:
+            *((int32_t *) p) = (int32_t) d;
+            break;
+        default:
+            *((int64_t *) p) = (int64_t) d;
+    }
+}
+
+static Py_ssize_t PyScipArrayLength(py_scip_array *a) {
+    return a->is_buffer ? a->view.shape[0] : 1;
+}
 
+static double PyScipArrayGet(py_scip_array *a, Py_ssize_t i) {
+    char *p;
+    if (!a->is_buffer)
+        return a->scalar;
+
+    p = (char *) a->view.buf + i * a->view.strides[0];
+    if (a->kind == 'f')
+        return a->view.itemsize == sizeof(double) ? *((double *) p) : *((float *) p);
+
+    switch (a->view.itemsize) {
+        case 1:
+            return a->kind == 'i' ? *((int8_t *) p) : *((uint8_t *) p);
+        case 2:
+            return a->kind == 'i' ? *((int16_t *) p) : *((uint16_t *) p);
+        case 4:
+            return a->kind == 'i' ? *((int32_t *) p) : *((uint32_t *) p);
+        default:
+            return a->kind == 'i' ? (double) *((int64_t *) p) : (double) *((uint64_t *) p);
+    }
+}
+
+static long long PyScipArrayGetIndex(py_scip_array *a, Py_ssize_t i) {
+    // Only valid for arrays acquired with integral set to true
+    char *p = (char *) a->view.buf + i * a->view.strides[0];
+    switch (a->view.itemsize) {
+        case 1:
+            return a->kind == 'i' ? *((int8_t *) p) : *((uint8_t *) p);
+        case 2:
+            return a->kind == 'i' ? *((int16_t *) p) : *((uint16_t *) p);
+        case 4:
+            return a->kind == 'i' ? *((int32_t *) p) : *((uint32_t *) p);
+        default:
+            return a->kind == 'i' ? *((int64_t *) p) : (long long) *((uint64_t *) p);
+    }
+}
+
+static SCIP_VAR **PyScipGetVariables(PyObject *error_type, solver *solv, PyObject *variables,
+    int *n, bool *owned) {
+    // Resolves an argument naming a set of variables into an array of SCIP
+    // variables.  Accepts None for every variable in the solver, a
+    // variable_block, an integer array of solver indices, or a sequence of
+    // variable objects.  If *owned is set, the caller must free the array.
+    SCIP_VAR **vars;
+    py_scip_array indices;
+    PyObject *seq, *v;
+    long long j;
+    Py_ssize_t i;
+
+    *owned = false;
+    if (variables == NULL || variables == Py_None) {
+        *n = solv->nvars;
+        return solv->vars;
+    }
+
+    if (!strcmp(variables->ob_type->tp_name, VARIABLE_BLOCK_TYPE_NAME)) {
+        variable_block *block = (variable_block *) variables;
+        if (block->scip != solv->scip) {
+            PyErr_SetString(error_type, "variable not associated with solver");
+            return NULL;
+        }
+        *n = block->size;
+        return solv->vars + block->start;
+    }
+
+    if (PyObject_CheckBuffer(variables)) {
+        if (PyScipArrayFromObject(error_type, variables, "variables", 0, -1, true, &indices) < 0)
+            return NULL;
+
+        *n = (int) PyScipArrayLength(&indices);
+        vars = malloc((*n > 0 ? *n : 1) * sizeof(SCIP_VAR *));
+        if (vars == NULL) {
+            PyErr_SetString(error_type, "ran out of memory");
+            PyScipArrayRelease(&indices);
+            return NULL;
+        }
+
+        for (i = 0; i < *n; i++) {
+            j = PyScipArrayGetIndex(&indices, i);
+            if (j < 0 || j >= solv->nvars) {
+                PyErr_SetString(error_type, "variable index out of range");
+                PyScipArrayRelease(&indices);
+                free(vars);
+                return NULL;
+            }
+            vars[i] = solv->vars[j];
+        }
+
+        PyScipArrayRelease(&indices);
+        *owned = true;
+        return vars;
+    }
+
+    seq = PySequence_Fast(variables, "variables must be a sequence");
+    if (seq == NULL)
+        return NULL;
+
+    *n = (int) PySequence_Fast_GET_SIZE(seq);
+    vars = malloc((*n > 0 ? *n : 1) * sizeof(SCIP_VAR *));
+    if (vars == NULL) {
+        PyErr_SetString(error_type, "ran out of memory");
+        Py_DECREF(seq);
+        return NULL;
+    }
+
+    for (i = 0; i < *n; i++) {
+        v = PySequence_Fast_GET_ITEM(seq, i);
+        if (strcmp(v->ob_type->tp_name, VARIABLE_TYPE_NAME)) {
+            PyErr_SetString(error_type, "invalid variable type");
+            Py_DECREF(seq);
+            free(vars);
+            return NULL;
+        }
+        if (((variable *) v)->scip != solv->scip) {
+            PyErr_SetString(error_type, "variable not associated with solver");
+            Py_DECREF(seq);
+            free(vars);
+            return NULL;
+        }
+        vars[i] = ((variable *) v)->variable;
+    }
+
+    Py_DECREF(seq);
+    *owned = true;
+    return vars;
+}
+
+static SCIP_RETCODE PyScipFreeTransform(solver *solv) {
+    // Goes back to the original problem.  Transformed constraints looked
+    // up for solution duals go away with the transformed problem, so
+    // they have to be looked up again even if no solve follows.
+    solv->ntrans_conss = 0;
+    solv->trans_solve = -1;
+    return SCIPfreeTransform(solv->scip);
+}
+
+static int PyScipVarIndex(PyObject *error_type, solver *solv, SCIP_VAR *var) {
+    // Returns the solver index of an original variable, or -1 and sets an
+    // error if it isn't one of the solver's.  SCIP's problem index can't
+    // be used for this, since SCIP keeps variables grouped by type and
+    // moves them around as variables of other types are added.  Variables
+    // are only ever appended, so the map from variables to indices is
+    // extended as the solver grows, and rebuilt larger when it fills up.
+    SCIP_RETCODE retcode;
+    int i;
+
+    retcode = SCIP_OKAY;
+    if (solv->var_index == NULL || solv->nvars > solv->var_index_size) {
+        if (solv->var_index != NULL)
+            SCIPhashmapFree(&solv->var_index);
+        solv->var_index_n = 0;
+        solv->var_index_size = 2 * solv->nvars + 64;
+        retcode = SCIPhashmapCreate(&solv->var_index, SCIPblkmem(solv->scip), 
+            SCIPcalcHashtableSize(solv->var_index_size));
+    }
+
+    // Images are index + 1, since a missing image is NULL
+    for (i = solv->var_index_n; retcode == SCIP_OKAY && i < solv->nvars; i++)
+        retcode = SCIPhashmapInsert(solv->var_index, solv->vars[i], (void *) (size_t) (i + 1));
+
+    if (retcode != SCIP_OKAY) {
+        if (solv->var_index != NULL)
+            SCIPhashmapFree(&solv->var_index);
+        solv->var_index = NULL;
+        PyErr_SetString(error_type, "ran out of memory");
+        return -1;
+    }
+    solv->var_index_n = solv->nvars;
+
+    i = (int) (size_t) SCIPhashmapGetImage(solv->var_index, var) - 1;
+    if (i < 0)
+        PyErr_SetString(error_type, "variable not associated with solver");
+    return i;
+}
+
+#endif
@@ -3,6 +3,362 @@
 
 static PyObject *error;
 
+/*****************************************************************************/
+/* EVENT HANDLER FOR NEW INCUMBENTS                                          */
+/*****************************************************************************/
+#define INCUMBENT_EVENTHDLR_NAME "python-zibopt-incumbent"
+
+static SCIP_DECL_EVENTINIT(_incumbent_init) {
+    // Watch for new best solutions from the time the problem is transformed
+    solver *self = (solver *) SCIPeventhdlrGetData(eventhdlr);
+    return SCIPcatchEvent(scip, SCIP_EVENTTYPE_BESTSOLFOUND, eventhdlr, NULL, &self->incumbent_filterpos);
+}
+
+static SCIP_DECL_EVENTEXIT(_incumbent_exit) {
+    solver *self = (solver *) SCIPeventhdlrGetData(eventhdlr);
+    return SCIPdropEvent(scip, SCIP_EVENTTYPE_BESTSOLFOUND, eventhdlr, NULL, self->incumbent_filterpos);
+}
+
+static SCIP_DECL_EVENTEXEC(_incumbent_exec) {
+    // Hands a new incumbent to the Python callback.  This runs in the
+    // middle of SCIPsolve, which doesn't hold the GIL.
+    solver *self = (solver *) SCIPeventhdlrGetData(eventhdlr);
+    SCIP_SOL *sol;
+    SCIP_RETCODE retcode;
+    PyGILState_STATE gil;
+    PyObject *result;
+
+    if (self->incumbent == NULL)
+        return SCIP_OKAY;
+
+    // Values go straight into the caller's buffer
+    sol = SCIPeventGetSol(event);
+    if (self->incumbent_values != NULL) {
+        retcode = SCIPgetSolVals(scip, sol, self->nvars, self->vars, self->incumbent_values);
+        if (retcode != SCIP_OKAY)
+            return retcode;
+    }
+
+    gil = PyGILState_Ensure();
+
+    // Once the callback raises an exception, the solve is stopped and the
+    // exception is raised from maximize or minimize.
+    if (!PyErr_Occurred()) {
+        result = PyObject_CallFunction(self->incumbent, "ddd", 
+            SCIPgetSolOrigObj(scip, sol), SCIPgetGap(scip), SCIPgetSolvingTime(scip)
+        );
+        Py_XDECREF(result);
+        if (result == NULL)
+            SCIPinterruptSolve(scip);
+    }
+
+    PyGILState_Release(gil);
+    return SCIP_OKAY;
+}
+
+/*****************************************************************************/
+/* EVENT HANDLER FOR SOLVE STATISTICS                                        */
+/*****************************************************************************/
+#define STATS_EVENTHDLR_NAME "python-zibopt-statistics"
+#define STATS_EVENTTYPE (SCIP_EVENTTYPE_BESTSOLFOUND | SCIP_EVENTTYPE_NODESOLVED)
+
+static SCIP_DECL_EVENTINIT(_stats_init) {
+    // Statistics start over when the problem is transformed, like SCIP's
+    solver *self = (solver *) SCIPeventhdlrGetData(eventhdlr);
+    self->nhistory = 0;
+    self->root_time = -1;
+    return SCIPcatchEvent(scip, STATS_EVENTTYPE, eventhdlr, NULL, &self->stats_filterpos);
+}
+
+static SCIP_DECL_EVENTEXIT(_stats_exit) {
+    solver *self = (solver *) SCIPeventhdlrGetData(eventhdlr);
+    return SCIPdropEvent(scip, STATS_EVENTTYPE, eventhdlr, NULL, self->stats_filterpos);
+}
+
+#define SAMPLE_FIELDS 5 // time, primal bound, dual bound, gap, nodes
+
+static void _sample_progress(solver *self, SCIP *scip) {
+    // Writes a progress sample into the ring buffer, over the oldest one
+    // if it is full
+    double *sample;
+    int i;
+
+    if (self->nsamples < self->samples_size) {
+        i = (self->samples_start + self->nsamples++) % self->samples_size;
+    } else {
+        i = self->samples_start;
+        self->samples_start = (self->samples_start + 1) % self->samples_size;
+    }
+
+    self->last_sample_time = SCIPgetSolvingTime(scip);
+    self->last_sample_node = SCIPgetNTotalNodes(scip);
+
+    sample = self->samples + SAMPLE_FIELDS * i;
+    sample[0] = self->last_sample_time;
+    sample[1] = SCIPgetPrimalbound(scip) + scip->origprob->objoffset;
+    sample[2] = SCIPgetDualbound(scip) + scip->origprob->objoffset;
+    sample[3] = SCIPgetGap(scip);
+    sample[4] = (double) self->last_sample_node;
+}
+
+static SCIP_DECL_EVENTEXEC(_stats_exec) {
+    // Records bounds at each new incumbent and when the root is solved.
+    // This runs for every node, so it has to stay cheap.
+    solver *self = (solver *) SCIPeventhdlrGetData(eventhdlr);
+    double *history, *h;
+    int size;
+
+    if (SCIPeventGetType(event) & SCIP_EVENTTYPE_BESTSOLFOUND) {
+        if (self->nhistory == self->history_size) {
+            // Running out of memory here only means the history is cut short
+            size = self->history_size > 0 ? 2 * self->history_size : 16;
+            history = realloc(self->history, 3 * size * sizeof(double));
+            if (history == NULL)
+                return SCIP_OKAY;
+            self->history = history;
+            self->history_size = size;
+        }
+
+        h = self->history + 3 * self->nhistory++;
+        h[0] = SCIPgetSolvingTime(scip);
+        h[1] = SCIPgetSolOrigObj(scip, SCIPeventGetSol(event)) + scip->origprob->objoffset;
+        h[2] = SCIPgetDualbound(scip) + scip->origprob->objoffset;
+
+    } else if (SCIPnodeGetDepth(SCIPeventGetNode(event)) == 0) {
+        self->root_time = SCIPgetSolvingTime(scip);
+    }
+
+    // Progress is sampled at new incumbents and at the end of each 
+    // interval.  Intervals are checked when nodes are solved.
+    if (self->samples != NULL && (
+        (SCIPeventGetType(event) & SCIP_EVENTTYPE_BESTSOLFOUND) ||
+        SCIPgetSolvingTime(scip) - self->last_sample_time >= self->sample_interval ||
+        (self->sample_nodes > 0 && SCIPgetNTotalNodes(scip) - self->last_sample_node >= self->sample_nodes)))
+        _sample_progress(self, scip);
+
+    return SCIP_OKAY;
+}
+
+/*****************************************************************************/
+/* CONSTRAINT HANDLER FOR LAZY CONSTRAINTS                                   */
+/*****************************************************************************/
+#define LAZY_CONSHDLR_NAME "python-zibopt-lazy"
+
+// Lazy constraints can involve any variable, so the handler's only
+// constraint locks every variable in both directions.  Otherwise presolving
+// could fix variables in ways that the lazy constraints would not allow.
+struct SCIP_ConsData {
+    SCIP_VAR **vars;
+    int nvars;
+};
+
+static SCIP_RETCODE _lazy_consdata(SCIP_CONSDATA **consdata, int nvars) {
+    *consdata = (SCIP_CONSDATA *) malloc(sizeof(SCIP_CONSDATA));
+    if (*consdata == NULL)
+        return SCIP_NOMEMORY;
+    (*consdata)->nvars = nvars;
+    (*consdata)->vars = (SCIP_VAR **) malloc((nvars > 0 ? nvars : 1) * sizeof(SCIP_VAR *));
+    if ((*consdata)->vars == NULL) {
+        free(*consdata);
+        return SCIP_NOMEMORY;
+    }
+    return SCIP_OKAY;
+}
+
+static SCIP_DECL_CONSDELETE(_lazy_delete) {
+    free((*consdata)->vars);
+    free(*consdata);
+    *consdata = NULL;
+    return SCIP_OKAY;
+}
+
+static SCIP_DECL_CONSTRANS(_lazy_trans) {
+    SCIP_CONSDATA *source, *target;
+
+    source = SCIPconsGetData(sourcecons);
+    SCIP_CALL(_lazy_consdata(&target, source->nvars));
+    SCIP_CALL(SCIPgetTransformedVars(scip, source->nvars, source->vars, target->vars));
+
+    return SCIPcreateCons(scip, targetcons, SCIPconsGetName(sourcecons), conshdlr, target,
+        SCIPconsIsInitial(sourcecons), SCIPconsIsSeparated(sourcecons), SCIPconsIsEnforced(sourcecons),
+        SCIPconsIsChecked(sourcecons), SCIPconsIsPropagated(sourcecons), SCIPconsIsLocal(sourcecons),
+        SCIPconsIsModifiable(sourcecons), SCIPconsIsDynamic(sourcecons), SCIPconsIsRemovable(sourcecons),
+        SCIPconsIsStickingAtNode(sourcecons)
+    );
+}
+
+static SCIP_DECL_CONSLOCK(_lazy_lock) {
+    SCIP_CONSDATA *consdata = SCIPconsGetData(cons);
+    int i;
+
+    for (i = 0; i < consdata->nvars; i++)
+        SCIP_CALL(SCIPaddVarLocks(scip, consdata->vars[i], nlockspos + nlocksneg, nlockspos + nlocksneg));
+    return SCIP_OKAY;
+}
+
+static SCIP_RETCODE _lazy_add_row(solver *self, SCIP *scip, py_scip_array *indices, 
+    py_scip_array *coefficients, double lower, double upper) {
+    // Adds a violated row as a linear constraint on the transformed problem
+    SCIP_VAR **vars;
+    SCIP_Real *coef;
+    SCIP_CONS *cons;
+    SCIP_RETCODE retcode;
+    Py_ssize_t k, n;
+
+    n = PyScipArrayLength(indices);
+    vars = (SCIP_VAR **) malloc((n > 0 ? n : 1) * sizeof(SCIP_VAR *));
+    coef = (SCIP_Real *) malloc((n > 0 ? n : 1) * sizeof(SCIP_Real));
+    if (vars == NULL || coef == NULL) {
+        free(vars);
+        free(coef);
+        return SCIP_NOMEMORY;
+    }
+
+    retcode = SCIP_OKAY;
+    for (k = 0; k < n && retcode == SCIP_OKAY; k++) {
+        coef[k] = PyScipArrayGet(coefficients, k);
+        retcode = SCIPgetTransformedVar(scip, self->vars[PyScipArrayGetIndex(indices, k)], &vars[k]);
+    }
+
+    if (retcode == SCIP_OKAY) {
+        retcode = SCIPcreateConsLinear(scip, &cons, "lazy", (int) n, vars, coef, lower, upper,
+            FALSE, TRUE, TRUE, TRUE, TRUE, FALSE, FALSE, FALSE, FALSE, FALSE);
+        if (retcode == SCIP_OKAY) {
+            retcode = SCIPaddCons(scip, cons);
+            SCIPreleaseCons(scip, &cons);
+        }
+    }
+
+    free(vars);
+    free(coef);
+    return retcode;
+}
+
+static int _lazy_rows(solver *self, SCIP *scip, SCIP_SOL *sol, const char *mode, bool add) {
+    // Calls back into Python with candidate values and gets back a list of
+    // rows (indices, coefficients, lower, upper).  Rows the candidate
+    // violates are added to the problem if add is set.  Returns the number
+    // of violated rows, or -1 if there was a Python error.
+    PyGILState_STATE gil;
+    PyObject *rows, *row, *indices_obj, *coefficients_obj;
+    py_scip_array indices, coefficients;
+    SCIP_RETCODE retcode;
+    double lower, upper, activity;
+    long long j;
+    Py_ssize_t i, k, n;
+    int nviolated = 0;
+
+    retcode = SCIPgetSolVals(scip, sol, self->nvars, self->vars, self->lazy_values);
+
+    gil = PyGILState_Ensure();
+
+    if (retcode != SCIP_OKAY)
+        PyScipSetError(error, retcode);
+    if (PyErr_Occurred()) {
+        PyGILState_Release(gil);
+        return -1;
+    }
+
+    rows = PyObject_CallFunction(self->lazy, "s", mode);
+    if (rows != NULL && !PyList_Check(rows)) {
+        PyErr_SetString(error, "lazy constraint callback must return a list");
+        Py_CLEAR(rows);
+    }
+
+    for (i = 0; rows != NULL && i < PyList_GET_SIZE(rows); i++) {
+        row = PyList_GET_ITEM(rows, i);
+        if (!PyArg_ParseTuple(row, "OOdd", &indices_obj, &coefficients_obj, &lower, &upper))
+            break;
+        if (PyScipArrayFromObject(error, indices_obj, "indices", 0, -1, true, &indices) < 0)
+            break;
+        n = PyScipArrayLength(&indices);
+        if (PyScipArrayFromObject(error, coefficients_obj, "coefficients", 0, n, false, &coefficients) < 0) {
+            PyScipArrayRelease(&indices);
+            break;
+        }
+
+        // Only rows the candidate actually violates count.  Adding one that
+        // it satisfies would just get the same candidate back again.
+        activity = 0;
+        for (k = 0; k < n; k++) {
+            j = PyScipArrayGetIndex(&indices, k);
+            if (j < 0 || j >= self->nvars) {
+                PyErr_SetString(error, "variable index out of range");
+                break;
+            }
+            activity += PyScipArrayGet(&coefficients, k) * self->lazy_values[j];
+        }
+
+        if (!PyErr_Occurred() && (SCIPisFeasLT(scip, activity, lower) || SCIPisFeasGT(scip, activity, upper))) {
+            nviolated++;
+            if (add) {
+                lower = lower <= -SCIPinfinity(scip) ? -SCIPinfinity(scip) : lower;
+                upper = upper >= SCIPinfinity(scip) ? SCIPinfinity(scip) : upper;
+                retcode = _lazy_add_row(self, scip, &indices, &coefficients, lower, upper);
+                if (retcode != SCIP_OKAY)
+                    PyScipSetError(error, retcode);
+            }
+        }
+
+        PyScipArrayRelease(&indices);
+        PyScipArrayRelease(&coefficients);
+        if (PyErr_Occurred())
+            break;
+    }
+    Py_XDECREF(rows);
+
+    // Errors stop the solve and are raised from maximize or minimize
+    if (PyErr_Occurred()) {
+        SCIPinterruptSolve(scip);
+        nviolated = -1;
+    }
+
+    PyGILState_Release(gil);
+    return nviolated;
+}
+
+static SCIP_DECL_CONSCHECK(_lazy_check) {
+    solver *self = (solver *) SCIPconshdlrGetData(conshdlr);
+
+    *result = SCIP_FEASIBLE;
+    if (self->lazy != NULL && _lazy_rows(self, scip, sol, "check", false) != 0)
+        *result = SCIP_INFEASIBLE;
+    return SCIP_OKAY;
+}
+
+static SCIP_DECL_CONSENFOLP(_lazy_enforce_lp) {
+    solver *self = (solver *) SCIPconshdlrGetData(conshdlr);
+    int nviolated;
+
+    *result = SCIP_FEASIBLE;
+    if (self->lazy != NULL) {
+        nviolated = _lazy_rows(self, scip, NULL, "enforce", true);
+        if (nviolated > 0)
+            *result = SCIP_CONSADDED;
+        else if (nviolated < 0)
+            *result = SCIP_INFEASIBLE;
+    }
+    return SCIP_OKAY;
+}
+
+static SCIP_DECL_CONSENFOPS(_lazy_enforce_pseudo) {
+    return _lazy_enforce_lp(scip, conshdlr, conss, nconss, nusefulconss, solinfeasible, result);
+}
+
+static SCIP_DECL_CONSSEPALP(_lazy_separate) {
+    solver *self = (solver *) SCIPconshdlrGetData(conshdlr);
+    int nviolated;
+
+    // Most callbacks only want integral candidates, so don't bother 
+    // taking the GIL and copying values for every LP
+    *result = SCIP_DIDNOTRUN;
+    if (self->lazy != NULL && self->lazy_separate) {
+        nviolated = _lazy_rows(self, scip, NULL, "separate", true);
+        *result = nviolated > 0 ? SCIP_CONSADDED : SCIP_DIDNOTFIND;
+    }
+    return SCIP_OKAY;
+}
+
 /*****************************************************************************/
 /* PYTHON TYPE METHODS                                                       */
 /*****************************************************************************/
@@ -15,6 +371,30 @@ static PyObject *solver_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         
         // Default plugins, heuristics, etc
         PY_SCIP_CALL(error, NULL, SCIPincludeDefaultPlugins(self->scip));
+
+        // Event handler for solution callbacks
+        PY_SCIP_CALL(error, NULL, 
+            SCIPincludeEventhdlr(self->scip, INCUMBENT_EVENTHDLR_NAME, "calls back into python with new incumbents",
+                NULL, NULL, _incumbent_init, _incumbent_exit, NULL, NULL, NULL, _incumbent_exec, 
+                (SCIP_EVENTHDLRDATA *) self)
+        );
+
+        // Event handler for solve statistics
+        PY_SCIP_CALL(error, NULL, 
+            SCIPincludeEventhdlr(self->scip, STATS_EVENTHDLR_NAME, "records bounds for solve statistics",
+                NULL, NULL, _stats_init, _stats_exit, NULL, NULL, NULL, _stats_exec, 
+                (SCIP_EVENTHDLRDATA *) self)
+        );
+
+        // Constraint handler for lazy constraints.  Its negative priorities
+        // mean it only sees candidates that are already integral.
+        PY_SCIP_CALL(error, NULL,
+            SCIPincludeConshdlr(self->scip, LAZY_CONSHDLR_NAME, "calls back into python for lazy constraints",
+                0, -1, -1, 1, -1, 100, 0, FALSE, FALSE, FALSE, TRUE,
+                NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, _lazy_delete, _lazy_trans, NULL,
+                _lazy_separate, NULL, _lazy_enforce_lp, _lazy_enforce_pseudo, _lazy_check, NULL, NULL, NULL,
+                _lazy_lock, NULL, NULL, NULL, NULL, NULL, NULL, NULL, (SCIP_CONSHDLRDATA *) self)
+        );
         
         // SCIPcreateProb Arguments:
         // scip         SCIP data structure
@@ -38,11 +418,11 @@ static PyObject *solver_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 }
 
 static int solver_init(solver *self, PyObject *args, PyObject *kwds) {
-    static char *argnames[] = {"quiet", NULL};
+    static char *argnames[] = {"quiet", "drop_tolerance", NULL};
     bool quiet;
     
     quiet = true;
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|b", argnames, &quiet))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|bd", argnames, &quiet, &self->drop_tolerance))
         return -1;
 
     // Turn on/off solver chatter
@@ -56,25 +436,35 @@ static int solver_init(solver *self, PyObject *args, PyObject *kwds) {
 }
 
 static void solver_dealloc(solver *self) {
+    int i;
+
     if (self->scip) {
         // Free all variables
-        while (self->first_var != NULL) {
-            SCIPreleaseVar(self->scip, &self->first_var->variable);
-            self->first_var = (variable *) self->first_var->next;
-        }
-        self->first_var = NULL;
+        for (i = 0; i < self->nvars; i++)
+            SCIPreleaseVar(self->scip, &self->vars[i]);
+        free(self->vars);
+        self->vars = NULL;
+        self->nvars = self->vars_size = 0;
         
         // Free constraints
-        while (self->first_cons != NULL) {
-            SCIPreleaseCons(self->scip, &self->first_cons->constraint);
-            self->first_cons = (constraint *) self->first_cons->next;
-        }
-        self->first_cons = NULL;
+        if (self->lazy_cons != NULL)
+            SCIPreleaseCons(self->scip, &self->lazy_cons);
+        for (i = 0; i < self->nconss; i++)
+            SCIPreleaseCons(self->scip, &self->conss[i]);
+        free(self->conss);
+        self->conss = NULL;
+        self->nconss = self->conss_size = 0;
         
+        if (self->var_index != NULL)
+            SCIPhashmapFree(&self->var_index);
+
         // Free the solver itself
         SCIPfree(&self->scip);
         self->scip = NULL;
     }
+    free(self->history);
+    free(self->samples);
+    free(self->trans_conss);
 
     ((PyObject *) self)->ob_type->tp_free(self);
 }
@@ -82,114 +472,387 @@ static void solver_dealloc(solver *self) {
 /*****************************************************************************/
 /* ADDITONAL METHODS                                                         */
 /*****************************************************************************/
-static int _seed_primal(solver *self, PyObject *solution) {
-    // Extracts data for a primal solution and hands it to SCIP
+static int _free_transform(solver *self) {
+    // Goes back to the original problem if SCIP has transformed it.  
+    // Freeing a large transformed problem is worth releasing the GIL for.
+    SCIP_RETCODE retcode;
+    bool busy = self->busy; // already set if called from _optimize
+
+    if (SCIPgetStage(self->scip) == SCIP_STAGE_PROBLEM)
+        return 0;
+
+    self->busy = true;
+    Py_BEGIN_ALLOW_THREADS
+    retcode = PyScipFreeTransform(self);
+    Py_END_ALLOW_THREADS
+    self->busy = busy;
+
+    PY_SCIP_CALL(error, -1, retcode);
+    return 0;
+}
+
+static int _set_lazy_locks(solver *self, bool on) {
+    // Adds or removes the constraint that locks variables for lazy 
+    // constraints.  It is rebuilt if variables have been added since.
+    SCIP_CONSHDLR *conshdlr;
+    SCIP_CONSDATA *consdata;
+    SCIP_RETCODE retcode;
+
+    if (self->lazy_cons != NULL) {
+        if (on && SCIPconsGetData(self->lazy_cons)->nvars == self->nvars)
+            return 0;
+        if (_free_transform(self) < 0)
+            return -1;
+        PY_SCIP_CALL(error, -1, SCIPdelCons(self->scip, self->lazy_cons));
+        PY_SCIP_CALL(error, -1, SCIPreleaseCons(self->scip, &self->lazy_cons));
+        self->lazy_cons = NULL;
+    }
+
+    if (!on)
+        return 0;
+    if (_free_transform(self) < 0)
+        return -1;
+
+    conshdlr = SCIPfindConshdlr(self->scip, LAZY_CONSHDLR_NAME);
+    PY_SCIP_CALL(error, -1, _lazy_consdata(&consdata, self->nvars));
+    memcpy(consdata->vars, self->vars, self->nvars * sizeof(SCIP_VAR *));
+
+    retcode = SCIPcreateCons(self->scip, &self->lazy_cons, "lazy", conshdlr, consdata, 
+        FALSE, TRUE, TRUE, TRUE, FALSE, FALSE, FALSE, FALSE, FALSE, FALSE);
+    if (retcode != SCIP_OKAY) {
+        _lazy_delete(self->scip, conshdlr, NULL, &consdata);
+        self->lazy_cons = NULL;
+        PyScipSetError(error, retcode);
+        return -1;
+    }
+
+    PY_SCIP_CALL(error, -1, SCIPaddCons(self->scip, self->lazy_cons));
+    return 0;
+}
+
+static int _open_solution(solver *self, PyObject *solution, py_scip_array *values) {
+    // Checks that a primal solution is either a dict of variables and
+    // numbers, or an array of values in order of variable index.  Arrays
+    // are opened into values, which the caller releases.
     PyObject *key, *value;
-    Py_ssize_t pos;
-    double d;
-    SCIP_Bool feasible, stored;
-    SCIP_SOL *sol = NULL;
+    Py_ssize_t pos = 0;
 
-    if (solution && PyObject_Length(solution) > 0) {
-        // We were given a primal solution.  Feed it to the solver. But first,
-        // check and make sure we got a dictionary of variables and numbers.
-        pos = 0;
+    values->is_buffer = false;
+    if (PyDict_Check(solution)) {
         while (PyDict_Next(solution, &pos, &key, &value)) {
             // Check and make sure we have a real variable type
             if (strcmp(key->ob_type->tp_name, VARIABLE_TYPE_NAME)) {
                 PyErr_SetString(error, "invalid variable type");
-                return 0;
+                return -1;
             }
             
             // Verify that the variable is associated with this solver
             if (((variable *) key)->scip != self->scip) {
                 PyErr_SetString(error, "variable not associated with solver");
-                return 0;
+                return -1;
             }
         
             // Check and make sure we have a number as the value
             if (!(PyFloat_Check(value) || PyLong_Check(value))) {
                 PyErr_SetString(error, "solution values must be numeric");
-                return 0;
+                return -1;
             }
         }
+        return 0;
+    }
 
-        // Passed validation.  Now we can create the SCIP solution.
-        SCIPtransformProb(self->scip);
-        SCIPcreateSol(self->scip, &sol, NULL);
+    // Arrays may be shorter than the number of variables if some were
+    // added since the solution was found
+    if (PyFloat_Check(solution) || PyLong_Check(solution) ||
+        PyScipArrayFromObject(error, solution, "solution", 0, -1, false, values) < 0) {
+        PyErr_Clear();
+        PyErr_SetString(error, "solutions must be dicts or arrays of values");
+        return -1;
+    }
+    if (PyScipArrayLength(values) > self->nvars) {
+        PyErr_SetString(error, "solution has more values than the solver has variables");
+        PyScipArrayRelease(values);
+        return -1;
+    }
+    return 0;
+}
 
-        // Add all the variables to it            
-        pos = 0;
+static SCIP_RETCODE _fill_solution(solver *self, PyObject *solution, py_scip_array *values, 
+    SCIP_SOL *sol, int *offzero, int noffzero) {
+    // Sets the values of a primal solution.  Only values that are given 
+    // and nonzero are touched.  Variables in offzero have bounds that
+    // exclude zero, so if they are still zero they were left out, and get
+    // whichever of their bounds is closest to zero instead.
+    PyObject *key, *value;
+    Py_ssize_t pos = 0, i;
+    SCIP_VAR *var;
+    double d;
+
+    if (values->is_buffer) {
+        for (i = 0; i < PyScipArrayLength(values); i++) {
+            // NaN means no value was given
+            d = PyScipArrayGet(values, i);
+            if (d && !Py_IS_NAN(d))
+                SCIP_CALL(SCIPsetSolVal(self->scip, sol, self->vars[i], d));
+        }
+
+    } else {
         while (PyDict_Next(solution, &pos, &key, &value)) {
-            // Convert the value to a C double
-            if (PyFloat_Check(value))
-                d = PyFloat_AsDouble(value);
-            else
-                d = (double) PyLong_AsLong(value);
-            
-            // Only set nonzero values
+            d = PyFloat_AsDouble(value);
             if (d)
-                SCIPsetSolVal(self->scip, sol, ((variable *) key)->variable, d); 
+                SCIP_CALL(SCIPsetSolVal(self->scip, sol, ((variable *) key)->variable, d));
         }
+    }
 
-        PY_SCIP_CALL(error, 0, SCIPcheckSolOrig(self->scip, sol, &feasible, TRUE, FALSE));
-        if (!feasible)
-            PyErr_SetString(error, "infeasible primal solution");
-        
-        // SCIPtrySolFree Arguments:
-        // scip 	        SCIP data structure
-        // sol           	pointer to primal CIP solution; is cleared in function call
-        // printreason      should all reasons of violations be printed
-        // checkbounds 	    should the bounds of the variables be checked?
-        // checkintegrality has integrality to be checked?
-        // checklprows 	    have current LP rows to be checked?
-        // stored           stores whether solution was feasible and good enough to keep 
-        SCIPtrySolFree(self->scip, &sol, FALSE, FALSE, FALSE, FALSE, &stored);
-        
-        // We don't actually do anything with the value of stored for the
-        // time being.  Other programs do an assert(stored) but we have
-        // already tested it for feasibility and don't want to raise an
-        // error if the primal objective value is too poor to use.
+    for (i = 0; i < noffzero; i++) {
+        var = self->vars[offzero[i]];
+        if (SCIPgetSolVal(self->scip, sol, var) == 0) {
+            d = SCIPvarGetLbOriginal(var) > 0 ? SCIPvarGetLbOriginal(var) : SCIPvarGetUbOriginal(var);
+            SCIP_CALL(SCIPsetSolVal(self->scip, sol, var, d));
+        }
     }
-    
+
+    return SCIP_OKAY;
+}
+
+static int _seed_primal(solver *self, PyObject *solutions) {
+    // Hands primal solutions to SCIP.  This can be a single dict or array
+    // of values, or a sequence of them.  Sets an error if none of them 
+    // are feasible.
+    PyObject *seq, *s;
+    py_scip_array *values = NULL;
+    int *offzero = NULL; // variables with bounds that exclude zero
+    int noffzero = 0, ntried = 0, nfeasible = 0, i;
+    Py_ssize_t k, n;
+    SCIP_Bool feasible, stored;
+    SCIP_SOL *sol;
+    SCIP_RETCODE retcode;
+
+    if (solutions == NULL || solutions == Py_None)
+        return 0;
+
+    if (PyDict_Check(solutions) || PyObject_CheckBuffer(solutions))
+        seq = PyTuple_Pack(1, solutions);
+    else
+        seq = PySequence_Fast(solutions, "solution must be a dict, an array, or a sequence of them");
+    if (seq == NULL)
+        return 0;
+    n = PySequence_Fast_GET_SIZE(seq);
+
+    // Check everything before transforming the problem.  Empty dicts are
+    // the same as not passing a solution.
+    values = calloc(n > 0 ? n : 1, sizeof(py_scip_array));
+    offzero = malloc((self->nvars > 0 ? self->nvars : 1) * sizeof(int));
+    if (values == NULL || offzero == NULL) {
+        PyErr_SetString(error, "ran out of memory");
+        goto done;
+    }
+    for (k = 0; k < n; k++) {
+        s = PySequence_Fast_GET_ITEM(seq, k);
+        if (_open_solution(self, s, &values[k]) < 0)
+            goto done;
+        if (!PyDict_Check(s) || PyDict_Size(s) > 0)
+            ntried++;
+    }
+    if (ntried == 0)
+        goto done;
+
+    // A finished solve has no use for new primal solutions
+    if (SCIPgetStage(self->scip) == SCIP_STAGE_SOLVED && _free_transform(self) < 0)
+        goto done;
+
+    // The transformation can take a while, so let other threads run
+    Py_BEGIN_ALLOW_THREADS
+    retcode = SCIPtransformProb(self->scip);
+    Py_END_ALLOW_THREADS
+    if (retcode != SCIP_OKAY) {
+        PyScipSetError(error, retcode);
+        goto done;
+    }
+
+    for (i = 0; i < self->nvars; i++)
+        if (SCIPvarGetLbOriginal(self->vars[i]) > 0 || SCIPvarGetUbOriginal(self->vars[i]) < 0)
+            offzero[noffzero++] = i;
+
+    for (k = 0; k < n; k++) {
+        s = PySequence_Fast_GET_ITEM(seq, k);
+        if (PyDict_Check(s) && PyDict_Size(s) == 0)
+            continue;
+
+        sol = NULL;
+        retcode = SCIPcreateSol(self->scip, &sol, NULL);
+        if (retcode == SCIP_OKAY)
+            retcode = _fill_solution(self, s, &values[k], sol, offzero, noffzero);
+        if (retcode == SCIP_OKAY)
+            retcode = SCIPcheckSolOrig(self->scip, sol, &feasible, TRUE, FALSE);
+
+        // SCIPtrySolFree arguments after the solution are printreason,
+        // checkbounds, checkintegrality, and checklprows.  It has already
+        // been checked.  Whether it was stored doesn't matter, since a 
+        // solution that's feasible but not good enough to keep is fine.
+        if (retcode == SCIP_OKAY && feasible) {
+            nfeasible++;
+            retcode = SCIPtrySolFree(self->scip, &sol, FALSE, FALSE, FALSE, FALSE, &stored);
+        }
+        if (sol != NULL)
+            SCIPfreeSol(self->scip, &sol);
+
+        if (retcode != SCIP_OKAY) {
+            PyScipSetError(error, retcode);
+            goto done;
+        }
+    }
+
+    if (nfeasible == 0)
+        PyErr_SetString(error, "infeasible primal solution");
+
+done:
+    for (k = 0; values != NULL && k < n; k++)
+        PyScipArrayRelease(&values[k]);
+    free(values);
+    free(offzero);
+    Py_DECREF(seq);
     return 0;
 }
 
 static int _optimize(solver *self, PyObject *args, PyObject *kwds) {
     // Runs components of max/min that are the same
-    static char *argnames[] = {"solution", "time", "gap", "absgap", "nsol", "offset", NULL};
-    PyObject *solution;
+    static char *argnames[] = {"solution", "time", "gap", "absgap", "nsol", "offset", 
+        "incumbent", "incumbent_values", "lazy", "lazy_values", "lazy_separate", NULL};
+    PyObject *solution, *incumbent, *incumbent_values, *lazy, *lazy_values_obj;
+    py_scip_array values, lazy_values;
     double time   = SCIP_DEFAULT_LIMIT_TIME;
     double gap    = SCIP_DEFAULT_LIMIT_GAP;
     double absgap = SCIP_DEFAULT_LIMIT_GAP;
     int nsol      = SCIP_DEFAULT_LIMIT_SOLUTIONS;
     double offset = 0;
+    int lazy_separate = 0;
+    SCIP_RETCODE retcode;
     
-    // See if we were given a primal solution dict
-    solution = NULL;
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O!dddid", argnames, &PyDict_Type, &solution, &time, &gap, &absgap, &nsol, &offset))
+    // See if we were given primal solutions
+    solution = incumbent = incumbent_values = lazy = lazy_values_obj = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OdddidOOOOi", argnames, &solution, 
+            &time, &gap, &absgap, &nsol, &offset, &incumbent, &incumbent_values, &lazy, &lazy_values_obj,
+            &lazy_separate))
         return 0;
 
-    _seed_primal(self, solution);
-    if (PyErr_Occurred())
+    // Callback for new incumbents: incumbent(objective, gap, time).  Values
+    // are written into incumbent_values just before it is called.
+    if (incumbent == Py_None)
+        incumbent = NULL;
+    if (incumbent != NULL && !PyCallable_Check(incumbent)) {
+        PyErr_SetString(error, "incumbent callback must be callable");
+        return 0;
+    }
+    values.is_buffer = false;
+    if (incumbent_values == Py_None)
+        incumbent_values = NULL;
+    if (incumbent_values != NULL && PyScipArrayForOutput(error, incumbent_values, "incumbent_values", self->nvars, false, &values) < 0)
+        return 0;
+    if (values.is_buffer && !PyScipArrayIsContiguousReal(&values)) {
+        PyErr_SetString(error, "incumbent_values must be a contiguous array of doubles");
+        PyScipArrayRelease(&values);
+        return 0;
+    }
+
+    // Callback for lazy constraints: lazy(mode) returns a list of rows.
+    // Candidate values are written into lazy_values before it is called.
+    // It is only called with LP solutions if lazy_separate is set.
+    if (lazy == Py_None)
+        lazy = NULL;
+    lazy_values.is_buffer = false;
+    if (lazy != NULL) {
+        if (!PyCallable_Check(lazy))
+            PyErr_SetString(error, "lazy constraint callback must be callable");
+        else if (PyScipArrayForOutput(error, lazy_values_obj == NULL ? Py_None : lazy_values_obj, 
+                "lazy_values", self->nvars, false, &lazy_values) == 0 && !PyScipArrayIsContiguousReal(&lazy_values))
+            PyErr_SetString(error, "lazy_values must be a contiguous array of doubles");
+    }
+    // A finished solve isn't picked up again.  Settings, callbacks, and
+    // bounds changed since then aren't all tracked, so go back to the
+    // original problem.  Interrupted solves continue where they stopped.
+    if (!PyErr_Occurred() && SCIPgetStage(self->scip) == SCIP_STAGE_SOLVED)
+        _free_transform(self);
+    if (!PyErr_Occurred())
+        _set_lazy_locks(self, lazy != NULL);
+    if (PyErr_Occurred()) {
+        PyScipArrayRelease(&values);
+        PyScipArrayRelease(&lazy_values);
         return 0;
+    }
 
-    // Set timeout & gap values, etc
-    SCIPclockReset(self->scip->stat->solvingtime);
-    self->scip->set->limit_time   = time;
-    self->scip->set->limit_gap    = gap;
-    self->scip->set->limit_absgap = absgap;
-    self->scip->set->limit_solutions = nsol;
-    self->scip->origprob->objoffset = offset;
-    
-    // This calls the actual optimization routine
-    PY_SCIP_CALL(error, 0, SCIPsolve(self->scip));
-    
+    // Mark the solver busy for as long as SCIP is working on it without
+    // the GIL.  Other threads touching the solver get an error instead.
+    self->busy = true;
+
+    // Lazy constraints apply to primal solutions too
+    self->lazy = lazy;
+    self->lazy_values = lazy_values.is_buffer ? (double *) lazy_values.view.buf : NULL;
+    self->lazy_separate = lazy != NULL && lazy_separate;
+
+    _seed_primal(self, solution);
+    if (!PyErr_Occurred()) {
+        // Set timeout & gap values, etc
+        SCIPclockReset(self->scip->stat->solvingtime);
+        self->scip->set->limit_time   = time;
+        self->scip->set->limit_gap    = gap;
+        self->scip->set->limit_absgap = absgap;
+        self->scip->set->limit_solutions = nsol;
+        self->scip->origprob->objoffset = offset;
+        
+        // Callbacks are only set for the duration of the solve.  The
+        // arguments tuple keeps them alive until then.
+        self->incumbent = incumbent;
+        self->incumbent_values = values.is_buffer ? (double *) values.view.buf : NULL;
+
+        // Progress samples are for this solve only
+        self->samples_start = self->nsamples = 0;
+        self->last_sample_time = 0;
+        self->last_sample_node = 0;
+
+        // This calls the actual optimization routine.  Anything cached 
+        // about the transformed problem has to be looked up again.
+        self->nsolves++;
+        Py_BEGIN_ALLOW_THREADS
+        retcode = SCIPsolve(self->scip);
+        Py_END_ALLOW_THREADS
+
+        if (self->samples != NULL && SCIPgetStage(self->scip) >= SCIP_STAGE_TRANSFORMED)
+            _sample_progress(self, self->scip);
+
+        self->incumbent = NULL;
+        self->incumbent_values = NULL;
+
+        // An exception from a callback takes precedence
+        if (retcode != SCIP_OKAY && !PyErr_Occurred())
+            PyScipSetError(error, retcode);
+    }
+
+    self->lazy = NULL;
+    self->lazy_values = NULL;
+    self->lazy_separate = false;
+
+    PyScipArrayRelease(&values);
+    PyScipArrayRelease(&lazy_values);
+    self->busy = false;
+    return 0;
+}
+
+static int _set_objsense(solver *self, SCIP_OBJSENSE objsense) {
+    // Changing direction means solving from scratch.  Otherwise an 
+    // interrupted solve, including presolving, is left alone.
+    if (SCIPgetObjsense(self->scip) == objsense)
+        return 0;
+    if (_free_transform(self) < 0)
+        return -1;
+    PY_SCIP_CALL(error, -1, SCIPsetObjsense(self->scip, objsense));
     return 0;
 }
 
 static PyObject *solver_maximize(solver *self, PyObject *args, PyObject *kwds) {
-    PY_SCIP_CALL(error, NULL, SCIPsetObjsense(self->scip, SCIP_OBJSENSE_MAXIMIZE));
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (_set_objsense(self, SCIP_OBJSENSE_MAXIMIZE) < 0)
+        return NULL;
     _optimize(self, args, kwds);
     if (PyErr_Occurred())
         return NULL;
@@ -197,7 +860,9 @@ static PyObject *solver_maximize(solver *self, PyObject *args, PyObject *kwds) {
 }
 
 static PyObject *solver_minimize(solver *self, PyObject *args, PyObject *kwds) {
-    PY_SCIP_CALL(error, NULL, SCIPsetObjsense(self->scip, SCIP_OBJSENSE_MINIMIZE));
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (_set_objsense(self, SCIP_OBJSENSE_MINIMIZE) < 0)
+        return NULL;
     _optimize(self, args, kwds);
     if (PyErr_Occurred())
         return NULL;
@@ -205,7 +870,266 @@ static PyObject *solver_minimize(solver *self, PyObject *args, PyObject *kwds) {
 }
 
 static PyObject *solver_restart(solver *self) {
-    PY_SCIP_CALL(error, NULL, SCIPfreeTransform(self->scip));
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (_free_transform(self) < 0)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+static int _plugin_statistics(PyObject *plugins, const char *name, 
+    SCIP_Longint calls, SCIP_Real time, SCIP_Longint found) {
+    // Adds (calls, time, found) for a plugin to a dict keyed on name
+    PyObject *stats;
+    int result;
+
+    if ((stats = Py_BuildValue("(LdL)", calls, time, found)) == NULL)
+        return -1;
+    result = PyDict_SetItemString(plugins, name, stats);
+    Py_DECREF(stats);
+    return result;
+}
+
+static PyObject *solver_statistics(solver *self) {
+    // Returns a dict of statistics about the last solve.  Everything here
+    // is a counter SCIP already keeps, so it is cheap to collect.
+    SCIP *scip = self->scip;
+    SCIP_SET *set = scip->set;
+    PyObject *stats, *history, *heuristics, *separators, *propagators, *presolvers;
+    double total, presolving, root_end, offset, *h;
+    int i;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (SCIPgetStage(scip) < SCIP_STAGE_TRANSFORMED) {
+        PyErr_SetString(error, "solver has no statistics until it has solved");
+        return NULL;
+    }
+
+    // Solving time includes presolving.  If the root wasn't finished, 
+    // everything after presolving counts as root time.
+    total = SCIPgetSolvingTime(scip);
+    presolving = SCIPgetPresolvingTime(scip);
+    root_end = self->root_time < 0 ? total : self->root_time;
+    offset = scip->origprob->objoffset;
+
+    history = PyList_New(self->nhistory);
+    heuristics = PyDict_New();
+    separators = PyDict_New();
+    propagators = PyDict_New();
+    presolvers = PyDict_New();
+    if (history == NULL || heuristics == NULL || separators == NULL || propagators == NULL || presolvers == NULL)
+        goto fail;
+
+    for (i = 0; i < self->nhistory; i++) {
+        h = self->history + 3 * i;
+        PyObject *entry = Py_BuildValue("(ddd)", h[0], h[1], h[2]);
+        if (entry == NULL)
+            goto fail;
+        PyList_SET_ITEM(history, i, entry);
+    }
+
+    for (i = 0; i < set->nheurs; i++)
+        if (_plugin_statistics(heuristics, SCIPheurGetName(set->heurs[i]), SCIPheurGetNCalls(set->heurs[i]),
+                SCIPheurGetTime(set->heurs[i]), SCIPheurGetNSolsFound(set->heurs[i])) < 0)
+            goto fail;
+
+    for (i = 0; i < set->nsepas; i++)
+        if (_plugin_statistics(separators, SCIPsepaGetName(set->sepas[i]), SCIPsepaGetNCalls(set->sepas[i]),
+                SCIPsepaGetTime(set->sepas[i]), SCIPsepaGetNCutsFound(set->sepas[i])) < 0)
+            goto fail;
+
+    for (i = 0; i < set->nprops; i++)
+        if (_plugin_statistics(propagators, SCIPpropGetName(set->props[i]), SCIPpropGetNCalls(set->props[i]),
+                SCIPpropGetTime(set->props[i]), SCIPpropGetNDomredsFound(set->props[i])) < 0)
+            goto fail;
+
+    for (i = 0; i < set->npresols; i++)
+        if (_plugin_statistics(presolvers, SCIPpresolGetName(set->presols[i]), SCIPpresolGetNCalls(set->presols[i]),
+                SCIPpresolGetTime(set->presols[i]), 
+                SCIPpresolGetNFixedVars(set->presols[i]) + SCIPpresolGetNAggrVars(set->presols[i]) + 
+                SCIPpresolGetNDelConss(set->presols[i])) < 0)
+            goto fail;
+
+    stats = Py_BuildValue("{s:d,s:d,s:d,s:d,s:L,s:L,s:L,s:d,s:d,s:d,s:N,s:N,s:N,s:N,s:N}",
+        "time", total,
+        "presolving_time", presolving,
+        "root_time", root_end > presolving ? root_end - presolving : 0.0,
+        "tree_time", total - root_end,
+        "nodes", SCIPgetNTotalNodes(scip),
+        "lp_iterations", SCIPgetNLPIterations(scip),
+        "root_lp_iterations", SCIPgetNRootLPIterations(scip),
+        "primal_bound", SCIPgetPrimalbound(scip) + offset,
+        "dual_bound", SCIPgetDualbound(scip) + offset,
+        "gap", SCIPgetGap(scip),
+        "history", history,
+        "heuristics", heuristics,
+        "separators", separators,
+        "propagators", propagators,
+        "presolvers", presolvers
+    );
+    return stats;
+
+fail:
+    Py_XDECREF(history);
+    Py_XDECREF(heuristics);
+    Py_XDECREF(separators);
+    Py_XDECREF(propagators);
+    Py_XDECREF(presolvers);
+    return NULL;
+}
+
+static PyObject *solver_set_progress(solver *self, PyObject *args) {
+    // Allocates a ring buffer for size progress samples, taken every 
+    // interval seconds or every nodes nodes.  A size of zero turns 
+    // progress recording off.
+    int size;
+    double interval;
+    SCIP_Longint nodes;
+    double *samples = NULL;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (!PyArg_ParseTuple(args, "idL", &size, &interval, &nodes))
+        return NULL;
+
+    if (size < 0 || interval < 0 || nodes < 0) {
+        PyErr_SetString(error, "progress size and intervals can't be negative");
+        return NULL;
+    }
+
+    if (size > 0) {
+        samples = malloc(SAMPLE_FIELDS * size * sizeof(double));
+        if (samples == NULL) {
+            PyErr_SetString(error, "ran out of memory");
+            return NULL;
+        }
+    }
+
+    free(self->samples);
+    self->samples = samples;
+    self->samples_size = size;
+    self->samples_start = self->nsamples = 0;
+    self->sample_interval = interval;
+    self->sample_nodes = nodes;
+    Py_RETURN_NONE;
+}
+
+static PyObject *solver_fill_progress(solver *self, PyObject *args) {
+    // Copies progress samples, oldest first, into five caller-supplied 
+    // arrays with nsamples elements each
+    PyObject *out[SAMPLE_FIELDS];
+    static const char *names[SAMPLE_FIELDS] = {"time", "primal_bound", "dual_bound", "gap", "nodes"};
+    py_scip_array arrays[SAMPLE_FIELDS];
+    double *sample;
+    int i, j, k;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (!PyArg_ParseTuple(args, "OOOOO", &out[0], &out[1], &out[2], &out[3], &out[4]))
+        return NULL;
+
+    for (k = 0; k < SAMPLE_FIELDS; k++) {
+        if (PyScipArrayForOutput(error, out[k], names[k], self->nsamples, false, &arrays[k]) < 0) {
+            while (k-- > 0)
+                PyScipArrayRelease(&arrays[k]);
+            return NULL;
+        }
+    }
+
+    for (i = 0; i < self->nsamples; i++) {
+        j = (self->samples_start + i) % self->samples_size;
+        sample = self->samples + SAMPLE_FIELDS * j;
+        for (k = 0; k < SAMPLE_FIELDS; k++)
+            PyScipArraySet(&arrays[k], i, sample[k]);
+    }
+
+    for (k = 0; k < SAMPLE_FIELDS; k++)
+        PyScipArrayRelease(&arrays[k]);
+    Py_RETURN_NONE;
+}
+
+static PyObject *solver_interrupt(solver *self) {
+    // Asks a solve running in another thread to stop as soon as possible.
+    // This is the one thing that may be done to a busy solver.  Returns
+    // False if SCIP isn't at a point where it can be interrupted yet.
+    if (self->busy && SCIPinterruptSolve(self->scip) == SCIP_OKAY)
+        Py_RETURN_TRUE;
+    Py_RETURN_FALSE;
+}
+
+static int _check_constraints(solver *self, PyObject *seq) {
+    // Makes sure every item of a fast sequence is one of this solver's
+    // constraints, so bulk operations can fail before changing anything
+    PyObject *c;
+    Py_ssize_t i;
+
+    for (i = 0; i < PySequence_Fast_GET_SIZE(seq); i++) {
+        c = PySequence_Fast_GET_ITEM(seq, i);
+        if (strcmp(c->ob_type->tp_name, CONSTRAINT_TYPE_NAME)) {
+            PyErr_SetString(error, "invalid constraint type");
+            return -1;
+        }
+        if (((constraint *) c)->scip != self->scip) {
+            PyErr_SetString(error, "constraint not associated with solver");
+            return -1;
+        }
+    }
+    return 0;
+}
+
+static PyObject *solver_add_constraints(solver *self, PyObject *constraints) {
+    // Adds a sequence of constraints to the problem, freeing the transformed
+    // problem at most once for all of them
+    PyObject *seq, *c;
+    SCIP_RETCODE retcode;
+    Py_ssize_t i, n;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if ((seq = PySequence_Fast(constraints, "constraints must be a sequence")) == NULL)
+        return NULL;
+    n = PySequence_Fast_GET_SIZE(seq);
+
+    // Check everything before changing the problem at all
+    if (_check_constraints(self, seq) == 0 && n > 0 && _free_transform(self) == 0) {
+        for (i = 0; i < n; i++) {
+            c = PySequence_Fast_GET_ITEM(seq, i);
+            retcode = SCIPaddCons(self->scip, ((constraint *) c)->constraint);
+            if (retcode != SCIP_OKAY) {
+                PyScipSetError(error, retcode);
+                break;
+            }
+        }
+    }
+
+    Py_DECREF(seq);
+    if (PyErr_Occurred())
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyObject *solver_remove_constraints(solver *self, PyObject *constraints) {
+    // Deletes a sequence of constraints from the problem, freeing the 
+    // transformed problem at most once for all of them
+    PyObject *seq, *c;
+    SCIP_RETCODE retcode;
+    Py_ssize_t i, n;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if ((seq = PySequence_Fast(constraints, "constraints must be a sequence")) == NULL)
+        return NULL;
+    n = PySequence_Fast_GET_SIZE(seq);
+
+    if (_check_constraints(self, seq) == 0 && n > 0 && _free_transform(self) == 0) {
+        for (i = 0; i < n; i++) {
+            c = PySequence_Fast_GET_ITEM(seq, i);
+            retcode = SCIPdelCons(self->scip, ((constraint *) c)->constraint);
+            if (retcode != SCIP_OKAY) {
+                PyScipSetError(error, retcode);
+                break;
+            }
+        }
+    }
+
+    Py_DECREF(seq);
+    if (PyErr_Occurred())
+        return NULL;
     Py_RETURN_NONE;
 }
 
@@ -213,6 +1137,8 @@ static PyObject *solver_unconstrain(solver *self, PyObject *c) {
     // Removes a constraint from the solver
     constraint *cons; // constraint C object
 
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+
     // Check solver type in the best way we seem to have available
     if (strcmp(c->ob_type->tp_name, CONSTRAINT_TYPE_NAME)) {
         PyErr_SetString(error, "invalid constraint type");
@@ -221,13 +1147,783 @@ static PyObject *solver_unconstrain(solver *self, PyObject *c) {
     
     cons = (constraint *) c;
 
-    // Restart solver prior to removing the constraint so state is ok
-    solver_restart(self);
+    // Go back to the original problem before removing the constraint
+    if (_free_transform(self) < 0)
+        return NULL;
+
     PY_SCIP_CALL(error, NULL, SCIPdelCons(self->scip, cons->constraint));
 
     Py_RETURN_NONE;
 }
 
+static PyObject *solver_set_objective(solver *self, PyObject *args) {
+    // Sets objective coefficients for the variables at the given indices
+    // and zero for every other variable.  Only coefficients that actually
+    // change are touched, and the transformed problem is only freed if 
+    // there are any.  Returns the number of coefficients changed.
+    PyObject *indices_obj, *coefficients_obj;
+    py_scip_array indices, coefficients;
+    double *objective;
+    int *changed;
+    int i, nchanged;
+    long long j;
+    Py_ssize_t k, n;
+    SCIP_RETCODE retcode;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (!PyArg_ParseTuple(args, "OO", &indices_obj, &coefficients_obj))
+        return NULL;
+
+    if (PyScipArrayFromObject(error, indices_obj, "indices", 0, -1, true, &indices) < 0)
+        return NULL;
+    n = PyScipArrayLength(&indices);
+    if (PyScipArrayFromObject(error, coefficients_obj, "coefficients", 0, n, false, &coefficients) < 0) {
+        PyScipArrayRelease(&indices);
+        return NULL;
+    }
+
+    objective = (double *) calloc(self->nvars > 0 ? self->nvars : 1, sizeof(double));
+    changed = (int *) malloc((self->nvars > 0 ? self->nvars : 1) * sizeof(int));
+    if (objective == NULL || changed == NULL) {
+        free(objective);
+        free(changed);
+        PyScipArrayRelease(&indices);
+        PyScipArrayRelease(&coefficients);
+        return PyErr_NoMemory();
+    }
+
+    // Repeated indices are added together, same as algebraic terms
+    for (k = 0; k < n; k++) {
+        j = PyScipArrayGetIndex(&indices, k);
+        if (j < 0 || j >= self->nvars) {
+            PyErr_SetString(error, "variable index out of range");
+            break;
+        }
+        objective[j] += PyScipArrayGet(&coefficients, k);
+    }
+    PyScipArrayRelease(&indices);
+    PyScipArrayRelease(&coefficients);
+
+    nchanged = 0;
+    if (!PyErr_Occurred()) {
+        for (i = 0; i < self->nvars; i++)
+            if (SCIPvarGetObj(self->vars[i]) != objective[i])
+                changed[nchanged++] = i;
+
+        // SCIP only allows objective changes on the original problem
+        if (nchanged && _free_transform(self) == 0) {
+            for (i = 0; i < nchanged; i++) {
+                retcode = SCIPchgVarObj(self->scip, self->vars[changed[i]], objective[changed[i]]);
+                if (retcode != SCIP_OKAY) {
+                    PyScipSetError(error, retcode);
+                    break;
+                }
+            }
+        }
+    }
+
+    free(objective);
+    free(changed);
+    if (PyErr_Occurred())
+        return NULL;
+    return Py_BuildValue("i", nchanged);
+}
+
+static PyObject *solver_set_bounds(solver *self, PyObject *args) {
+    // Changes bounds on a set of variables, given any way 
+    // PyScipGetVariables accepts.  Lower and upper can be arrays, single
+    // numbers, or None, and NaN leaves a bound as it is.  With tighten, 
+    // bounds are only made tighter, the way a constraint would.  Nothing
+    // changes if any lower bound would end up above its upper bound.
+    // Returns the number of bounds changed.
+    PyObject *variables, *lower_obj, *upper_obj;
+    py_scip_array lower, upper;
+    SCIP_VAR **vars;
+    SCIP_RETCODE retcode;
+    double *bounds, l, u, inf;
+    int tighten = 0;
+    int i, n, nchanged;
+    bool owned;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (!PyArg_ParseTuple(args, "OOO|i", &variables, &lower_obj, &upper_obj, &tighten))
+        return NULL;
+
+    if ((vars = PyScipGetVariables(error, self, variables, &n, &owned)) == NULL)
+        return NULL;
+    if (PyScipArrayFromObject(error, lower_obj, "lower", Py_NAN, n, false, &lower) < 0) {
+        if (owned)
+            free(vars);
+        return NULL;
+    }
+    if (PyScipArrayFromObject(error, upper_obj, "upper", Py_NAN, n, false, &upper) < 0) {
+        if (owned)
+            free(vars);
+        PyScipArrayRelease(&lower);
+        return NULL;
+    }
+
+    bounds = (double *) malloc((n > 0 ? 2 * n : 1) * sizeof(double));
+    if (bounds == NULL) {
+        if (owned)
+            free(vars);
+        PyScipArrayRelease(&lower);
+        PyScipArrayRelease(&upper);
+        return PyErr_NoMemory();
+    }
+
+    // Work out all the new bounds first, so nothing changes on an error
+    inf = SCIPinfinity(self->scip);
+    nchanged = 0;
+    for (i = 0; i < n; i++) {
+        l = PyScipArrayGet(&lower, i);
+        u = PyScipArrayGet(&upper, i);
+        if (l < -inf)
+            l = -inf;
+        if (u > inf)
+            u = inf;
+        if (SCIPvarGetType(vars[i]) == SCIP_VARTYPE_BINARY) {
+            if (l < 0)
+                l = 0;
+            if (u > 1)
+                u = 1;
+        }
+
+        if (isnan(l) || (tighten && l < SCIPvarGetLbOriginal(vars[i])))
+            l = SCIPvarGetLbOriginal(vars[i]);
+        if (isnan(u) || (tighten && u > SCIPvarGetUbOriginal(vars[i])))
+            u = SCIPvarGetUbOriginal(vars[i]);
+
+        if (l > u) {
+            PyErr_Format(error, "lower bound above upper bound for variable %d",
+                PyScipVarIndex(error, self, vars[i]));
+            break;
+        }
+
+        nchanged += (l != SCIPvarGetLbOriginal(vars[i])) + (u != SCIPvarGetUbOriginal(vars[i]));
+        bounds[2*i] = l;
+        bounds[2*i+1] = u;
+    }
+    PyScipArrayRelease(&lower);
+    PyScipArrayRelease(&upper);
+
+    // SCIP only allows relaxing bounds on the original problem
+    if (!PyErr_Occurred() && nchanged && _free_transform(self) == 0) {
+        for (i = 0; i < n; i++) {
+            l = bounds[2*i];
+            u = bounds[2*i+1];
+
+            // Change the bounds in an order that never crosses them
+            if (l > SCIPvarGetUbOriginal(vars[i])) {
+                retcode = SCIPchgVarUb(self->scip, vars[i], u);
+                if (retcode == SCIP_OKAY)
+                    retcode = SCIPchgVarLb(self->scip, vars[i], l);
+            } else {
+                retcode = SCIPchgVarLb(self->scip, vars[i], l);
+                if (retcode == SCIP_OKAY)
+                    retcode = SCIPchgVarUb(self->scip, vars[i], u);
+            }
+
+            if (retcode != SCIP_OKAY) {
+                PyScipSetError(error, retcode);
+                break;
+            }
+        }
+    }
+
+    free(bounds);
+    if (owned)
+        free(vars);
+    if (PyErr_Occurred())
+        return NULL;
+    return Py_BuildValue("i", nchanged);
+}
+
+/*****************************************************************************/
+/* MODEL FILES                                                               */
+/*****************************************************************************/
+// The file format is described in zibopt/_model.py, which reads it back
+#define MODEL_MAGIC   "ZIBMODEL"
+#define MODEL_VERSION 1
+
+typedef struct {
+    int64_t *indices, *var1, *var2; // NULL to only count terms
+    double *data, *coef;
+    int64_t nnz, nbilin;
+    solver *solv;                   // for looking up variable indices
+} model_terms;
+
+// Terms are written with solver indices, which is the order the variable
+// columns are in.  These set an error if a variable isn't the solver's.
+static void _model_linear(model_terms *t, SCIP_VAR *var, double coef) {
+    if (coef == 0)
+        return;
+    if (t->indices != NULL) {
+        t->indices[t->nnz] = PyScipVarIndex(error, t->solv, var);
+        t->data[t->nnz] = coef;
+    }
+    t->nnz++;
+}
+
+static void _model_bilinear(model_terms *t, SCIP_VAR *var1, SCIP_VAR *var2, double coef) {
+    if (coef == 0)
+        return;
+    if (t->var1 != NULL) {
+        t->var1[t->nbilin] = PyScipVarIndex(error, t->solv, var1);
+        t->var2[t->nbilin] = PyScipVarIndex(error, t->solv, var2);
+        t->coef[t->nbilin] = coef;
+    }
+    t->nbilin++;
+}
+
+static int _model_cons_type(solver *self, SCIP_CONS *cons) {
+    // Returns 1 for linear constraints, 2 for quadratic, 0 for the lazy
+    // constraint lock, which isn't part of the model, and -1 otherwise
+    const char *name;
+
+    if (cons == self->lazy_cons)
+        return 0;
+    name = SCIPconshdlrGetName(SCIPconsGetHdlr(cons));
+    if (strcmp(name, "linear") == 0)
+        return 1;
+    if (strcmp(name, "quadratic") == 0)
+        return 2;
+    PyErr_Format(error, "can't save constraints of type %s", name);
+    return -1;
+}
+
+static void _model_terms(SCIP *scip, SCIP_CONS *cons, int type, model_terms *t) {
+    // Same terms as constraint.terms(), split into linear and bilinear
+    SCIP_VAR **vars;
+    SCIP_Real *vals;
+    SCIP_QUADVARTERM *quadterms;
+    SCIP_BILINTERM *bilinterms;
+    int i, n;
+
+    if (type == 2) {
+        n = SCIPgetNLinearVarsQuadratic(scip, cons);
+        vars = SCIPgetLinearVarsQuadratic(scip, cons);
+        vals = SCIPgetCoefsLinearVarsQuadratic(scip, cons);
+        for (i = 0; i < n; i++)
+            _model_linear(t, vars[i], vals[i]);
+
+        n = SCIPgetNQuadVarTermsQuadratic(scip, cons);
+        quadterms = SCIPgetQuadVarTermsQuadratic(scip, cons);
+        for (i = 0; i < n; i++) {
+            _model_linear(t, quadterms[i].var, quadterms[i].lincoef);
+            _model_bilinear(t, quadterms[i].var, quadterms[i].var, quadterms[i].sqrcoef);
+        }
+
+        n = SCIPgetNBilinTermsQuadratic(scip, cons);
+        bilinterms = SCIPgetBilinTermsQuadratic(scip, cons);
+        for (i = 0; i < n; i++)
+            _model_bilinear(t, bilinterms[i].var1, bilinterms[i].var2, bilinterms[i].coef);
+
+    } else {
+        n = SCIPgetNVarsLinear(scip, cons);
+        vars = SCIPgetVarsLinear(scip, cons);
+        vals = SCIPgetValsLinear(scip, cons);
+        for (i = 0; i < n; i++)
+            _model_linear(t, vars[i], vals[i]);
+    }
+}
+
+static double _model_bound(SCIP *scip, double x) {
+    // Infinite bounds are stored as IEEE infinities rather than whatever
+    // SCIP's infinity happens to be set to
+    if (x >= SCIPinfinity(scip))
+        return HUGE_VAL;
+    if (x <= -SCIPinfinity(scip))
+        return -HUGE_VAL;
+    return x;
+}
+
+static PyObject *solver_save(solver *self, PyObject *args) {
+    // Writes the original problem to a model file.  Constraints are read
+    // back out of SCIP, so it doesn't matter how they were created.
+    const char *path;
+    SCIP_CONS **conss;
+    model_terms t = {NULL, NULL, NULL, NULL, NULL, 0, 0, NULL};
+    int64_t header[5], *indptr = NULL, *bilinptr = NULL, *ivalues = NULL;
+    double *lower = NULL, *upper = NULL, *dvalues = NULL;
+    int *types = NULL;
+    int nconss, ncons, i, r;
+    FILE *f;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (!PyArg_ParseTuple(args, "s", &path))
+        return NULL;
+
+    t.solv = self;
+    nconss = SCIPgetNOrigConss(self->scip);
+    conss = SCIPgetOrigConss(self->scip);
+
+    // Count rows and terms first so every array is allocated just once
+    types = (int *) malloc((nconss > 0 ? nconss : 1) * sizeof(int));
+    if (types == NULL)
+        return PyErr_NoMemory();
+    for (ncons = i = 0; i < nconss; i++) {
+        if ((types[i] = _model_cons_type(self, conss[i])) < 0)
+            goto done;
+        if (types[i] > 0) {
+            _model_terms(self->scip, conss[i], types[i], &t);
+            ncons++;
+        }
+    }
+
+    lower = (double *) malloc((ncons > 0 ? ncons : 1) * sizeof(double));
+    upper = (double *) malloc((ncons > 0 ? ncons : 1) * sizeof(double));
+    indptr = (int64_t *) malloc((ncons + 1) * sizeof(int64_t));
+    bilinptr = (int64_t *) malloc((ncons + 1) * sizeof(int64_t));
+    t.indices = (int64_t *) malloc((t.nnz > 0 ? t.nnz : 1) * sizeof(int64_t));
+    t.data = (double *) malloc((t.nnz > 0 ? t.nnz : 1) * sizeof(double));
+    t.var1 = (int64_t *) malloc((t.nbilin > 0 ? t.nbilin : 1) * sizeof(int64_t));
+    t.var2 = (int64_t *) malloc((t.nbilin > 0 ? t.nbilin : 1) * sizeof(int64_t));
+    t.coef = (double *) malloc((t.nbilin > 0 ? t.nbilin : 1) * sizeof(double));
+    ivalues = (int64_t *) malloc((self->nvars > 0 ? self->nvars : 1) * sizeof(int64_t));
+    dvalues = (double *) malloc((self->nvars > 0 ? self->nvars : 1) * sizeof(double));
+    if (lower == NULL || upper == NULL || indptr == NULL || bilinptr == NULL ||
+        t.indices == NULL || t.data == NULL || t.var1 == NULL || t.var2 == NULL ||
+        t.coef == NULL || ivalues == NULL || dvalues == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+
+    t.nnz = t.nbilin = 0;
+    indptr[0] = bilinptr[0] = 0;
+    for (r = i = 0; i < nconss; i++) {
+        if (types[i] == 0)
+            continue;
+        if (types[i] == 2) {
+            lower[r] = _model_bound(self->scip, SCIPgetLhsQuadratic(self->scip, conss[i]));
+            upper[r] = _model_bound(self->scip, SCIPgetRhsQuadratic(self->scip, conss[i]));
+        } else {
+            lower[r] = _model_bound(self->scip, SCIPgetLhsLinear(self->scip, conss[i]));
+            upper[r] = _model_bound(self->scip, SCIPgetRhsLinear(self->scip, conss[i]));
+        }
+        _model_terms(self->scip, conss[i], types[i], &t);
+        r++;
+        indptr[r] = t.nnz;
+        bilinptr[r] = t.nbilin;
+    }
+    if (PyErr_Occurred())
+        goto done;
+
+    if ((f = fopen(path, "wb")) == NULL) {
+        PyErr_SetFromErrnoWithFilename(PyExc_IOError, path);
+        goto done;
+    }
+
+    header[0] = MODEL_VERSION;
+    header[1] = self->nvars;
+    header[2] = ncons;
+    header[3] = t.nnz;
+    header[4] = t.nbilin;
+    fwrite(MODEL_MAGIC, 1, 8, f);
+    fwrite(header, sizeof(int64_t), 5, f);
+
+    // Variable columns
+    for (i = 0; i < self->nvars; i++)
+        ivalues[i] = SCIPvarGetType(self->vars[i]);
+    fwrite(ivalues, sizeof(int64_t), self->nvars, f);
+    for (i = 0; i < self->nvars; i++)
+        ivalues[i] = SCIPvarGetBranchPriority(self->vars[i]);
+    fwrite(ivalues, sizeof(int64_t), self->nvars, f);
+    for (i = 0; i < self->nvars; i++)
+        dvalues[i] = _model_bound(self->scip, SCIPvarGetLbOriginal(self->vars[i]));
+    fwrite(dvalues, sizeof(double), self->nvars, f);
+    for (i = 0; i < self->nvars; i++)
+        dvalues[i] = _model_bound(self->scip, SCIPvarGetUbOriginal(self->vars[i]));
+    fwrite(dvalues, sizeof(double), self->nvars, f);
+    for (i = 0; i < self->nvars; i++)
+        dvalues[i] = SCIPvarGetObj(self->vars[i]);
+    fwrite(dvalues, sizeof(double), self->nvars, f);
+
+    // Constraint columns
+    fwrite(lower, sizeof(double), ncons, f);
+    fwrite(upper, sizeof(double), ncons, f);
+    fwrite(indptr, sizeof(int64_t), ncons + 1, f);
+    fwrite(t.indices, sizeof(int64_t), t.nnz, f);
+    fwrite(t.data, sizeof(double), t.nnz, f);
+    fwrite(bilinptr, sizeof(int64_t), ncons + 1, f);
+    fwrite(t.var1, sizeof(int64_t), t.nbilin, f);
+    fwrite(t.var2, sizeof(int64_t), t.nbilin, f);
+    fwrite(t.coef, sizeof(double), t.nbilin, f);
+
+    // fclose flushes, so it has to be checked too
+    if (ferror(f) | fclose(f))
+        PyErr_SetFromErrnoWithFilename(PyExc_IOError, path);
+
+done:
+    free(types);
+    free(lower);
+    free(upper);
+    free(indptr);
+    free(bilinptr);
+    free(t.indices);
+    free(t.data);
+    free(t.var1);
+    free(t.var2);
+    free(t.coef);
+    free(ivalues);
+    free(dvalues);
+
+    if (PyErr_Occurred())
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+/*****************************************************************************/
+/* READING AND WRITING PROBLEMS                                              */
+/*****************************************************************************/
+static int _compare_var_index(const void *a, const void *b) {
+    // Orders variables by when they were created
+    int i = SCIPvarGetIndex(*(SCIP_VAR * const *) a);
+    int j = SCIPvarGetIndex(*(SCIP_VAR * const *) b);
+    return (i > j) - (i < j);
+}
+
+static PyObject *solver_read(solver *self, PyObject *args) {
+    // Replaces the empty problem with one read from a file by one of 
+    // SCIP's readers.  The variables and constraints are captured into 
+    // the solver arrays, but building Python objects for them is left to
+    // the caller.  Returns (index of the first constraint, number of
+    // constraints, objective offset).
+    const char *path, *format = NULL;
+    SCIP_VAR **vars, **new_vars;
+    SCIP_CONS **conss, **new_conss;
+    SCIP_RETCODE retcode;
+    int i, nvars, nconss, start;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (!PyArg_ParseTuple(args, "s|z", &path, &format))
+        return NULL;
+
+    // The old problem is freed, so anything in it would be lost
+    if (self->nvars || SCIPgetNOrigConss(self->scip) || self->lazy_cons != NULL) {
+        PyErr_SetString(error, "can only read into an empty solver");
+        return NULL;
+    }
+
+    self->busy = true;
+    Py_BEGIN_ALLOW_THREADS
+    retcode = SCIPreadProb(self->scip, path, format);
+    Py_END_ALLOW_THREADS
+    self->busy = false;
+    PY_SCIP_CALL(error, NULL, retcode);
+
+    nvars = SCIPgetNOrigVars(self->scip);
+    vars = SCIPgetOrigVars(self->scip);
+    nconss = SCIPgetNOrigConss(self->scip);
+    conss = SCIPgetOrigConss(self->scip);
+
+    new_vars = (SCIP_VAR **) realloc(self->vars, (nvars > 0 ? nvars : 1) * sizeof(SCIP_VAR *));
+    if (new_vars == NULL)
+        return PyErr_NoMemory();
+    self->vars = new_vars;
+    self->vars_size = nvars > 0 ? nvars : 1;
+
+    new_conss = (SCIP_CONS **) realloc(self->conss, (self->nconss + nconss + 1) * sizeof(SCIP_CONS *));
+    if (new_conss == NULL)
+        return PyErr_NoMemory();
+    self->conss = new_conss;
+    self->conss_size = self->nconss + nconss + 1;
+
+    // SCIP keeps original variables grouped by type.  Put them back in 
+    // the order the reader created them, which is the order they appear
+    // in the file.
+    for (i = 0; i < nvars; i++) {
+        PY_SCIP_CALL(error, NULL, SCIPcaptureVar(self->scip, vars[i]));
+        self->vars[self->nvars++] = vars[i];
+    }
+    qsort(self->vars, nvars, sizeof(SCIP_VAR *), _compare_var_index);
+
+    start = self->nconss;
+    for (i = 0; i < nconss; i++) {
+        PY_SCIP_CALL(error, NULL, SCIPcaptureCons(self->scip, conss[i]));
+        self->conss[self->nconss++] = conss[i];
+    }
+
+    return Py_BuildValue("(iid)", start, nconss, self->scip->origprob->objoffset);
+}
+
+static PyObject *solver_write(solver *self, PyObject *args) {
+    // Writes the original problem with one of SCIP's writers, chosen by
+    // format or else by the file extension.  The lazy constraint lock 
+    // isn't part of the model, so it is taken out first.
+    const char *path, *format = NULL;
+    int generic = 0;
+    SCIP_RETCODE retcode;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (!PyArg_ParseTuple(args, "s|zi", &path, &format, &generic))
+        return NULL;
+    if (_set_lazy_locks(self, false) < 0)
+        return NULL;
+
+    self->busy = true;
+    Py_BEGIN_ALLOW_THREADS
+    retcode = SCIPwriteOrigProblem(self->scip, path, format, generic ? TRUE : FALSE);
+    Py_END_ALLOW_THREADS
+    self->busy = false;
+    PY_SCIP_CALL(error, NULL, retcode);
+
+    Py_RETURN_NONE;
+}
+
+static PyObject *_bound_object(SCIP *scip, double x) {
+    // Bounds on constraint objects are None if they are infinite
+    if (SCIPisInfinity(scip, x) || SCIPisInfinity(scip, -x))
+        Py_RETURN_NONE;
+    return PyFloat_FromDouble(x);
+}
+
+static PyObject *solver_assign_variable(solver *self, PyObject *args) {
+    // Points an uninitialized variable object at variable i.  This is
+    // for variables that weren't created through Python.
+    PyObject *v;
+    variable *var;
+    int i;
+
+    if (!PyArg_ParseTuple(args, "Oi", &v, &i))
+        return NULL;
+
+    if (strcmp(v->ob_type->tp_name, VARIABLE_TYPE_NAME)) {
+        PyErr_SetString(error, "invalid variable type");
+        return NULL;
+    }
+
+    if (i < 0 || i >= self->nvars) {
+        PyErr_SetString(PyExc_IndexError, "variable index out of range");
+        return NULL;
+    }
+
+    var = (variable *) v;
+    var->scip = self->scip;
+    var->solver = (PyObject *) self;
+    var->index = i;
+    var->variable = self->vars[i];
+    var->lower = SCIPvarGetLbOriginal(var->variable);
+    var->upper = SCIPvarGetUbOriginal(var->variable);
+
+    Py_RETURN_NONE;
+}
+
+static PyObject *solver_assign_constraint(solver *self, PyObject *args) {
+    // Points an uninitialized constraint object at constraint i, and 
+    // returns its (lower, upper) bounds.  Bounds are None if they are 
+    // infinite, or if the constraint is neither linear nor quadratic.
+    PyObject *c;
+    constraint *cons;
+    const char *name;
+    double lhs, rhs;
+    int i;
+
+    if (!PyArg_ParseTuple(args, "Oi", &c, &i))
+        return NULL;
+
+    if (strcmp(c->ob_type->tp_name, CONSTRAINT_TYPE_NAME)) {
+        PyErr_SetString(error, "invalid constraint type");
+        return NULL;
+    }
+
+    if (i < 0 || i >= self->nconss) {
+        PyErr_SetString(PyExc_IndexError, "constraint index out of range");
+        return NULL;
+    }
+
+    cons = (constraint *) c;
+    cons->scip = self->scip;
+    cons->solver = (PyObject *) self;
+    cons->index = i;
+    cons->constraint = self->conss[i];
+
+    name = SCIPconshdlrGetName(SCIPconsGetHdlr(cons->constraint));
+    cons->quadratic = strcmp(name, "quadratic") == 0;
+    if (cons->quadratic) {
+        lhs = SCIPgetLhsQuadratic(self->scip, cons->constraint);
+        rhs = SCIPgetRhsQuadratic(self->scip, cons->constraint);
+    } else if (strcmp(name, "linear") == 0) {
+        lhs = SCIPgetLhsLinear(self->scip, cons->constraint);
+        rhs = SCIPgetRhsLinear(self->scip, cons->constraint);
+    } else {
+        lhs = -SCIPinfinity(self->scip);
+        rhs = SCIPinfinity(self->scip);
+    }
+
+    return Py_BuildValue("(NN)", _bound_object(self->scip, lhs), _bound_object(self->scip, rhs));
+}
+
+/*****************************************************************************/
+/* CLONING                                                                   */
+/*****************************************************************************/
+static SCIP_RETCODE _copy_cons(solver *self, solver *target, SCIP_CONS *cons, 
+    SCIP_HASHMAP *varmap, SCIP_HASHMAP *copymap, SCIP_CONS **copy) {
+    // Copies an original constraint, with the same flags, through its 
+    // handler's copy callback.  Sets copy to NULL if it can't be copied.
+    SCIP_Bool success;
+
+    SCIP_CALL(SCIPgetConsCopy(self->scip, target->scip, cons, copy, SCIPconsGetHdlr(cons),
+        varmap, copymap, SCIPconsGetName(cons), SCIPconsIsInitial(cons), SCIPconsIsSeparated(cons),
+        SCIPconsIsEnforced(cons), SCIPconsIsChecked(cons), SCIPconsIsPropagated(cons),
+        SCIPconsIsLocal(cons), SCIPconsIsModifiable(cons), SCIPconsIsDynamic(cons),
+        SCIPconsIsRemovable(cons), SCIPconsIsStickingAtNode(cons), TRUE, &success));
+    if (!success)
+        *copy = NULL;
+    return SCIP_OKAY;
+}
+
+static SCIP_RETCODE _copy_problem(solver *self, solver *target, SCIP_HASHMAP *varmap,
+    SCIP_HASHMAP *indexmap, SCIP_HASHMAP *copymap, SCIP_CONS **failed) {
+    // Copies settings, variables, and constraints into an empty solver.
+    // If a constraint can't be copied, failed is set to it.
+    SCIP_CONS **conss, *copy;
+    SCIP_VAR *var, *source;
+    int i, k, nconss;
+
+    SCIP_CALL(SCIPcopyParamSettings(self->scip, target->scip));
+    SCIP_CALL(SCIPsetObjsense(target->scip, SCIPgetObjsense(self->scip)));
+    target->scip->origprob->objoffset = self->scip->origprob->objoffset;
+
+    // Variables keep their indices.  See variable_init for the meaning
+    // of the SCIPcreateVar arguments.
+    for (i = 0; i < self->nvars; i++) {
+        source = self->vars[i];
+        SCIP_CALL(SCIPcreateVar(target->scip, &var, SCIPvarGetName(source),
+            SCIPvarGetLbOriginal(source), SCIPvarGetUbOriginal(source), SCIPvarGetObj(source),
+            SCIPvarGetType(source), TRUE, FALSE, NULL, NULL, NULL, NULL, NULL));
+        target->vars[target->nvars++] = var;
+        SCIP_CALL(SCIPaddVar(target->scip, var));
+        if (SCIPvarGetBranchPriority(source) != 0)
+            SCIP_CALL(SCIPchgVarBranchPriority(target->scip, var, SCIPvarGetBranchPriority(source)));
+        SCIP_CALL(SCIPhashmapInsert(varmap, source, var));
+    }
+
+    // So do constraints with Python objects.  Their indices are stored
+    // plus one, since a missing image comes back as NULL.
+    for (i = 0; i < self->nconss; i++)
+        SCIP_CALL(SCIPhashmapInsert(indexmap, self->conss[i], (void *) (size_t) (i + 1)));
+
+    // Constraints in the problem are copied in their original order
+    nconss = SCIPgetNOrigConss(self->scip);
+    conss = SCIPgetOrigConss(self->scip);
+    for (i = 0; i < nconss; i++) {
+        if (conss[i] == self->lazy_cons)
+            continue;
+        SCIP_CALL(_copy_cons(self, target, conss[i], varmap, copymap, &copy));
+        if (copy == NULL) {
+            *failed = conss[i];
+            return SCIP_OKAY;
+        }
+
+        k = (int) (size_t) SCIPhashmapGetImage(indexmap, conss[i]);
+        if (k > 0) {
+            target->conss[k-1] = copy;
+            SCIP_CALL(SCIPaddCons(target->scip, copy));
+        } else {
+            // Part of a constraint_block, or read from a file
+            SCIP_CALL(SCIPaddCons(target->scip, copy));
+            SCIP_CALL(SCIPreleaseCons(target->scip, &copy));
+        }
+    }
+
+    // The rest have been removed, so they are copied but not added
+    for (i = 0; i < self->nconss; i++) {
+        if (target->conss[i] != NULL)
+            continue;
+        SCIP_CALL(_copy_cons(self, target, self->conss[i], varmap, copymap, &copy));
+        if (copy == NULL) {
+            *failed = self->conss[i];
+            return SCIP_OKAY;
+        }
+        target->conss[i] = copy;
+    }
+
+    return SCIP_OKAY;
+}
+
+static PyObject *solver_copy(solver *self, PyObject *args) {
+    // Copies the original problem and its settings into an empty solver.
+    // Variables and constraints keep their indices, so Python objects for
+    // them can be built on the copy as they are needed.
+    PyObject *t;
+    solver *target;
+    SCIP_HASHMAP *varmap = NULL, *indexmap = NULL, *copymap = NULL;
+    SCIP_CONS **conss, *failed = NULL;
+    SCIP_VAR **vars;
+    SCIP_RETCODE retcode;
+    int i;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self);
+    if (!PyArg_ParseTuple(args, "O", &t))
+        return NULL;
+
+    if (strcmp(t->ob_type->tp_name, SOLVER_TYPE_NAME)) {
+        PyErr_SetString(error, "invalid solver type");
+        return NULL;
+    }
+
+    target = (solver *) t;
+    PY_SCIP_CHECK_BUSY(error, NULL, target);
+    if (target == self || target->nvars || target->nconss || SCIPgetNOrigConss(target->scip)) {
+        PyErr_SetString(error, "can only copy into an empty solver");
+        return NULL;
+    }
+
+    // Everything is allocated up front, since the sizes are known
+    vars = (SCIP_VAR **) realloc(target->vars, (self->nvars > 0 ? self->nvars : 1) * sizeof(SCIP_VAR *));
+    if (vars == NULL)
+        return PyErr_NoMemory();
+    target->vars = vars;
+    target->vars_size = self->nvars > 0 ? self->nvars : 1;
+
+    conss = (SCIP_CONS **) calloc(self->nconss > 0 ? self->nconss : 1, sizeof(SCIP_CONS *));
+    if (conss == NULL)
+        return PyErr_NoMemory();
+    free(target->conss);
+    target->conss = conss;
+    target->conss_size = self->nconss > 0 ? self->nconss : 1;
+
+    retcode = SCIPhashmapCreate(&varmap, SCIPblkmem(target->scip), SCIPcalcHashtableSize(2 * self->nvars + 1));
+    if (retcode == SCIP_OKAY)
+        retcode = SCIPhashmapCreate(&indexmap, SCIPblkmem(target->scip), SCIPcalcHashtableSize(2 * self->nconss + 1));
+    if (retcode == SCIP_OKAY)
+        retcode = SCIPhashmapCreate(&copymap, SCIPblkmem(target->scip), SCIPcalcHashtableSize(2 * self->nconss + 1));
+
+    // Copying a large problem is worth releasing the GIL for
+    if (retcode == SCIP_OKAY) {
+        self->busy = target->busy = true;
+        Py_BEGIN_ALLOW_THREADS
+        retcode = _copy_problem(self, target, varmap, indexmap, copymap, &failed);
+        Py_END_ALLOW_THREADS
+        self->busy = target->busy = false;
+    }
+
+    if (varmap != NULL)
+        SCIPhashmapFree(&varmap);
+    if (indexmap != NULL)
+        SCIPhashmapFree(&indexmap);
+    if (copymap != NULL)
+        SCIPhashmapFree(&copymap);
+
+    if (retcode == SCIP_OKAY && failed == NULL) {
+        target->nconss = self->nconss;
+        Py_RETURN_NONE;
+    }
+
+    // Constraints are only counted once they are all there
+    for (i = 0; i < self->nconss; i++)
+        if (target->conss[i] != NULL)
+            SCIPreleaseCons(target->scip, &target->conss[i]);
+
+    if (retcode != SCIP_OKAY)
+        PyScipSetError(error, retcode);
+    else
+        PyErr_Format(error, "can't copy constraints of type %s", 
+            SCIPconshdlrGetName(SCIPconsGetHdlr(failed)));
+    return NULL;
+}
+
 // Functions for pulling out lists of setting names by type
 PY_SCIP_SETTING_NAMES(branching_names, nbranchrules, branchrules);
 PY_SCIP_SETTING_NAMES(conflict_names, nconflicthdlrs, conflicthdlrs);
@@ -245,7 +1941,21 @@ static PyMethodDef solver_methods[] = {
     {"maximize", (PyCFunction) solver_maximize, METH_VARARGS | METH_KEYWORDS, "maximize the objective value"},
     {"minimize", (PyCFunction) solver_minimize, METH_VARARGS | METH_KEYWORDS, "minimize the objective value"},
     {"restart",  (PyCFunction) solver_restart,  METH_NOARGS,   "restart the solver"},
+    {"interrupt", (PyCFunction) solver_interrupt, METH_NOARGS,  "interrupt a solve running in another thread"},
+    {"statistics", (PyCFunction) solver_statistics, METH_NOARGS, "returns statistics about the last solve"},
+    {"set_progress", (PyCFunction) solver_set_progress, METH_VARARGS, "allocates a ring buffer for progress samples"},
+    {"fill_progress", (PyCFunction) solver_fill_progress, METH_VARARGS, "copies progress samples into arrays"},
     {"unconstrain",  (PyCFunction) solver_unconstrain,  METH_O,   "remove a constraint"},
+    {"add_constraints", (PyCFunction) solver_add_constraints, METH_O, "add a sequence of constraints"},
+    {"remove_constraints", (PyCFunction) solver_remove_constraints, METH_O, "remove a sequence of constraints"},
+    {"set_bounds", (PyCFunction) solver_set_bounds, METH_VARARGS, "change bounds on many variables at once"},
+    {"save", (PyCFunction) solver_save, METH_VARARGS, "write the problem to a model file"},
+    {"read", (PyCFunction) solver_read, METH_VARARGS, "read a problem with one of SCIP's readers"},
+    {"write", (PyCFunction) solver_write, METH_VARARGS, "write the problem with one of SCIP's writers"},
+    {"copy", (PyCFunction) solver_copy, METH_VARARGS, "copy the problem and settings into an empty solver"},
+    {"assign_variable", (PyCFunction) solver_assign_variable, METH_VARARGS, "points a variable object at a variable in the solver"},
+    {"assign_constraint", (PyCFunction) solver_assign_constraint, METH_VARARGS, "points a constraint object at a constraint in the solver"},
+    {"set_objective", (PyCFunction) solver_set_objective, METH_VARARGS, "set objective coefficients, changing only those that differ"},
     {"branching_names",  (PyCFunction) branching_names,  METH_NOARGS, "returns a list of branching rule names"},
     {"conflict_names",   (PyCFunction) conflict_names,   METH_NOARGS, "returns a list of conflict handler names"},
     {"display_names",    (PyCFunction) display_names,    METH_NOARGS, "returns a list of display column names"},
@@ -257,6 +1967,17 @@ static PyMethodDef solver_methods[] = {
     {NULL} /* Sentinel */
 };
 
+static PyMemberDef solver_members[] = {
+    {"busy", T_BOOL, offsetof(solver, busy), READONLY, "solver is running in another thread"},
+    {"nvars", T_INT, offsetof(solver, nvars), READONLY, "number of variables in the solver"},
+    {"nconss", T_INT, offsetof(solver, nconss), READONLY, "number of constraints created for the solver"},
+    {"nsolves", T_INT, offsetof(solver, nsolves), READONLY, "number of times the solver has solved"},
+    {"nsamples", T_INT, offsetof(solver, nsamples), READONLY, "number of progress samples recorded"},
+    {"drop_tolerance", T_DOUBLE, offsetof(solver, drop_tolerance), 0, "coefficients smaller than this are left out of new constraints"},
+    {"ndropped", T_LONGLONG, offsetof(solver, ndropped), READONLY, "number of terms merged or dropped from constraints"},
+    {NULL} /* Sentinel */
+};
+
 static PyTypeObject solver_type = {
     PyVarObject_HEAD_INIT(NULL, 0)
     "_scip.solver",              /* tp_name */
@@ -286,7 +2007,7 @@ static PyTypeObject solver_type = {
     0,                           /* tp_iter */
     0,                           /* tp_iternext */
     solver_methods,              /* tp_methods */
-    0,                           /* tp_members */
+    solver_members,              /* tp_members */
     0,                           /* tp_getset */
     0,                           /* tp_base */
     0,                           /* tp_dict */
@@ -22,6 +22,7 @@ static int separator_init(separator *self, PyObject *args, PyObject *kwds) {
     
     solv = (solver *) s;
     self->scip = solv->scip;
+    self->solver = s;
     
     // Load the separator from SCIP
     r = SCIPfindSepa(self->scip, name);
@@ -55,6 +56,8 @@ static int separator_setattr(separator *self, PyObject *attr_name, PyObject *val
     int i;
     double d;
     
+    PY_SCIP_CHECK_BUSY(error, -1, self->solver);
+
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
         PY_SCIP_SET_INT_MIN("frequency", self->sepa->freq, -1); 
@@ -1,4 +1,5 @@
 #include "python_zibopt.h"
+#include "python_zibopt_error.h"
 
 static PyObject *error;
 
@@ -19,7 +20,9 @@ static int solution_init(solution *self, PyObject *args, PyObject *kwds) {
     }
     
     solv = (solver *) s;
+    PY_SCIP_CHECK_BUSY(error, -1, solv);
     self->scip = solv->scip;
+    self->solver = s;
     
     // Detect infeasibility
     self->solution = SCIPgetBestSol(self->scip);
@@ -54,6 +57,7 @@ static PyObject *solution_value(solution *self, PyObject *v) {
         return NULL;
     }
     var = (variable *) v;
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
     
     // Verify that the variable is associated with this solver
     if (var->scip != self->scip) {
@@ -64,6 +68,340 @@ static PyObject *solution_value(solution *self, PyObject *v) {
     return Py_BuildValue("d", SCIPgetSolVal(self->scip, self->solution, var->variable));
 }
 
+static PyObject *solution_fill_values(solution *self, PyObject *args) {
+    // Writes values for a set of variables into a caller-supplied buffer
+    // using a single call to SCIPgetSolVals.
+    PyObject *variables, *out;
+    SCIP_VAR **vars;
+    SCIP_Real *vals;
+    SCIP_RETCODE retcode;
+    py_scip_array values;
+    bool owned;
+    int i, n;
+
+    if (!PyArg_ParseTuple(args, "OO", &variables, &out))
+        return NULL;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+
+    vars = PyScipGetVariables(error, (solver *) self->solver, variables, &n, &owned);
+    if (vars == NULL)
+        return NULL;
+
+    if (PyScipArrayForOutput(error, out, "out", n, false, &values) < 0) {
+        if (owned)
+            free(vars);
+        return NULL;
+    }
+
+    // Write straight into the buffer if it is laid out as SCIP_Real[]
+    retcode = SCIP_OKAY;
+    if (n > 0 && PyScipArrayIsContiguousReal(&values)) {
+        retcode = SCIPgetSolVals(self->scip, self->solution, n, vars, (SCIP_Real *) values.view.buf);
+
+    } else if (n > 0) {
+        vals = malloc(n * sizeof(SCIP_Real));
+        if (vals == NULL) {
+            PyErr_SetString(error, "ran out of memory");
+        } else {
+            retcode = SCIPgetSolVals(self->scip, self->solution, n, vars, vals);
+            if (retcode == SCIP_OKAY) {
+                for (i = 0; i < n; i++)
+                    PyScipArraySet(&values, i, vals[i]);
+            }
+            free(vals);
+        }
+    }
+
+    PyScipArrayRelease(&values);
+    if (owned)
+        free(vars);
+
+    if (retcode != SCIP_OKAY)
+        PyScipSetError(error, retcode);
+    if (PyErr_Occurred())
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyObject *solution_fill_nonzeros(solution *self, PyObject *args) {
+    // Writes positions and values of nonzero variables into caller-supplied
+    // buffers, which must be as long as the set of variables.  Returns the
+    // number of nonzeros written.
+    PyObject *variables, *indices_out, *values_out;
+    SCIP_VAR **vars;
+    SCIP_Real *vals;
+    SCIP_RETCODE retcode;
+    py_scip_array indices, values;
+    bool owned;
+    int i, n, nnz;
+
+    if (!PyArg_ParseTuple(args, "OOO", &variables, &indices_out, &values_out))
+        return NULL;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+
+    vars = PyScipGetVariables(error, (solver *) self->solver, variables, &n, &owned);
+    if (vars == NULL)
+        return NULL;
+
+    vals = malloc((n > 0 ? n : 1) * sizeof(SCIP_Real));
+    if (vals == NULL) {
+        PyErr_SetString(error, "ran out of memory");
+        if (owned)
+            free(vars);
+        return NULL;
+    }
+
+    nnz = 0;
+    retcode = SCIP_OKAY;
+    if (PyScipArrayForOutput(error, indices_out, "indices", n, true, &indices) == 0) {
+        if (PyScipArrayForOutput(error, values_out, "values", n, false, &values) == 0) {
+            if (n > 0)
+                retcode = SCIPgetSolVals(self->scip, self->solution, n, vars, vals);
+
+            if (retcode == SCIP_OKAY) {
+                for (i = 0; i < n; i++) {
+                    if (!SCIPisZero(self->scip, vals[i])) {
+                        PyScipArraySet(&indices, nnz, i);
+                        PyScipArraySet(&values, nnz, vals[i]);
+                        nnz++;
+                    }
+                }
+            }
+            PyScipArrayRelease(&values);
+        }
+        PyScipArrayRelease(&indices);
+    }
+
+    free(vals);
+    if (owned)
+        free(vars);
+
+    if (retcode != SCIP_OKAY)
+        PyScipSetError(error, retcode);
+    if (PyErr_Occurred())
+        return NULL;
+    return Py_BuildValue("i", nnz);
+}
+
+static SCIP_CONS **_transformed_conss(solver *solv) {
+    // Returns the transformed version of each of the solver's constraints,
+    // with NULL for constraints that aren't in the transformed problem.
+    // These are looked up once per solve.  Sets an error and returns NULL
+    // if there isn't enough memory.
+    SCIP_CONS **conss;
+    int i;
+
+    if (solv->trans_conss != NULL && solv->trans_solve == solv->nsolves && 
+        solv->ntrans_conss == solv->nconss)
+        return solv->trans_conss;
+
+    conss = realloc(solv->trans_conss, (solv->nconss > 0 ? solv->nconss : 1) * sizeof(SCIP_CONS *));
+    if (conss == NULL) {
+        PyErr_SetString(error, "ran out of memory");
+        return NULL;
+    }
+    solv->trans_conss = conss;
+
+    for (i = 0; i < solv->nconss; i++) {
+        if (SCIPgetTransformedCons(solv->scip, solv->conss[i], &conss[i]) != SCIP_OKAY)
+            conss[i] = NULL;
+    }
+    solv->ntrans_conss = solv->nconss;
+    solv->trans_solve = solv->nsolves;
+    return conss;
+}
+
+static double _dual(SCIP *scip, SCIP_CONS *transformed, SCIP_OBJSENSE sense) {
+    // Dual value of a transformed constraint, signed as it would be if 
+    // SCIP maximized when asked to.  Constraints that didn't make it into
+    // the transformed problem have zero duals, and ones that aren't linear,
+    // including linear constraints presolving upgraded, have none.
+    if (transformed == NULL)
+        return 0.0;
+    if (strcmp(SCIPconshdlrGetName(SCIPconsGetHdlr(transformed)), "linear"))
+        return Py_NAN;
+    return sense * SCIPgetDualsolLinear(scip, transformed);
+}
+
+static int *_constraint_indices(solver *solv, PyObject *constraints, int *n) {
+    // Resolves None, an integer array of constraint indices, or a sequence
+    // of constraint objects into a new array of indices into solv->conss.
+    // The caller frees it.
+    py_scip_array indices;
+    PyObject *seq, *c;
+    long long j;
+    int *result;
+    Py_ssize_t i;
+
+    seq = NULL;
+    if (constraints == Py_None) {
+        *n = solv->nconss;
+    } else if (PyObject_CheckBuffer(constraints)) {
+        if (PyScipArrayFromObject(error, constraints, "constraints", 0, -1, true, &indices) < 0)
+            return NULL;
+        *n = (int) PyScipArrayLength(&indices);
+    } else {
+        seq = PySequence_Fast(constraints, "constraints must be a sequence");
+        if (seq == NULL)
+            return NULL;
+        *n = (int) PySequence_Fast_GET_SIZE(seq);
+    }
+
+    result = malloc((*n > 0 ? *n : 1) * sizeof(int));
+    if (result == NULL)
+        PyErr_SetString(error, "ran out of memory");
+
+    for (i = 0; result != NULL && i < *n; i++) {
+        if (constraints == Py_None) {
+            j = i;
+        } else if (seq == NULL) {
+            j = PyScipArrayGetIndex(&indices, i);
+        } else {
+            c = PySequence_Fast_GET_ITEM(seq, i);
+            if (strcmp(c->ob_type->tp_name, CONSTRAINT_TYPE_NAME)) {
+                PyErr_SetString(error, "invalid constraint type");
+                break;
+            }
+            if (((constraint *) c)->scip != solv->scip) {
+                PyErr_SetString(error, "constraint not associated with solver");
+                break;
+            }
+            j = ((constraint *) c)->index;
+        }
+
+        if (j < 0 || j >= solv->nconss) {
+            PyErr_SetString(error, "constraint index out of range");
+            break;
+        }
+        result[i] = (int) j;
+    }
+
+    if (constraints != Py_None && seq == NULL)
+        PyScipArrayRelease(&indices);
+    Py_XDECREF(seq);
+
+    if (PyErr_Occurred()) {
+        free(result);
+        return NULL;
+    }
+    return result;
+}
+
+static PyObject *solution_fill_duals(solution *self, PyObject *args) {
+    // Writes LP dual values for a set of constraints into a caller-supplied
+    // buffer.  Accepts the same constraints as _constraint_indices, or a 
+    // constraint_block.
+    PyObject *constraints, *out;
+    SCIP_CONS **transformed, *t;
+    SCIP_OBJSENSE sense;
+    py_scip_array values;
+    constraint_block *block;
+    solver *solv;
+    bool original;
+    int *indices;
+    int i, n;
+
+    if (!PyArg_ParseTuple(args, "OO", &constraints, &out))
+        return NULL;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+    solv = (solver *) self->solver;
+    sense = SCIPgetObjsense(self->scip);
+
+    block = NULL;
+    indices = NULL;
+    if (!strcmp(constraints->ob_type->tp_name, CONSTRAINT_BLOCK_TYPE_NAME)) {
+        block = (constraint_block *) constraints;
+        if (block->scip != self->scip) {
+            PyErr_SetString(error, "constraint not associated with solver");
+            return NULL;
+        }
+        n = block->size;
+    } else {
+        indices = _constraint_indices(solv, constraints, &n);
+        if (indices == NULL)
+            return NULL;
+    }
+
+    if (PyScipArrayForOutput(error, out, "out", n, false, &values) < 0) {
+        free(indices);
+        return NULL;
+    }
+
+    // Nothing has been transformed before the first solve, or after the 
+    // problem changes
+    original = SCIPgetStage(self->scip) == SCIP_STAGE_PROBLEM;
+    transformed = NULL;
+    if (!original && block == NULL)
+        transformed = _transformed_conss(solv);
+
+    for (i = 0; i < n && !PyErr_Occurred(); i++) {
+        t = NULL;
+        if (transformed != NULL)
+            t = transformed[indices[i]];
+        else if (!original && block != NULL && SCIPgetTransformedCons(self->scip, block->constraints[i], &t) != SCIP_OKAY)
+            t = NULL;
+        PyScipArraySet(&values, i, _dual(self->scip, t, sense));
+    }
+
+    PyScipArrayRelease(&values);
+    free(indices);
+
+    if (PyErr_Occurred())
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyObject *solution_fill_redcosts(solution *self, PyObject *args) {
+    // Writes LP reduced costs for a set of variables into a caller-supplied
+    // buffer.  Takes the same variables as fill_values.
+    PyObject *variables, *out;
+    SCIP_VAR **vars, *t;
+    SCIP_OBJSENSE sense;
+    SCIP_Real redcost;
+    py_scip_array values;
+    bool owned, transformed;
+    int i, n;
+
+    if (!PyArg_ParseTuple(args, "OO", &variables, &out))
+        return NULL;
+
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+    sense = SCIPgetObjsense(self->scip);
+
+    vars = PyScipGetVariables(error, (solver *) self->solver, variables, &n, &owned);
+    if (vars == NULL)
+        return NULL;
+
+    if (PyScipArrayForOutput(error, out, "out", n, false, &values) < 0) {
+        if (owned)
+            free(vars);
+        return NULL;
+    }
+
+    transformed = SCIPgetStage(self->scip) != SCIP_STAGE_PROBLEM;
+    for (i = 0; i < n && !PyErr_Occurred(); i++) {
+        // Variables that were never transformed, or that presolving took 
+        // out of the LP, have no reduced costs
+        t = NULL;
+        if (transformed && SCIPgetTransformedVar(self->scip, vars[i], &t) != SCIP_OKAY)
+            t = NULL;
+
+        redcost = t == NULL ? 0.0 : SCIPgetVarRedcost(self->scip, t);
+        PyScipArraySet(&values, i, redcost == SCIP_INVALID ? Py_NAN : sense * redcost);
+    }
+
+    PyScipArrayRelease(&values);
+    if (owned)
+        free(vars);
+
+    if (PyErr_Occurred())
+        return NULL;
+    Py_RETURN_NONE;
+}
+
 /*****************************************************************************/
 /* MODULE INITIALIZATION                                                     */
 /*****************************************************************************/
@@ -78,6 +416,10 @@ static PyMemberDef solution_members[] = {
 
 static PyMethodDef solution_methods[] = {
     {"value", (PyCFunction) solution_value, METH_O, "get variable value in a solution"},
+    {"fill_values", (PyCFunction) solution_fill_values, METH_VARARGS, "write variable values into an array"},
+    {"fill_nonzeros", (PyCFunction) solution_fill_nonzeros, METH_VARARGS, "write nonzero variable positions and values into arrays"},
+    {"fill_duals", (PyCFunction) solution_fill_duals, METH_VARARGS, "write constraint dual values into an array"},
+    {"fill_redcosts", (PyCFunction) solution_fill_redcosts, METH_VARARGS, "write variable reduced costs into an array"},
     {NULL} /* Sentinel */
 };
 
@@ -3,6 +3,29 @@
 
 static PyObject *error;
 
+static int _grow_variables(solver *solv, int n) {
+    // Makes room for n more variables in the solver's variable array
+    SCIP_VAR **vars;
+    int size;
+
+    if (solv->nvars + n <= solv->vars_size)
+        return 0;
+
+    size = solv->vars_size > 0 ? solv->vars_size : 64;
+    while (size < solv->nvars + n)
+        size *= 2;
+
+    vars = realloc(solv->vars, size * sizeof(SCIP_VAR *));
+    if (vars == NULL) {
+        PyErr_SetString(error, "ran out of memory");
+        return -1;
+    }
+
+    solv->vars = vars;
+    solv->vars_size = size;
+    return 0;
+}
+
 /*****************************************************************************/
 /* PYTHON TYPE METHODS                                                       */
 /*****************************************************************************/
@@ -26,7 +49,12 @@ static int variable_init(variable *self, PyObject *args, PyObject *kwds) {
     }
     
     solv = (solver *) s;
+    PY_SCIP_CHECK_BUSY(error, -1, solv);
     self->scip = solv->scip;
+    self->solver = s;
+
+    if (_grow_variables(solv, 1) < 0)
+        return -1;
 
     // Defaults
     t = SCIP_VARTYPE_CONTINUOUS;
@@ -76,9 +104,9 @@ static int variable_init(variable *self, PyObject *args, PyObject *kwds) {
     if (priority != 0)
         PY_SCIP_CALL(error, -1, SCIPchgVarBranchPriority(self->scip, self->variable, priority));
 
-    // Put new variable at head of linked list
-    self->next = (struct variable *) solv->first_var;
-    solv->first_var = self;
+    // Add the new variable to the end of the solver's array
+    self->index = solv->nvars;
+    solv->vars[solv->nvars++] = self->variable;
 
     return 0;
 }
@@ -97,6 +125,8 @@ static PyObject* variable_getattr(variable *self, PyObject *attr_name) {
 }
 
 static int variable_setattr(variable *self, PyObject *attr_name, PyObject *value) {
+    PY_SCIP_CHECK_BUSY(error, -1, self->solver);
+
     // Check and make sure we have a string as attribute name...
     if (PyUnicode_Check(attr_name)) {
         if (PyUnicode_CompareWithASCIIString(attr_name, "priority") == 0) {
@@ -112,11 +142,133 @@ static int variable_setattr(variable *self, PyObject *attr_name, PyObject *value
     return PyObject_GenericSetAttr((PyObject *) self, attr_name, value);
 }
 
+static int variable_block_init(variable_block *self, PyObject *args, PyObject *kwds) {
+    static char *argnames[] = {"solver", "n", "vartype", "coefficient", "lower", "upper", NULL};
+    PyObject *s;             // solver Python object
+    solver *solv;            // solver C object
+    int n;                   // number of variables to create
+    int t;                   // integer / binary / continuous
+    PyObject *c_obj, *lhs_obj, *rhs_obj;
+    py_scip_array c, lhs, rhs;
+    SCIP_RETCODE retcode;
+    SCIP_VAR *var;
+    double inf, l, u;
+    int i;
+
+    t = SCIP_VARTYPE_CONTINUOUS;
+    c_obj = lhs_obj = rhs_obj = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "Oi|iOOO", argnames, &s, &n, &t, &c_obj, &lhs_obj, &rhs_obj))
+        return -1;
+
+    // Check solver type in the best way we seem to have available
+    if (strcmp(s->ob_type->tp_name, SOLVER_TYPE_NAME)) {
+        PyErr_SetString(error, "invalid solver type");
+        return -1;
+    }
+
+    if (n < 0) {
+        PyErr_SetString(error, "number of variables must be nonnegative");
+        return -1;
+    }
+
+    solv = (solver *) s;
+    PY_SCIP_CHECK_BUSY(error, -1, solv);
+    self->scip = solv->scip;
+    Py_INCREF(s);
+    Py_XDECREF(self->solver);
+    self->solver = s;
+    self->start = solv->nvars;
+    self->size = 0;
+
+    inf = SCIPinfinity(self->scip);
+    if (PyScipArrayFromObject(error, c_obj, "coefficient", 0, n, false, &c) < 0)
+        return -1;
+    if (PyScipArrayFromObject(error, lhs_obj, "lower", -inf, n, false, &lhs) < 0) {
+        PyScipArrayRelease(&c);
+        return -1;
+    }
+    if (PyScipArrayFromObject(error, rhs_obj, "upper", inf, n, false, &rhs) < 0) {
+        PyScipArrayRelease(&c);
+        PyScipArrayRelease(&lhs);
+        return -1;
+    }
+
+    if (_grow_variables(solv, n) < 0) {
+        PyScipArrayRelease(&c);
+        PyScipArrayRelease(&lhs);
+        PyScipArrayRelease(&rhs);
+        return -1;
+    }
+
+    // Variable type
+    if (t != SCIP_VARTYPE_BINARY && t != SCIP_VARTYPE_INTEGER && t != SCIP_VARTYPE_IMPLINT)
+        t = SCIP_VARTYPE_CONTINUOUS;
+
+    // Create the variables directly from the arrays.  See variable_init
+    // for an explanation of the SCIPcreateVar arguments.
+    retcode = SCIP_OKAY;
+    for (i = 0; i < n; i++) {
+        l = PyScipArrayGet(&lhs, i);
+        u = PyScipArrayGet(&rhs, i);
+        if (l < -inf)
+            l = -inf;
+        if (u > inf)
+            u = inf;
+        if (t == SCIP_VARTYPE_BINARY) {
+            if (l < 0)
+                l = 0;
+            if (u > 1)
+                u = 1;
+        }
+
+        retcode = SCIPcreateVar(self->scip, &var, NULL, l, u, PyScipArrayGet(&c, i), t,
+            TRUE, FALSE, NULL, NULL, NULL, NULL, NULL);
+        if (retcode != SCIP_OKAY)
+            break;
+
+        retcode = SCIPaddVar(self->scip, var);
+        if (retcode != SCIP_OKAY) {
+            SCIPreleaseVar(self->scip, &var);
+            break;
+        }
+
+        solv->vars[solv->nvars++] = var;
+        self->size++;
+    }
+
+    PyScipArrayRelease(&c);
+    PyScipArrayRelease(&lhs);
+    PyScipArrayRelease(&rhs);
+
+    if (retcode != SCIP_OKAY) {
+        PyScipSetError(error, retcode);
+        return -1;
+    }
+
+    return 0;
+}
+
+static void variable_block_dealloc(variable_block *self) {
+    // Variables themselves are released along with the solver
+    Py_XDECREF(self->solver);
+    ((PyObject *) self)->ob_type->tp_free(self);
+}
+
 /*****************************************************************************/
 /* ADDITONAL METHODS                                                         */
 /*****************************************************************************/
 static PyObject *variable_set_coefficient(variable *self, PyObject *arg) {
+    double d;
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+
     if (PyFloat_Check(arg) || PyLong_Check(arg)) {
+        // Leave the transformed problem alone unless something changed
+        d = PyFloat_AsDouble(arg);
+        if (d == SCIPvarGetObj(self->variable))
+            Py_RETURN_NONE;
+        if (SCIPgetStage(self->scip) != SCIP_STAGE_PROBLEM)
+            PY_SCIP_CALL(error, NULL, PyScipFreeTransform((solver *) self->solver));
+
         // SCIPvarChgObj Arguments:
         // var          variable to change
         // blkmem       block memory
@@ -126,8 +278,7 @@ static PyObject *variable_set_coefficient(variable *self, PyObject *arg) {
         // eventqueue 	event queue
         // newobj       new objective value for variable 
         PY_SCIP_CALL(error, NULL, 
-            SCIPvarChgObj(self->variable, NULL, self->scip->set, NULL, NULL, NULL, 
-                (SCIP_Real) PyFloat_AsDouble(arg))
+            SCIPvarChgObj(self->variable, NULL, self->scip->set, NULL, NULL, NULL, (SCIP_Real) d)
         );
         Py_RETURN_NONE;
         
@@ -139,9 +290,14 @@ static PyObject *variable_set_coefficient(variable *self, PyObject *arg) {
 
 static PyObject *variable_tighten_lower(variable *self, PyObject *arg) {
     double d;
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+
     if (PyFloat_Check(arg) || PyLong_Check(arg)) {
         d = PyFloat_AsDouble(arg);
-        if (d > self->lower) {
+        if (d > SCIPvarGetLbOriginal(self->variable)) {
+            // Bounds can only change on the original problem
+            if (SCIPgetStage(self->scip) != SCIP_STAGE_PROBLEM)
+                PY_SCIP_CALL(error, NULL, PyScipFreeTransform((solver *) self->solver));
             PY_SCIP_CALL(error, NULL, 
                 SCIPchgVarLb(self->scip, self->variable, (SCIP_Real) d)
             );
@@ -157,9 +313,14 @@ static PyObject *variable_tighten_lower(variable *self, PyObject *arg) {
 
 static PyObject *variable_tighten_upper(variable *self, PyObject *arg) {
     double d;
+    PY_SCIP_CHECK_BUSY(error, NULL, self->solver);
+
     if (PyFloat_Check(arg) || PyLong_Check(arg)) {
         d = PyFloat_AsDouble(arg);
-        if (d < self->upper) {
+        if (d < SCIPvarGetUbOriginal(self->variable)) {
+            // Bounds can only change on the original problem
+            if (SCIPgetStage(self->scip) != SCIP_STAGE_PROBLEM)
+                PY_SCIP_CALL(error, NULL, PyScipFreeTransform((solver *) self->solver));
             PY_SCIP_CALL(error, NULL, 
                 SCIPchgVarUb(self->scip, self->variable, (SCIP_Real) d)
             );
@@ -173,9 +334,44 @@ static PyObject *variable_tighten_upper(variable *self, PyObject *arg) {
     }
 }
 
+static PyObject *variable_block_assign(variable_block *self, PyObject *args) {
+    // Points an uninitialized variable object at a variable in the block
+    PyObject *v;
+    variable *var;
+    int i;
+
+    if (!PyArg_ParseTuple(args, "Oi", &v, &i))
+        return NULL;
+
+    if (strcmp(v->ob_type->tp_name, VARIABLE_TYPE_NAME)) {
+        PyErr_SetString(error, "invalid variable type");
+        return NULL;
+    }
+
+    if (i < 0 || i >= self->size) {
+        PyErr_SetString(PyExc_IndexError, "variable index out of range");
+        return NULL;
+    }
+
+    var = (variable *) v;
+    var->scip = self->scip;
+    var->solver = self->solver;
+    var->index = self->start + i;
+    var->variable = ((solver *) self->solver)->vars[var->index];
+    var->lower = SCIPvarGetLbOriginal(var->variable);
+    var->upper = SCIPvarGetUbOriginal(var->variable);
+
+    Py_RETURN_NONE;
+}
+
 /*****************************************************************************/
 /* MODULE INITIALIZATION                                                     */
 /*****************************************************************************/
+static PyMemberDef variable_members[] = {
+    {"index", T_INT, offsetof(variable, index), READONLY, "position of the variable in its solver"},
+    {NULL} /* Sentinel */
+};
+
 static PyMethodDef variable_methods[] = {
     {"set_coefficient", (PyCFunction) variable_set_coefficient, METH_O, "updates objective coefficient for a variable"},
     {"tighten_lower_bound", (PyCFunction) variable_tighten_lower, METH_O, "adds a possible tightened lower bound for a variable"},
@@ -212,7 +408,7 @@ static PyTypeObject variable_type = {
     0,                             /* tp_iter */
     0,                             /* tp_iternext */
     variable_methods,              /* tp_methods */
-    0,                             /* tp_members */
+    variable_members,              /* tp_members */
     0,                             /* tp_getset */
     0,                             /* tp_base */
     0,                             /* tp_dict */
@@ -224,6 +420,58 @@ static PyTypeObject variable_type = {
     0,                             /* tp_new */
 };
 
+static PyMemberDef variable_block_members[] = {
+    {"start", T_INT, offsetof(variable_block, start), READONLY, "index of the first variable in the block"},
+    {"size", T_INT, offsetof(variable_block, size), READONLY, "number of variables in the block"},
+    {NULL} /* Sentinel */
+};
+
+static PyMethodDef variable_block_methods[] = {
+    {"assign", (PyCFunction) variable_block_assign, METH_VARARGS, "points a variable object at a variable in the block"},
+    {NULL} /* Sentinel */
+};
+
+static PyTypeObject variable_block_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_vars.variable_block",        /* tp_name */
+    sizeof(variable_block),        /* tp_basicsize */
+    0,                             /* tp_itemsize */
+    (destructor) variable_block_dealloc, /* tp_dealloc */
+    0,                             /* tp_print */
+    0,                             /* tp_getattr */
+    0,                             /* tp_setattr */
+    0,                             /* tp_compare */
+    0,                             /* tp_repr */
+    0,                             /* tp_as_number */
+    0,                             /* tp_as_sequence */
+    0,                             /* tp_as_mapping */
+    0,                             /* tp_hash */
+    0,                             /* tp_call */
+    0,                             /* tp_str */
+    0,                             /* tp_getattro */
+    0,                             /* tp_setattro */
+    0,                             /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+    "SCIP variable blocks",        /* tp_doc */
+    0,                             /* tp_traverse */
+    0,                             /* tp_clear */
+    0,                             /* tp_richcompare */
+    0,                             /* tp_weaklistoffset */
+    0,                             /* tp_iter */
+    0,                             /* tp_iternext */
+    variable_block_methods,        /* tp_methods */
+    variable_block_members,        /* tp_members */
+    0,                             /* tp_getset */
+    0,                             /* tp_base */
+    0,                             /* tp_dict */
+    0,                             /* tp_descr_get */
+    0,                             /* tp_descr_set */
+    0,                             /* tp_dictoffset */
+    (initproc) variable_block_init, /* tp_init */
+    0,                             /* tp_alloc */
+    0,                             /* tp_new */
+};
+
 #if PY_MAJOR_VERSION >= 3
 static PyModuleDef vars_module = {
     PyModuleDef_HEAD_INIT,
@@ -248,6 +496,14 @@ PyMODINIT_FUNC PyInit__vars(void) {
         return;
 #endif
 
+    variable_block_type.tp_new = PyType_GenericNew;
+    if (PyType_Ready(&variable_block_type) < 0)
+#if PY_MAJOR_VERSION >= 3
+        return NULL;
+#else
+        return;
+#endif
+
 #if PY_MAJOR_VERSION >= 3
     m = PyModule_Create(&vars_module); 
 #else
@@ -257,6 +513,9 @@ PyMODINIT_FUNC PyInit__vars(void) {
     Py_INCREF(&variable_type);
     PyModule_AddObject(m, "variable", (PyObject *) &variable_type);
 
+    Py_INCREF(&variable_block_type);
+    PyModule_AddObject(m, "variable_block", (PyObject *) &variable_block_type);
+
     // Initialize exception type
     error = PyErr_NewException("_vars.error", NULL, NULL);
     Py_INCREF(error);
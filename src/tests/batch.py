@@ -0,0 +1,76 @@
+from zibopt import scip
+import unittest
+
+KNAPSACK = {
+    'sense': 'max',
+    'variables': [
+        {'vartype': scip.BINARY, 'coefficient': 5},
+        {'vartype': scip.BINARY, 'coefficient': 4},
+        {'vartype': scip.BINARY, 'coefficient': 3}
+    ],
+    'constraints': [{'linear': [(0, 3), (1, 2), (2, 2)], 'upper': 4}]
+}
+
+class BatchSolveTest(unittest.TestCase):
+    def testBatchSolve(self):
+        '''Solves several models and returns one record for each'''
+        results = list(scip.batch_solve([KNAPSACK] * 5, workers=2, chunksize=2))
+        self.assertEqual(sorted(r.index for r in results), list(range(5)))
+        for r in results:
+            self.assertEqual(r.status, 'optimal')
+            self.assertAlmostEqual(r.objective, 7)
+            self.assertEqual(list(r.values), [0, 1, 1])
+
+    def testBatchObjectiveAndBilinear(self):
+        '''Models can have explicit objectives and bilinear rows'''
+        model = {
+            'variables': [
+                {'vartype': scip.INTEGER, 'upper': 2},
+                {'vartype': scip.INTEGER, 'upper': 2}
+            ],
+            'constraints': [
+                {'bilinear': [(0, 1, 1)], 'lower': 0, 'upper': 3}
+            ],
+            'objective': {'linear': [(0, 5), (1, 2)], 'constant': 1},
+            'sense': 'max'
+        }
+        result, = scip.batch_solve([model], workers=1)
+        self.assertAlmostEqual(result.objective, 13)
+
+    def testBatchBilinearObjective(self):
+        '''Values only cover the model's variables, even with a bilinear objective'''
+        model = {
+            'variables': [
+                {'vartype': scip.INTEGER, 'upper': 2},
+                {'vartype': scip.INTEGER, 'upper': 3}
+            ],
+            'objective': {'bilinear': [(0, 1, 1)]},
+            'sense': 'max'
+        }
+        result, = scip.batch_solve([model], workers=1)
+        self.assertAlmostEqual(result.objective, 6)
+        self.assertEqual(list(result.values), [2, 3])
+
+    def testBatchInfeasible(self):
+        '''Infeasible models are reported by status'''
+        model = {
+            'variables': [{}],
+            'constraints': [{'linear': [(0, 1)], 'lower': 2, 'upper': 3},
+                            {'linear': [(0, 1)], 'upper': 1}]
+        }
+        result, = scip.batch_solve([model], workers=1)
+        self.assertEqual(result.status, 'infeasible')
+        self.assertTrue(not result.values)
+
+    def testBatchError(self):
+        '''A model that raises gets an error record without stopping the batch'''
+        bad = {'variables': [{}], 'constraints': [{'linear': [(5, 1)], 'upper': 1}]}
+        results = sorted(scip.batch_solve([bad, KNAPSACK], workers=1, chunksize=2))
+        self.assertEqual([r.index for r in results], [0, 1])
+        self.assertEqual(results[0].status, 'error')
+        self.assertTrue(results[0].error)
+        self.assertEqual(results[1].status, 'optimal')
+        self.assertEqual(list(results[1].values), [0, 1, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+from array import array
 from zibopt import scip
 import unittest
 
@@ -40,6 +41,87 @@ class ConstraintTest(unittest.TestCase):
         self.assertAlmostEqual(c.coefficients[(x1,)], 1.0)
         self.assertAlmostEqual(c.coefficients[(x2,)], 2.0)
 
+class LeanConstraintTest(unittest.TestCase):
+    def setUp(self):
+        self.solver = scip.solver(lean=True)
+        self.x1 = self.solver.variable(scip.INTEGER, upper=3)
+        self.x2 = self.solver.variable(scip.INTEGER, upper=3)
+
+    def testLinearCoefficients(self):
+        '''Reads linear coefficients back out of SCIP'''
+        c = self.solver.constraint(1 <= self.x1 + 2*self.x2 <= 4)
+        self.assertEqual(c.lower, 1.0)
+        self.assertEqual(c.upper, 4.0)
+        self.assertEqual(len(c.coefficients), 2)
+        self.assertAlmostEqual(c.coefficients[(self.x1,)], 1.0)
+        self.assertAlmostEqual(c.coefficients[(self.x2,)], 2.0)
+
+        solution = self.solver.maximize(objective=self.x1+self.x2)
+        self.assertAlmostEqual(solution.objective, 3.0)
+
+    def testBilinearCoefficients(self):
+        '''Reads bilinear coefficients back out of SCIP'''
+        c = self.solver.constraint(self.x1*self.x2 + 3*self.x1 <= 5)
+        coefficients = c.coefficients
+        self.assertEqual(len(coefficients), 2)
+        self.assertAlmostEqual(coefficients[(self.x1,)], 3.0)
+        self.assertAlmostEqual(sum(v for k, v in coefficients.items() if len(k) == 2), 1.0)
+
+    def testMixedTypeCoefficients(self):
+        '''Coefficients map to the right variables when SCIP reorders them by type'''
+        y = self.solver.variable(upper=3)
+        b = self.solver.variable(scip.BINARY)
+        c = self.solver.constraint(self.x1 + 2*y + 3*b + 4*self.x2 <= 10)
+        coefficients = c.coefficients
+        self.assertEqual(len(coefficients), 4)
+        self.assertAlmostEqual(coefficients[(self.x1,)], 1.0)
+        self.assertAlmostEqual(coefficients[(self.x2,)], 4.0)
+        self.assertAlmostEqual(coefficients[(y,)], 2.0)
+        self.assertAlmostEqual(coefficients[(b,)], 3.0)
+
+class LinexprTest(unittest.TestCase):
+    def setUp(self):
+        self.solver = scip.solver()
+        self.x = self.solver.add_variables(3, scip.INTEGER, upper=5)
+        self.y = self.solver.variable(scip.INTEGER, upper=5)
+
+    def testQuicksum(self):
+        '''Builds constraints from quicksum(...)'''
+        row = scip.quicksum([self.x[0], 2*self.x[1], self.y, 1])
+        self.assertEqual(list(row.indices), [self.x.start, self.x.start+1, self.y.index])
+        self.assertEqual(list(row.coefficients), [1, 2, 1])
+        self.assertEqual(row.constant, 1)
+
+        c = self.solver.constraint(row <= 5)
+        self.assertEqual(c.upper, 4)
+        self.assertAlmostEqual(c.coefficients[(self.x[1],)], 2)
+
+        solution = self.solver.maximize(objective=self.x[0] + self.x[1] + self.y)
+        self.assertAlmostEqual(solution.objective, 4)
+
+    def testLinexpr(self):
+        '''Builds linexprs in place and uses them as objectives'''
+        row = scip.linexpr(self.x, array('d', [1, 2, 3]))
+        row += self.y
+        row -= 2
+        self.assertEqual(len(row), 4)
+        self.assertEqual(row.constant, -2)
+
+        self.solver += 1 <= row <= 8
+        self.assertIsNone(row.expr_lower)
+        self.assertIsNone(row.expr_upper)
+
+        solution = self.solver.maximize(objective=scip.linexpr(self.x) + 10)
+        self.assertAlmostEqual(solution.objective, 17)
+
+    def testLinexprErrors(self):
+        '''Rejects nonlinear terms and mismatched coefficients'''
+        row = scip.linexpr()
+        self.assertRaises(scip.SolverError, row.__iadd__, self.y * self.y)
+        self.assertRaises(scip.SolverError, row.add, [self.y], [1, 2])
+        self.assertEqual(len(row), 0)
+        self.assertRaises(scip.ConstraintError, self.solver.constraint, row)
+
 class ConstraintRemovalTest(unittest.TestCase):
     def setUp(self):
         self.solver = scip.solver()
@@ -70,6 +152,104 @@ class ConstraintRemovalTest(unittest.TestCase):
         self.solver += self.c2
         self.assertAlmostEqual(1.0, self.solver.maximize(objective=self.x1+self.x2).objective)
 
+class BatchConstraintTest(unittest.TestCase):
+    def testAddMany(self):
+        '''Adds expressions and constraint instances in one call'''
+        solver = scip.solver()
+        x1 = solver.variable(scip.INTEGER)
+        x2 = solver.variable(scip.INTEGER)
+
+        c1 = solver.constraint(x1 + x2 <= 3)
+        solver -= c1
+
+        added = solver.add_many([c1, x1 <= 2, scip.linexpr([x2]) <= 2, c1])
+        self.assertEqual(len(added), 4)
+        self.assertTrue(added[0] is c1)
+        self.assertEqual(len(solver.constraints), 3)
+
+        solution = solver.maximize(objective=x1+2*x2)
+        self.assertAlmostEqual(solution.objective, 5.0)
+
+    def testAddManyAfterSolve(self):
+        '''Adding many constraints after solving resets the problem once'''
+        solver = scip.solver()
+        x = [solver.variable(upper=5) for _ in range(10)]
+        self.assertAlmostEqual(solver.maximize(objective=sum(x)).objective, 50.0)
+
+        solver.add_many(v <= 1 for v in x)
+        self.assertAlmostEqual(solver.maximize(objective=sum(x)).objective, 10.0)
+
+    def testBatch(self):
+        '''Constraints in a batch are added when the block ends'''
+        solver = scip.solver()
+        x = [solver.variable(upper=5) for _ in range(10)]
+
+        with solver.batch():
+            for v in x:
+                solver.constraint(v <= 2)
+            self.assertEqual(len(solver.constraints), 0)
+
+        self.assertEqual(len(solver.constraints), 10)
+        self.assertAlmostEqual(solver.maximize(objective=sum(x)).objective, 20.0)
+
+    def testNestedBatch(self):
+        '''Only the outermost batch adds constraints'''
+        solver = scip.solver()
+        x1 = solver.variable()
+        with solver.batch():
+            with solver.batch():
+                solver.constraint(x1 <= 1)
+            self.assertEqual(len(solver.constraints), 0)
+        self.assertEqual(len(solver.constraints), 1)
+
+    def testBatchUnconstrain(self):
+        '''Removing a constraint before the batch ends means it isn't added'''
+        solver = scip.solver()
+        x1 = solver.variable(upper=5)
+        with solver.batch():
+            c = solver.constraint(x1 <= 1)
+            solver -= c
+        self.assertEqual(len(solver.constraints), 0)
+        self.assertAlmostEqual(solver.maximize(objective=x1).objective, 5.0)
+
+    def testSolveInBatch(self):
+        '''Solving inside a batch adds the constraints so far'''
+        solver = scip.solver()
+        x1 = solver.variable(upper=5)
+        with solver.batch():
+            solver += x1 <= 1
+            self.assertAlmostEqual(solver.maximize(objective=x1).objective, 1.0)
+            solver += x1 <= 0.5
+        self.assertAlmostEqual(solver.maximize(objective=x1).objective, 0.5)
+
+    def testRemoveMany(self):
+        '''Removes many constraints at once after solving'''
+        solver = scip.solver()
+        x = [solver.variable(upper=5) for _ in range(10)]
+        rows = solver.add_many(v <= 1 for v in x)
+        self.assertAlmostEqual(solver.maximize(objective=sum(x)).objective, 10.0)
+
+        solver.remove_many(rows[:5])
+        self.assertEqual(len(solver.constraints), 5)
+        self.assertAlmostEqual(solver.maximize(objective=sum(x)).objective, 30.0)
+
+        # Removing again does nothing, and rows can be added back
+        solver.remove_many(rows[:5])
+        self.assertEqual(len(solver.constraints), 5)
+        solver.add_many(rows)
+        self.assertAlmostEqual(solver.maximize(objective=sum(x)).objective, 10.0)
+
+    def testRemoveManyInBatch(self):
+        '''Removing constraints drops them from a pending batch'''
+        solver = scip.solver()
+        x1 = solver.variable(upper=5)
+        with solver.batch():
+            c1 = solver.constraint(x1 <= 1)
+            c2 = solver.constraint(x1 <= 2)
+            solver.remove_many([c1])
+        self.assertEqual(solver.constraints, set([c2]))
+        self.assertAlmostEqual(solver.maximize(objective=x1).objective, 2.0)
+
 class ConstraintAttributesTest(unittest.TestCase):
     def setUp(self):
         self.solver = scip.solver()
@@ -92,6 +272,150 @@ class ConstraintAttributesTest(unittest.TestCase):
         self.assertAlmostEqual(self.c2.dual_sol_linear, -0.8)
         self.solver.restart()
 
+    def testBulkDuals(self):
+        '''Reads dual values for many constraints at once'''
+        solution = self.solver.maximize(objective=3*self.x1 + 5*self.x2)
+        for duals in (
+            solution.duals(),
+            solution.duals([self.c1, self.c2]),
+            solution.duals(array('l', [self.c1.index, self.c2.index]))
+        ):
+            self.assertEqual(len(duals), 2)
+            self.assertAlmostEqual(duals[0], 1.4)
+            self.assertAlmostEqual(duals[1], 0.8)
+
+        duals = solution.duals([self.c2])
+        self.assertAlmostEqual(duals[0], self.c2.dual_sol_linear)
+        self.assertRaises(scip.SolutionError, solution.duals, array('l', [5]))
+
+    def testDualsAfterFreedTransform(self):
+        '''Looks transformed constraints up again after the problem changes'''
+        solution = self.solver.maximize(objective=3*self.x1 + 5*self.x2)
+        self.assertEqual(len(solution.duals()), 2)
+
+        # Changing bounds frees the transformed problem.  An infeasible
+        # start solution transforms it again without starting a new solve.
+        self.solver.set_bounds([self.x1], upper=1)
+        self.assertRaises(scip.SolverError, self.solver.maximize,
+            objective=3*self.x1 + 5*self.x2, solution={self.x1: 5, self.x2: 5})
+        self.assertEqual(len(solution.duals()), 2)
+
+    def testReducedCosts(self):
+        '''Reads reduced costs for many variables at once'''
+        solver = scip.solver()
+        x = solver.add_variables(3)
+        solver += scip.linexpr(x, [1, 3, 1]) <= 4
+        solver += scip.linexpr(x, [2, 1, 1]) <= 6
+        solution = solver.maximize(objective=scip.linexpr(x, [3, 5, 1]))
+
+        # x[2] is worth 1 but uses up 1.4 + 0.8 in the constraints
+        costs = solution.reduced_costs()
+        self.assertEqual(len(costs), 3)
+        self.assertAlmostEqual(costs[0], 0.0)
+        self.assertAlmostEqual(costs[1], 0.0)
+        self.assertAlmostEqual(costs[2], -1.2)
+
+        out = array('d', [0.0])
+        solution.reduced_costs([x[2]], out)
+        self.assertAlmostEqual(out[0], -1.2)
+
+class ConstraintBlockTest(unittest.TestCase):
+    def testAddConstraintsCSR(self):
+        '''Adds rows in compressed sparse row format'''
+        solver = scip.solver()
+        x = solver.add_variables(2, scip.INTEGER)
+        c = solver.add_constraints_csr(
+            array('i', [0, 2]),
+            array('i', [x.start, x.start+1]),
+            array('d', [1, 2]),
+            lower = 1,
+            upper = 2
+        )
+        self.assertEqual(len(c), 1)
+
+        solution = solver.maximize(objective=x[0]+x[1])
+        self.assertAlmostEqual(solution[x[0]], 2.0)
+        self.assertAlmostEqual(solution[x[1]], 0.0)
+
+    def testMixedCSR(self):
+        '''CSR rows can reference individually created variables'''
+        solver = scip.solver()
+        x1 = solver.variable()
+        x2 = solver.variable()
+        solver.add_constraints_csr(
+            array('l', [0, 2, 3]),
+            array('l', [x1.index, x2.index, x2.index]),
+            array('d', [1, 1, 1]),
+            upper = array('d', [4, 1])
+        )
+        solution = solver.maximize(objective=x1+2*x2)
+        self.assertAlmostEqual(solution.objective, 5.0)
+
+    def testCSRErrors(self):
+        '''Bad CSR arrays raise errors before anything is added'''
+        solver = scip.solver()
+        x = solver.add_variables(2)
+        self.assertRaises(scip.ConstraintError, solver.add_constraints_csr,
+            array('i', [0, 1]), array('i', [5]), array('d', [1]), upper=1)
+        self.assertRaises(scip.ConstraintError, solver.add_constraints_csr,
+            array('i', [0, 3]), array('i', [0, 1]), array('d', [1, 1]), upper=1)
+        self.assertRaises(scip.ConstraintError, solver.add_constraints_csr,
+            array('i', [0, 1]), array('d', [0]), array('d', [1]), upper=1)
+        self.assertRaises(scip.ConstraintError, solver.add_constraints_csr,
+            array('i', [0, 1]), array('i', [0]), array('d', [1]))
+        self.assertRaises(scip.ConstraintError, solver.add_constraints_csr,
+            array('i', [0, 1]), array('i', [0]), array('d', [1]), lower=2, upper=1)
+        self.assertRaises(scip.ConstraintError, solver.add_constraints_csr,
+            array('i', [0, 1]), None, array('d', [1]), upper=1)
+        self.assertRaises(scip.ConstraintError, solver.add_constraints_csr,
+            None, array('i', [0]), array('d', [1]), upper=1)
+        self.assertRaises(scip.ConstraintError, solver.add_constraints_csr,
+            array('i', [0, 1]), 0, array('d', [1]), upper=1)
+        self.assertEqual(solver.nconss, 0)
+
+class CanonicalTermsTest(unittest.TestCase):
+    def testMergeTerms(self):
+        '''Repeated variables are merged and zero terms are dropped'''
+        solver = scip.solver()
+        x = solver.add_variables(3, upper=5)
+        row = scip.linexpr([x[2], x[0], x[2], x[1]], [1, 1, 2, 0]) <= 6
+        c = solver.constraint(row)
+        self.assertEqual(sorted(c.terms()), [((x.start,), 1.0), ((x.start+2,), 3.0)])
+        self.assertEqual(c.ndropped, 2)
+        self.assertEqual(solver.ndropped, 2)
+        self.assertAlmostEqual(solver.maximize(objective=x[2]).objective, 2.0)
+
+    def testCancelledTerms(self):
+        '''Terms that cancel out are left out of the constraint'''
+        solver = scip.solver()
+        x = solver.add_variables(2, upper=5)
+        c = solver.constraint(scip.linexpr([x[0], x[1], x[0]], [1, 1, -1]) <= 3)
+        self.assertEqual(c.terms(), [((x.start+1,), 1.0)])
+        self.assertAlmostEqual(solver.maximize(objective=x[0]).objective, 5.0)
+
+    def testDropTolerance(self):
+        '''Coefficients below the drop tolerance are left out'''
+        solver = scip.solver(drop_tolerance=1e-9)
+        x = solver.add_variables(2, upper=5)
+        c = solver.constraint(scip.linexpr(x, [1, 1e-12]) <= 2)
+        self.assertEqual(c.ndropped, 1)
+        self.assertAlmostEqual(solver.maximize(objective=x[1]).objective, 5.0)
+        self.assertAlmostEqual(solver.clone().drop_tolerance, 1e-9)
+
+    def testCSRRows(self):
+        '''Rows added in CSR format are merged the same way'''
+        solver = scip.solver()
+        x = solver.add_variables(2, upper=5)
+        block = solver.add_constraints_csr(
+            array('l', [0, 3, 4]),
+            array('l', [x.start+1, x.start, x.start+1, x.start]),
+            array('d', [1, 1, 1, 0]),
+            upper = 4
+        )
+        self.assertEqual(block.ndropped, 2)
+        self.assertEqual(solver.ndropped, 2)
+        self.assertAlmostEqual(solver.maximize(objective=x[1]).objective, 2.0)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -1,3 +1,5 @@
+from array import array
+from zibopt import scip
 from zibopt._lp import lp, MAXIMIZE, MINIMIZE
 import unittest
 
@@ -5,6 +7,81 @@ class LPInterfaceTest(unittest.TestCase):
     def testSimpleLP(self):
         lp(MAXIMIZE)
 
+class LPSolveTest(unittest.TestCase):
+    def setUp(self):
+        # max 3x + 5y s.t. x + 3y <= 4, 2x + y <= 6
+        self.lp = scip.lp('max')
+        self.x = self.lp.add_columns(2, objective=array('d', [3, 5]))
+        self.lp.add_rows(
+            array('i', [0, 2, 4]),
+            array('i', [self.x, self.x+1, self.x, self.x+1]),
+            array('d', [1, 3, 2, 1]),
+            upper = array('d', [4, 6])
+        )
+
+    def testSolve(self):
+        '''Solves an LP and returns arrays of values'''
+        self.assertEqual((self.lp.ncols, self.lp.nrows), (2, 2))
+        solution = self.lp.solve()
+        self.assertEqual(solution.status, 'optimal')
+        self.assertAlmostEqual(solution.objective, 10.4)
+        self.assertAlmostEqual(solution.values[0], 2.8)
+        self.assertAlmostEqual(solution.values[1], 0.4)
+        self.assertAlmostEqual(abs(solution.duals[0]), 1.4)
+        self.assertAlmostEqual(abs(solution.duals[1]), 0.8)
+        self.assertAlmostEqual(solution.reduced_costs[0], 0.0)
+
+    def testChanges(self):
+        '''Bounds, sides, and objectives can change between solves'''
+        self.lp.solve()
+        self.lp.change_bounds(array('i', [self.x+1]), upper=0)
+        self.assertAlmostEqual(self.lp.solve().objective, 9.0)
+
+        self.lp.change_bounds(array('i', [self.x+1]), upper=float('inf'))
+        self.lp.change_sides(array('i', [1]), upper=100)
+        self.lp.change_objective(array('i', [self.x]), 1)
+        self.assertAlmostEqual(self.lp.solve(method='primal').objective, 20.0/3)
+
+        self.assertRaises(scip.LPError, self.lp.change_bounds, array('i', [self.x]), 5, 1)
+        self.assertRaises(scip.LPError, self.lp.change_sides, array('i', [2]), 1)
+
+    def testWarmStart(self):
+        '''Solving again starts from the last basis'''
+        self.lp.solve()
+        self.assertEqual(self.lp.solve().iterations, 0)
+
+        basis = self.lp.basis()
+        self.assertEqual(len(basis.columns), 2)
+        self.assertEqual(list(basis.columns), [scip.lp.BASIC, scip.lp.BASIC])
+
+        other = scip.lp('max')
+        other.add_columns(2, objective=array('d', [3, 5]))
+        other.add_rows(
+            array('i', [0, 2, 4]), array('i', [0, 1, 0, 1]),
+            array('d', [1, 3, 2, 1]), upper=array('d', [4, 6])
+        )
+        solution = other.solve(basis=basis)
+        self.assertEqual(solution.iterations, 0)
+        self.assertAlmostEqual(solution.objective, 10.4)
+
+    def testStatus(self):
+        '''Reports infeasible and unbounded LPs'''
+        self.lp.add_rows(array('i', [0, 1]), array('i', [self.x]), array('d', [1]), lower=5)
+        self.assertEqual(self.lp.solve().status, 'infeasible')
+
+        unbounded = scip.lp('max')
+        unbounded.add_columns(1, objective=1)
+        self.assertIn(unbounded.solve(method='primal').status, ('unbounded', 'inforunbd'))
+
+    def testErrors(self):
+        '''Bad arguments raise errors before changing anything'''
+        self.assertRaises(scip.LPError, scip.lp, 'up')
+        self.assertRaises(scip.LPError, self.lp.add_rows,
+            array('i', [0, 1]), array('i', [7]), array('d', [1]), upper=1)
+        self.assertRaises(scip.LPError, self.lp.add_rows,
+            array('i', [0, 1]), array('i', [0]), array('d', [1]))
+        self.assertRaises(scip.LPError, self.lp.solve, method='simplex')
+        self.assertEqual(self.lp.nrows, 2)
+
 if __name__ == '__main__':
     unittest.main()
-
@@ -0,0 +1,248 @@
+from array import array
+from zibopt import scip
+import os, tempfile, unittest
+
+class ModelFileTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def build(self):
+        solver = scip.solver()
+        x = solver.add_variables(3, scip.INTEGER, coefficient=array('d', [1, 2, 3]), upper=4)
+        y = solver.variable(scip.BINARY, coefficient=5, priority=7)
+        z = solver.variable(lower=-float('inf'), upper=10)
+
+        solver += x[0] + 2*x[1] <= 5
+        solver += scip.linexpr(x, [1, 1, 1]) + y >= 2
+        solver += z >= -3
+        solver.add_constraints_csr(
+            array('i', [0, 2]),
+            array('i', [x.start+2, y.index]),
+            array('d', [1, 1]),
+            upper = 4
+        )
+        quadratic = solver.constraint(x[0]*x[1] + z**2 <= 12)
+        return solver, quadratic
+
+    def testRoundTrip(self):
+        '''Loads a saved model and finds the same solution'''
+        solver, _ = self.build()
+        solver.save(self.path)
+        loaded = scip.solver.load(self.path)
+        self.assertEqual(len(loaded.variables), len(solver.variables))
+
+        s1 = solver.maximize()
+        s2 = loaded.maximize()
+        self.assertTrue(s2.optimal)
+        self.assertAlmostEqual(s1.objective, s2.objective)
+
+    def testVariableAttributes(self):
+        '''Keeps variable types, bounds, and priorities'''
+        solver, _ = self.build()
+        solver.save(self.path)
+        loaded = scip.solver.load(self.path)
+
+        self.assertEqual(loaded.variables[3].priority, 7)
+        self.assertEqual(loaded.variables[0].priority, 0)
+
+        # z has no lower bound and y is binary
+        solution = loaded.minimize(objective=loaded.variables[4] + loaded.variables[3])
+        self.assertAlmostEqual(solution.objective, -3)
+        self.assertAlmostEqual(solution[loaded.variables[3]], 0)
+
+    def testQuadraticTerms(self):
+        '''Constraints with bilinear terms come back as constraints'''
+        solver, quadratic = self.build()
+        solver.save(self.path)
+        loaded = scip.solver.load(self.path)
+
+        constraints = list(loaded.constraints)
+        self.assertEqual(len(constraints), 1)
+        self.assertEqual(sorted(constraints[0].terms()), sorted(quadratic.terms()))
+        self.assertAlmostEqual(constraints[0].upper, 12)
+        self.assertIsNone(constraints[0].lower)
+
+    def testMixedTypes(self):
+        '''Terms stay on the right variables when types are mixed'''
+        # SCIP groups variables by type, so y moves ahead of x in SCIP's 
+        # own order even though it was created after them
+        solver = scip.solver()
+        x = solver.add_variables(2, scip.INTEGER, upper=10)
+        y = solver.variable(scip.BINARY)
+        solver += x[0] + 5*x[1] <= 7
+        solver += x[0]*y + 2*x[1] <= 9
+        solver.save(self.path)
+
+        loaded = scip.solver.load(self.path)
+        c, = loaded.constraints
+        self.assertEqual(
+            sorted(c.terms()),
+            [((x.start, y.index), 1.0), ((x.start+1,), 2.0)]
+        )
+        objective = loaded.variables[x.start]
+        self.assertAlmostEqual(loaded.maximize(objective=objective).objective, 7)
+
+    def testConstraintOrder(self):
+        '''Rows are loaded in the order they were saved'''
+        solver = scip.solver()
+        x = solver.add_variables(3, upper=5)
+        solver += x[0] + x[1] <= 4
+        solver += x[0]*x[1] <= 3
+        solver += x[1] + 2*x[2] <= 6
+        solver.save(self.path)
+        with open(self.path, 'rb') as f:
+            saved = f.read()
+
+        scip.solver.load(self.path).save(self.path)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), saved)
+
+    def testRemovedConstraints(self):
+        '''Leaves out constraints that were removed'''
+        solver = scip.solver()
+        x = solver.variable(scip.INTEGER, coefficient=1, upper=10)
+        c = solver.constraint(x <= 3)
+        solver -= c
+        solver.save(self.path)
+
+        loaded = scip.solver.load(self.path)
+        self.assertAlmostEqual(loaded.maximize().objective, 10)
+
+    def testSaveAfterSolve(self):
+        '''Saves the original problem after solving'''
+        solver, _ = self.build()
+        objective = solver.maximize().objective
+        solver.save(self.path)
+        self.assertAlmostEqual(scip.solver.load(self.path).maximize().objective, objective)
+
+    def testNotAModelFile(self):
+        '''Raises an error for files that aren't model files'''
+        self.assertRaises(scip.SolverError, scip.solver.load, self.path)
+        with open(self.path, 'wb') as f:
+            f.write(b'NAME model\nROWS\n' * 10)
+        self.assertRaises(scip.SolverError, scip.solver.load, self.path)
+
+    def testTruncated(self):
+        '''Raises an error for files that were cut short'''
+        solver, _ = self.build()
+        solver.save(self.path)
+        with open(self.path, 'rb+') as f:
+            f.truncate(100)
+        self.assertRaises(scip.SolverError, scip.solver.load, self.path)
+
+LP_FILE = '''\
+Maximize
+ obj: 3 x + 2 y + 4 z + 1
+Subject To
+ c1: x + y + 2 z <= 4
+ c2: x + 3 y + z <= 5
+ c3: y - z >= -1
+Bounds
+ x <= 3
+Generals
+ x
+End
+'''
+
+# The continuous column comes before the integer one
+MIXED_LP_FILE = '''\
+Maximize
+ obj: a + b
+Subject To
+ c1: a + 2 b <= 100
+Bounds
+ a <= 2.5
+ b <= 3.7
+Generals
+ b
+End
+'''
+
+class ReadWriteTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.lp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(LP_FILE)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def testRead(self):
+        '''Reads variables and constraints from an LP file'''
+        solver = scip.solver().read(self.path)
+        self.assertEqual(len(solver.variables), 3)
+        self.assertEqual(len(solver.constraints), 3)
+
+        c1 = solver.constraints[0]
+        self.assertIsNone(c1.lower)
+        self.assertAlmostEqual(c1.upper, 4)
+        self.assertEqual(sorted(c1.terms()), [((0,), 1.0), ((1,), 1.0), ((2,), 2.0)])
+
+        x = solver.variables[0]
+        self.assertIs(solver.variables[0], x)
+        self.assertIn(x, solver.variables)
+
+    def testReadSolve(self):
+        '''Solves a problem read from a file with its own objective'''
+        solver = scip.solver().read(self.path)
+        solution = solver.maximize()
+        self.assertTrue(solution.optimal)
+
+        # The objective constant from the file is kept
+        x, y, z = solver.variables
+        values = [solution[v] for v in (x, y, z)]
+        self.assertAlmostEqual(solution.objective, 3*values[0] + 2*values[1] + 4*values[2] + 1)
+        self.assertAlmostEqual(values[0], round(values[0]))
+
+    def testReadConstraintRemoval(self):
+        '''Removes constraints that were read from a file'''
+        solver = scip.solver().read(self.path)
+        before = solver.maximize().objective
+        solver -= solver.constraints[0]
+        self.assertEqual(len(solver.constraints), 2)
+        self.assertGreater(solver.maximize().objective, before)
+
+    def testReadMixedTypes(self):
+        '''Variables read from a file are in file order, not grouped by type'''
+        with open(self.path, 'w') as f:
+            f.write(MIXED_LP_FILE)
+        solver = scip.solver().read(self.path)
+        self.assertEqual(sorted(solver.constraints[0].terms()), [((0,), 1.0), ((1,), 2.0)])
+
+        solution = solver.maximize()
+        self.assertEqual(list(solution.values_array()), [2.5, 3.0])
+
+    def testReadNotEmpty(self):
+        '''Only reads into empty solvers'''
+        solver = scip.solver()
+        solver.variable()
+        self.assertRaises(scip.SolverError, solver.read, self.path)
+
+    def testWrite(self):
+        '''Writes a problem that reads back the same'''
+        solver = scip.solver()
+        x = solver.variable(scip.INTEGER, upper=3)
+        y = solver.variable()
+        solver += x + 2*y <= 4
+        objective = solver.maximize(objective=x + y).objective
+
+        fd, path = tempfile.mkstemp(suffix='.mps')
+        os.close(fd)
+        try:
+            solver.write(path)
+            other = scip.solver().read(path)
+            self.assertAlmostEqual(other.maximize().objective, objective)
+
+            # Writing in another format with the names from the file
+            other.write(self.path, format='lp')
+            again = scip.solver().read(self.path)
+            self.assertAlmostEqual(again.maximize().objective, objective)
+        finally:
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
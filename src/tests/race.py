@@ -0,0 +1,49 @@
+from zibopt import scip
+import time
+import unittest
+
+def knapsack(solver):
+    x = solver.add_variables(3, scip.BINARY)
+    solver += 3*x[0] + 2*x[1] + 2*x[2] <= 4
+    return 5*x[0] + 4*x[1] + 3*x[2]
+
+def infeasible(solver):
+    x = solver.variable()
+    solver += x >= 2
+    solver += x <= 1
+
+def broken(solver):
+    raise ValueError('no model here')
+
+def slow_heuristics(solver):
+    solver.heuristics['rounding'].priority = -1
+
+class RaceTest(unittest.TestCase):
+    def testRace(self):
+        '''The first configuration to finish wins'''
+        configs = [{}, {'heuristics': {'rounding': {'priority': 500}}}, slow_heuristics]
+        result = scip.race(knapsack, configs, sense='max', workers=2)
+        self.assertIn(result.index, (0, 1, 2))
+        self.assertEqual(result.status, 'optimal')
+        self.assertAlmostEqual(result.objective, 7)
+        self.assertEqual(list(result.values), [0, 1, 1])
+
+    def testRaceInfeasible(self):
+        '''Proven infeasibility ends the race too'''
+        result = scip.race(infeasible, [{}, {}])
+        self.assertEqual(result.status, 'infeasible')
+        self.assertIsNone(result.values)
+
+    def testRaceErrors(self):
+        '''Errors in workers are raised in the caller'''
+        self.assertRaises(scip.SolverError, scip.race, broken, [{}])
+        self.assertRaises(scip.SolverError, scip.race, knapsack, [{}], sense='up')
+
+    def testRaceDeadline(self):
+        '''A deadline that has passed returns without a result'''
+        result = scip.race(knapsack, [{}], deadline=time.time() - 1)
+        self.assertEqual(result.status, 'stopped')
+        self.assertIsNone(result.index)
+
+if __name__ == '__main__':
+    unittest.main()
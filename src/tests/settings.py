@@ -162,6 +162,27 @@ class SettingsTest(unittest.TestCase):
             self.assertRaises(scip.DisplayError, setattr, d, 'priority', 'foo')
             self.assertRaises(scip.DisplayError, setattr, d, 'width', 'foo')
 
+class LazySettingsTest(unittest.TestCase):
+    def testLazySettings(self):
+        '''Settings objects are built on access and then reused'''
+        solver = scip.solver()
+        names = solver.heuristic_names()
+        self.assertEqual(list(solver.heuristics), names)
+        self.assertEqual(len(solver.heuristics), len(names))
+        self.assertTrue(names[0] in solver.heuristics)
+        self.assertFalse('NOSUCHRULE' in solver.heuristics)
+        self.assertIs(solver.heuristics[names[0]], solver.heuristics[names[0]])
+        self.assertRaises(KeyError, solver.heuristics.__getitem__, 'NOSUCHRULE')
+
+    def testSettingsDontKeepSolver(self):
+        '''Settings dictionaries do not keep their solver alive'''
+        import weakref
+        solver = scip.solver()
+        ref = weakref.ref(solver)
+        solver.branching.values()
+        del solver
+        self.assertIsNone(ref())
+
 if __name__ == '__main__':
     unittest.main()
 
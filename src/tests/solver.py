@@ -1,4 +1,8 @@
+from array import array
 from zibopt import scip, _vars, _cons
+import sys
+import threading
+import time
 import unittest
 
 class ScipTest(unittest.TestCase):
@@ -96,6 +100,43 @@ class ScipTest(unittest.TestCase):
         v = solver.variable(coefficient=1, vartype=scip.INTEGER, upper=2)
         self.assertRaises(scip.SolverError, solver.maximize, {v:3})
     
+    def testPrimalArrays(self):
+        '''Primal solutions can be arrays of values by variable index'''
+        solver = scip.solver()
+        x = solver.add_variables(3, scip.INTEGER, coefficient=1, upper=2)
+        solver += x[0] + x[1] + x[2] <= 4
+
+        solution = solver.maximize(solution=array('d', [2, 2, 0]))
+        self.assertAlmostEqual(solution.objective, 4)
+        self.assertRaises(scip.SolverError, solver.maximize, solution=array('d', [2, 2, 2]))
+        self.assertRaises(scip.SolverError, solver.maximize, solution=array('d', [0, 0, 0, 0]))
+        self.assertRaises(scip.SolverError, solver.maximize, solution=3)
+
+    def testPrimalMany(self):
+        '''Infeasible solutions are skipped if any others are feasible'''
+        solver = scip.solver()
+        x = solver.add_variables(2, scip.INTEGER, coefficient=1, upper=2)
+        solver += x[0] + x[1] <= 3
+
+        first = solver.maximize().values_array()
+        solver += x[0] + x[1] <= 1
+        solution = solver.maximize(solution=[first, {x[0]: 1}])
+        self.assertAlmostEqual(solution.objective, 1)
+        self.assertRaises(scip.SolverError, solver.maximize, solution=[first])
+
+    def testPrimalPartial(self):
+        '''Left out values are the closest to zero within bounds'''
+        solver = scip.solver()
+        x1 = solver.variable(scip.INTEGER, coefficient=1, lower=1, upper=3)
+        x2 = solver.variable(scip.INTEGER, coefficient=1, lower=-3, upper=-1)
+        x3 = solver.variable(scip.INTEGER, coefficient=1, upper=3)
+        solver += x1 + x3 <= 4
+
+        solution = solver.maximize(solution={x3: 3})
+        self.assertAlmostEqual(solution.objective, 3)
+        solution = solver.maximize(solution=array('d', [float('nan'), -1]))
+        self.assertAlmostEqual(solution.objective, 3)
+
     def testWrongSolver(self):
         '''Test incorrect mixing of variables and solvers'''
         solver1 = scip.solver()
@@ -140,6 +181,403 @@ class ScipTest(unittest.TestCase):
         solution = solver.minimize(objective=x)
         self.assertAlmostEqual(solution.objective, 3)
         
+class ObjectiveUpdateTest(unittest.TestCase):
+    def setUp(self):
+        self.solver = scip.solver()
+        self.x = self.solver.variable(scip.INTEGER, upper=2)
+        self.y = self.solver.variable(scip.INTEGER, upper=3)
+        self.solver += self.x + self.y <= 4
+
+    def testSetObjective(self):
+        '''Only changed objective coefficients are reported'''
+        self.assertEqual(self.solver.set_objective(array('i', [self.x.index]), array('d', [1])), 1)
+        self.assertEqual(self.solver.set_objective(array('i', [self.x.index]), array('d', [1])), 0)
+        self.assertEqual(self.solver.set_objective(array('i', [self.y.index]), 2), 2)
+        self.assertRaises(scip.SolverError, self.solver.set_objective, array('i', [99]), 1)
+
+    def testResolve(self):
+        '''Re-solves with new objectives and senses'''
+        self.assertAlmostEqual(self.solver.maximize(objective=self.x).objective, 2)
+        self.assertAlmostEqual(self.solver.maximize(objective=self.x).objective, 2)
+        self.assertAlmostEqual(self.solver.maximize(objective=self.y).objective, 3)
+        self.assertAlmostEqual(self.solver.maximize(objective=self.x+self.y).objective, 4)
+        self.assertAlmostEqual(self.solver.minimize(objective=self.x+self.y).objective, 0)
+        self.assertAlmostEqual(self.solver.maximize(objective=2*self.x+self.y).objective, 6)
+
+    def testCoefficientAfterSolve(self):
+        '''Setting a coefficient after solving takes effect'''
+        self.assertAlmostEqual(self.solver.maximize(objective=self.x).objective, 2)
+        self.y.set_coefficient(1)
+        self.assertAlmostEqual(self.solver.maximize().objective, 4)
+
+    def testBoundAfterSolve(self):
+        '''Tightening a bound after solving takes effect with the same objective'''
+        self.assertAlmostEqual(self.solver.maximize(objective=self.x).objective, 2)
+        self.x.tighten_upper_bound(1)
+        self.assertAlmostEqual(self.solver.maximize(objective=self.x).objective, 1)
+        self.y.tighten_lower_bound(1)
+        self.assertAlmostEqual(self.solver.minimize(objective=self.y).objective, 1)
+
+    def testSettingAfterSolve(self):
+        '''Settings and callbacks changed after solving take effect with the same objective'''
+        solution = self.solver.maximize(objective=self.x+self.y)
+        self.assertGreater(sum(s.calls for s in solution.statistics.heuristics.values()), 0)
+
+        for name in self.solver.heuristics:
+            self.solver.heuristics[name].frequency = -1
+        incumbents = []
+        self.solver.on_solution(incumbents.append)
+        solution = self.solver.maximize(objective=self.x+self.y)
+        self.assertEqual(sum(s.calls for s in solution.statistics.heuristics.values()), 0)
+        self.assertTrue(incumbents)
+        self.assertAlmostEqual(solution.objective, 4)
+
+class SolutionCallbackTest(unittest.TestCase):
+    def setUp(self):
+        self.solver = scip.solver()
+        self.x = self.solver.add_variables(5, scip.BINARY, coefficient=array('d', [5, 4, 3, 2, 1]))
+        self.solver.add_constraints_csr(
+            array('i', [0, 5]), 
+            array('i', range(self.x.start, self.x.start+5)),
+            array('d', [4, 3, 2, 1, 1]),
+            upper = 6
+        )
+
+    def testIncumbents(self):
+        '''Calls back with each new incumbent'''
+        incumbents = []
+        self.solver.on_solution(incumbents.append)
+        solution = self.solver.maximize()
+        self.assertTrue(incumbents)
+        self.assertTrue(all(isinstance(i, scip.incumbent) for i in incumbents))
+        self.assertTrue(all(i.values is None for i in incumbents))
+        self.assertAlmostEqual(incumbents[-1].objective, solution.objective)
+
+    def testIncumbentValues(self):
+        '''Passes values with incumbents if asked'''
+        values = []
+        @self.solver.on_solution
+        def nothing(incumbent):
+            pass
+        self.solver.on_solution(lambda i: values.append(list(i.values)), values=True)
+        solution = self.solver.maximize()
+        self.assertEqual(values[-1], list(solution.values_array(self.x)))
+
+        self.solver.on_solution(None)
+        del values[:]
+        self.solver.maximize(objective=self.x[0])
+        self.assertEqual(values, [])
+
+    def testCallbackError(self):
+        '''Exceptions in callbacks stop the solve'''
+        def fail(incumbent):
+            raise ValueError
+        self.solver.on_solution(fail)
+        self.assertRaises(ValueError, self.solver.maximize)
+        self.assertFalse(self.solver.busy)
+
+class LazyConstraintTest(unittest.TestCase):
+    def setUp(self):
+        self.solver = scip.solver()
+        self.x = self.solver.variable(scip.INTEGER, coefficient=1, upper=5)
+        self.y = self.solver.variable(scip.INTEGER, coefficient=1, upper=5)
+
+    def capacity(self, values):
+        if values[self.x.index] + values[self.y.index] > 3:
+            return [self.x + self.y <= 3]
+
+    def testLazyConstraint(self):
+        '''Adds constraints as candidates violate them'''
+        self.solver.lazy_constraints(self.capacity)
+        solution = self.solver.maximize()
+        self.assertAlmostEqual(solution.objective, 3)
+
+        self.solver.lazy_constraints(None)
+        solution = self.solver.maximize(objective=self.x + 2*self.y)
+        self.assertAlmostEqual(solution.objective, 15)
+
+    def testLazySeparate(self):
+        '''Separating callbacks run alongside ones that only check candidates'''
+        candidates = []
+        def record(values):
+            candidates.append(list(values))
+        self.solver.lazy_constraints(record)
+        self.solver.lazy_constraints(self.capacity, separate=True)
+        solution = self.solver.maximize()
+        self.assertAlmostEqual(solution.objective, 3)
+        self.assertTrue(candidates)
+
+    def testLazyPrimal(self):
+        '''Checks primal solutions against lazy constraints'''
+        self.solver.lazy_constraints(self.capacity)
+        self.assertRaises(scip.SolverError, self.solver.maximize, solution={self.x:5, self.y:5})
+
+    def testLazyErrors(self):
+        '''Raises errors from lazy constraint callbacks'''
+        self.solver.lazy_constraints(lambda values: [self.x*self.y <= 3])
+        self.assertRaises(scip.SolverError, self.solver.maximize)
+        self.assertFalse(self.solver.busy)
+
+        def fail(values):
+            raise ValueError
+        self.solver.lazy_constraints(None)
+        self.solver.lazy_constraints(fail)
+        self.assertRaises(ValueError, self.solver.maximize)
+        self.assertFalse(self.solver.busy)
+
+class SolutionArrayTest(unittest.TestCase):
+    def setUp(self):
+        self.solver = scip.solver()
+        self.x = self.solver.add_variables(4, scip.INTEGER,
+            upper = array('d', [0, 1, 2, 3]),
+            coefficient = 1
+        )
+        self.y = self.solver.variable(scip.INTEGER, upper=5, coefficient=1)
+        self.solution = self.solver.maximize()
+
+    def testValuesArray(self):
+        '''Gets values for blocks, sequences, and indices as arrays'''
+        self.assertEqual(list(self.solution.values_array(self.x)), [0, 1, 2, 3])
+        self.assertEqual(list(self.solution.values_array([self.y, self.x[1]])), [5, 1])
+        self.assertEqual(list(self.solution.values_array(array('i', [self.y.index]))), [5])
+        self.assertEqual(list(self.solution.values_array()), [0, 1, 2, 3, 5])
+        self.assertAlmostEqual(self.solution.values()[self.y], 5)
+
+    def testValuesArrayOut(self):
+        '''Writes values into caller-supplied arrays'''
+        out = array('d', [0.0]) * 4
+        self.assertIs(self.solution.values_array(self.x, out=out), out)
+        self.assertEqual(list(out), [0, 1, 2, 3])
+
+        out = array('f', [0.0]) * 4
+        self.solution.values_array(self.x, out=out)
+        self.assertEqual(list(out), [0, 1, 2, 3])
+
+        self.assertRaises(scip.SolutionError, self.solution.values_array, self.x, array('d', [0.0]))
+        self.assertRaises(scip.SolutionError, self.solution.values_array, self.x, array('i', [0]) * 4)
+
+    def testNonzeros(self):
+        '''Gets only nonzero values'''
+        indices, values = self.solution.nonzeros(self.x)
+        self.assertEqual(list(indices), [1, 2, 3])
+        self.assertEqual(list(values), [1, 2, 3])
+
+class StatisticsTest(unittest.TestCase):
+    def testStatistics(self):
+        '''Solutions carry statistics about the solve'''
+        solver = scip.solver()
+        x = solver.add_variables(10, scip.INTEGER, coefficient=array('d', range(1, 11)), upper=3)
+        solver += scip.quicksum(x) <= 7.5
+
+        solution = solver.maximize()
+        stats = solution.statistics
+        self.assertAlmostEqual(stats.primal_bound, solution.objective)
+        self.assertAlmostEqual(stats.dual_bound, solution.objective)
+        self.assertGreaterEqual(stats.time, stats.presolving_time)
+        self.assertGreaterEqual(stats.nodes, 0)
+        self.assertGreaterEqual(stats.lp_iterations, stats.root_lp_iterations)
+        self.assertTrue(stats.history)
+        self.assertAlmostEqual(stats.history[-1][1], solution.objective)
+
+        self.assertEqual(sorted(stats.heuristics), sorted(solver.heuristics))
+        self.assertEqual(sorted(stats.separators), sorted(solver.separators))
+        for s in stats.heuristics.values():
+            self.assertGreaterEqual(s.calls, 0)
+            self.assertGreaterEqual(s.time, 0.0)
+
+    def testStaleStatistics(self):
+        '''Statistics are kept once read, and unavailable after another solve if not'''
+        solver = scip.solver()
+        x = solver.add_variables(3, scip.INTEGER, coefficient=1, upper=3)
+        first = solver.maximize()
+        read = solver.maximize()
+        stats = read.statistics
+        self.assertEqual(solver.nsolves, 2)
+
+        solver.maximize(objective=x[0])
+        self.assertTrue(read.statistics is stats)
+        self.assertRaises(scip.SolutionError, lambda: first.statistics)
+
+    def testProgress(self):
+        '''Progress samples are taken during each solve'''
+        solver = scip.solver()
+        x = solver.add_variables(10, scip.INTEGER, coefficient=array('d', range(1, 11)), upper=3)
+        solver += scip.quicksum(x) <= 7.5
+
+        self.assertEqual(len(solver.progress().time), 0)
+        solver.record_progress(interval=0.0, size=4)
+        solution = solver.maximize()
+
+        p = solver.progress()
+        self.assertTrue(0 < len(p.time) <= 4)
+        self.assertEqual(len(p.time), len(p.nodes))
+        self.assertEqual(list(p.time), sorted(p.time))
+        self.assertAlmostEqual(p.primal_bound[-1], solution.objective)
+
+        solver.record_progress(size=0)
+        solver.maximize(objective=x[0])
+        self.assertEqual(len(solver.progress().gap), 0)
+
+    def testStatisticsBeforeSolving(self):
+        '''There are no statistics until the solver has solved'''
+        solver = scip.solver()
+        solver.variable()
+        self.assertRaises(scip.SolverError, solver.statistics)
+
+class CloneTest(unittest.TestCase):
+    def setUp(self):
+        self.solver = scip.solver()
+        self.x = self.solver.add_variables(3, scip.INTEGER, coefficient=array('d', [1, 2, 3]), upper=4)
+        self.y = self.solver.variable(scip.BINARY, coefficient=5, priority=3)
+        self.c = self.solver.constraint(self.x[0] + self.x[1] + self.y <= 4)
+        self.solver += self.x[1] * self.x[2] <= 6
+
+    def testCloneSolve(self):
+        '''Clones solve to the same objective'''
+        clone = self.solver.clone()
+        self.assertAlmostEqual(clone.maximize().objective, self.solver.maximize().objective)
+
+    def testCloneHandles(self):
+        '''Variables and constraints map by index'''
+        clone = self.solver.clone()
+        self.assertEqual(len(clone.variables), len(self.solver.variables))
+        self.assertEqual(len(clone.constraints), len(self.solver.constraints))
+
+        y = clone.variables[self.y.index]
+        self.assertEqual(y.index, self.y.index)
+        self.assertEqual(y.priority, 3)
+
+        c = clone.constraints[self.c.index]
+        self.assertEqual(sorted(c.terms()), sorted(self.c.terms()))
+        self.assertAlmostEqual(c.upper, 4)
+
+    def testCloneIndependent(self):
+        '''Changing a clone leaves the original alone'''
+        before = self.solver.maximize().objective
+        clone = self.solver.clone()
+        clone -= clone.constraints[self.c.index]
+        clone += clone.variables[self.x.start+2] <= 1
+
+        self.assertAlmostEqual(self.solver.maximize().objective, before)
+        self.assertNotAlmostEqual(clone.maximize().objective, before)
+
+    def testCloneRemoved(self):
+        '''Removed constraints stay removed'''
+        self.solver -= self.c
+        clone = self.solver.clone()
+        self.assertEqual(len(clone.constraints), 1)
+        self.assertRaises(KeyError, lambda: clone.constraints[self.c.index])
+        self.assertAlmostEqual(clone.maximize().objective, self.solver.maximize().objective)
+
+    def testCloneSettings(self):
+        '''Settings are copied'''
+        self.solver.heuristics['octane'].priority = 500
+        clone = self.solver.clone()
+        self.assertEqual(clone.heuristics['octane'].priority, 500)
+
+    def testThreadedClones(self):
+        '''Clones can be solved at the same time'''
+        clones = [self.solver.clone() for n in range(4)]
+        for n, clone in enumerate(clones):
+            clone += clone.variables[self.x.start] <= n
+        expected = [clone.clone().maximize().objective for clone in clones]
+
+        results = {}
+        def solve(n):
+            results[n] = clones[n].maximize().objective
+
+        threads = [threading.Thread(target=solve, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for n in range(4):
+            self.assertAlmostEqual(results[n], expected[n])
+
+class ThreadedSolverTest(unittest.TestCase):
+    def testThreadedSolves(self):
+        '''Independent solvers can be run in separate threads'''
+        results = {}
+
+        def solve(n):
+            solver = scip.solver()
+            x = solver.variable(scip.INTEGER, upper=n)
+            results[n] = solver.maximize(objective=x).objective
+
+        threads = [threading.Thread(target=solve, args=(n,)) for n in range(1, 5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for n in range(1, 5):
+            self.assertAlmostEqual(results[n], n)
+
+    def testNotBusy(self):
+        '''Solvers are only busy while solving'''
+        solver = scip.solver()
+        self.assertFalse(solver.busy)
+        solver.maximize()
+        self.assertFalse(solver.busy)
+
+@unittest.skipIf(sys.version_info < (3, 7), 'asyncio.run requires Python 3.7')
+class AsyncSolverTest(unittest.TestCase):
+    def testMaximizeAsync(self):
+        '''Coroutine solves return the usual solution instances'''
+        import asyncio
+        solver = scip.solver()
+        x = solver.variable(scip.INTEGER, upper=3)
+        solution = asyncio.run(solver.maximize_async(objective=x))
+        self.assertTrue(isinstance(solution, scip.solution))
+        self.assertAlmostEqual(solution.objective, 3)
+
+        solution = asyncio.run(solver.minimize_async(objective=x+1))
+        self.assertAlmostEqual(solution.objective, 1)
+
+    def testCancelAsync(self):
+        '''Cancelled solves leave the solver usable'''
+        import asyncio
+        solver = scip.solver()
+        x = solver.variable(scip.INTEGER, upper=3)
+
+        async def cancel():
+            task = asyncio.ensure_future(solver.maximize_async(objective=x))
+            await asyncio.sleep(0)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(cancel())
+        self.assertFalse(solver.busy)
+        self.assertAlmostEqual(solver.maximize(objective=x).objective, 3)
+
+    def testDeadlineAsync(self):
+        '''Past deadlines still return a solution'''
+        import asyncio
+        solver = scip.solver()
+        x = solver.variable(scip.INTEGER, upper=3)
+        solution = asyncio.run(solver.maximize_async(objective=x, deadline=time.time()-1))
+        self.assertTrue(isinstance(solution, scip.solution))
+        self.assertFalse(solver.busy)
+
+    def testDeadlineBeforeStart(self):
+        '''Deadlines that pass while waiting for a worker still stop the solve'''
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        solver = scip.solver()
+        x = solver.variable(scip.INTEGER, upper=3)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(time.sleep, 0.2)
+            solution = asyncio.run(solver.maximize_async(
+                objective=x, deadline=time.time()+0.05, executor=executor
+            ))
+        self.assertTrue(isinstance(solution, scip.solution))
+        self.assertFalse(solver.busy)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -1,3 +1,4 @@
+from array import array
 from zibopt import scip
 import unittest
 
@@ -34,6 +35,128 @@ class VariableTest(unittest.TestCase):
         solution = solver.minimize(objective=x)
         self.assertAlmostEqual(solution.objective, 2)
         
+class VariableBlockTest(unittest.TestCase):
+    def testAddVariables(self):
+        '''Adds a block of variables with array bounds and coefficients'''
+        solver = scip.solver()
+        x = solver.add_variables(3, scip.INTEGER,
+            coefficient = array('d', [1, 2, 3]),
+            upper = array('d', [1, 2, 3])
+        )
+        self.assertEqual(len(x), 3)
+        self.assertEqual([v.index for v in x], [x.start, x.start+1, x.start+2])
+        self.assertIs(x[0], x[-3])
+
+        solution = solver.maximize()
+        self.assertAlmostEqual(solution.objective, 14)
+        self.assertAlmostEqual(solution[x[2]], 3)
+
+    def testVariableBlockObjective(self):
+        '''Block variables not in an objective get a coefficient of zero'''
+        solver = scip.solver()
+        x = solver.add_variables(2, coefficient=1, upper=1)
+        solution = solver.maximize(objective=x[1])
+        self.assertAlmostEqual(solution.objective, 1)
+
+    def testVariableBlockErrors(self):
+        '''Mismatched array lengths and bad indices raise errors'''
+        solver = scip.solver()
+        self.assertRaises(scip.VariableError, solver.add_variables, 2,
+            coefficient=array('d', [1, 2, 3]))
+        self.assertRaises(scip.VariableError, solver.add_variables, -1)
+        x = solver.add_variables(2)
+        self.assertRaises(IndexError, x.__getitem__, 2)
+
+class VariableIndexTest(unittest.TestCase):
+    def testPositionalAccess(self):
+        '''Variables are indexed in order of creation, including blocks'''
+        solver = scip.solver()
+        x1 = solver.variable()
+        x = solver.add_variables(3)
+        x2 = solver.variable()
+
+        self.assertEqual(len(solver.variables), 5)
+        self.assertIs(solver.variables[0], x1)
+        self.assertIs(solver.variables[2], x[1])
+        self.assertIs(solver.variables[-1], x2)
+        self.assertEqual([v.index for v in solver.variables], list(range(5)))
+        self.assertRaises(IndexError, solver.variables.__getitem__, 5)
+
+    def testMembership(self):
+        '''Membership depends on the solver a variable belongs to'''
+        solver1 = scip.solver()
+        solver2 = scip.solver()
+        x1 = solver1.variable()
+        x2 = solver2.variable()
+        self.assertIn(x1, solver1.variables)
+        self.assertNotIn(x2, solver1.variables)
+        self.assertNotIn(5, solver1.variables)
+
+    def testConstraintOrder(self):
+        '''Constraints iterate in order of creation, skipping removed ones'''
+        solver = scip.solver()
+        x1 = solver.variable()
+        c = [solver.constraint(x1 <= i) for i in range(1, 5)]
+        solver -= c[1]
+        self.assertEqual(list(solver.constraints), [c[0], c[2], c[3]])
+        self.assertEqual([k.index for k in c], [0, 1, 2, 3])
+        self.assertIs(solver.constraints[2], c[2])
+        self.assertRaises(KeyError, solver.constraints.__getitem__, 1)
+
+        solver += c[1]
+        self.assertEqual(list(solver.constraints), c)
+
+class SetBoundsTest(unittest.TestCase):
+    def setUp(self):
+        self.solver = scip.solver()
+        self.x = self.solver.add_variables(4, scip.INTEGER, coefficient=1, upper=10)
+
+    def testBlockBounds(self):
+        '''Sets the same bound on a whole block'''
+        self.assertEqual(self.solver.set_bounds(self.x, upper=3), 4)
+        self.assertAlmostEqual(self.solver.maximize().objective, 12)
+
+    def testArrayBounds(self):
+        '''Sets bounds from arrays, leaving NaN elements alone'''
+        nan = float('nan')
+        changed = self.solver.set_bounds(
+            array('l', [self.x.start+1, self.x.start+3]),
+            array('d', [2, nan]),
+            array('d', [2, 5])
+        )
+        self.assertEqual(changed, 2)
+        solution = self.solver.maximize()
+        self.assertAlmostEqual(solution.objective, 30)
+        self.assertAlmostEqual(solution[self.x[1]], 2)
+        self.assertAlmostEqual(self.solver.minimize().objective, 2)
+
+    def testRelaxAfterSolve(self):
+        '''Bounds can be relaxed after solving'''
+        self.solver.set_bounds(self.x, upper=1)
+        self.assertAlmostEqual(self.solver.maximize().objective, 4)
+        self.solver.set_bounds(list(self.x), upper=2)
+        self.assertAlmostEqual(self.solver.maximize().objective, 8)
+
+    def testCrossedBounds(self):
+        '''Changes nothing if a lower bound would be above its upper bound'''
+        self.assertRaises(
+            scip.SolverError, self.solver.set_bounds, self.x, 
+            array('d', [1, 1, 20, 1])
+        )
+        self.assertAlmostEqual(self.solver.minimize().objective, 0)
+
+    def testSingleVariableConstraint(self):
+        '''Constraints on one variable become bounds'''
+        self.solver += 2*self.x[0] <= 5
+        self.solver += -3 <= -self.x[1]
+        self.assertEqual(len(self.solver.constraints), 0)
+        self.assertAlmostEqual(self.solver.maximize(objective=self.x[0]).objective, 2)
+
+        # x[1] >= 5 conflicts with x[1] <= 3, so it stays a constraint
+        self.solver += self.x[1] >= 5
+        self.assertEqual(len(self.solver.constraints), 1)
+        self.assertFalse(self.solver.maximize())
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,55 @@
+'''
+Coroutine support for solving from inside an asyncio event loop.  This
+is what backs solver.maximize_async and solver.minimize_async.  It is
+kept out of _solver.py since it requires Python 3.5 or later.
+'''
+
+import asyncio
+import time
+
+__all__ = 'optimize_async',
+
+async def optimize_async(solver, optimize, *args, deadline=None, executor=None, **kwds):
+    '''
+    Runs optimize(*args, **kwds) in a worker thread and returns its
+    solution.  If the task is cancelled, the solve is interrupted and
+    allowed to wind down before the cancellation is passed on.
+    '''
+    loop = asyncio.get_event_loop()
+
+    def run():
+        # Time spent waiting for a worker counts against the deadline
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.time())
+            kwds['time'] = min(kwds.get('time', remaining), remaining)
+        return optimize(*args, **kwds)
+
+    future = loop.run_in_executor(executor, run)
+
+    # SCIP's time limit may not be measured in wall-clock time, so make
+    # sure the solve actually stops once the deadline passes.  As with
+    # cancellation, the interrupt is lost if SCIP hasn't started yet.
+    timer = None
+    def expire():
+        nonlocal timer
+        if not future.done() and not solver.interrupt():
+            timer = loop.call_later(0.01, expire)
+
+    if deadline is not None:
+        timer = loop.call_later(max(0.0, deadline - time.time()), expire)
+
+    try:
+        return await asyncio.shield(future)
+
+    except asyncio.CancelledError:
+        # The interrupt is lost if SCIP hasn't started solving yet, so
+        # keep at it until the worker returns and the solver is free.
+        while not future.done():
+            solver.interrupt()
+            await asyncio.wait([future], timeout=0.01)
+        future.exception() # nobody else is going to look at this
+        raise
+
+    finally:
+        if timer is not None:
+            timer.cancel()
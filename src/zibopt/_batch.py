@@ -0,0 +1,170 @@
+'''
+Solving many small, independent models on a pool of worker processes.
+Models are plain data so they can be pickled and sent to workers.  Each
+model is a dictionary with these keys, all of them optional:
+
+    - variables:   list of dicts of keyword arguments to solver.variable,
+      like {'vartype': scip.INTEGER, 'upper': 3, 'coefficient': 2}.
+      Variables are referred to elsewhere by their position in this list.
+    - constraints: list of dicts with keys 'linear', a list of
+      (variable, coefficient) pairs, 'bilinear', a list of (variable,
+      variable, coefficient) triples, and bounds 'lower' and/or 'upper'.
+    - objective:   dict with 'linear' and 'bilinear' terms as above and a
+      'constant'.  If not given, variable coefficients are used.
+    - sense:       'max' or 'min' (default)
+    - limits:      dict of keyword arguments to solver.maximize/minimize,
+      such as {'time': 10, 'gap': 0.01}
+
+For instance, a tiny knapsack problem looks like::
+
+    model = {
+        'sense': 'max',
+        'variables': [
+            {'vartype': scip.BINARY, 'coefficient': 5},
+            {'vartype': scip.BINARY, 'coefficient': 4}
+        ],
+        'constraints': [{'linear': [(0, 3), (1, 2)], 'upper': 4}]
+    }
+
+    for result in scip.batch_solve([model] * 1000, workers=4):
+        print(result.index, result.status, result.objective)
+'''
+
+from array import array
+from collections import namedtuple
+from algebraic.expression import expression
+
+__all__ = 'batch_solve', 'batch_result'
+
+batch_result = namedtuple('batch_result', 'index status objective values error')
+batch_result.__doc__ = '''
+Compact solution record from batch_solve.  Fields:
+
+    - index:     position of the model in the input sequence
+    - status:    'optimal', 'infeasible', 'unbounded', 'inforunbd',
+      'stopped' if solving ended at a limit, or 'error' if building or
+      solving the model raised an exception
+    - objective: objective value
+    - values:    array('d') of variable values, in model order, or None
+      if there is no solution
+    - error:     error message if status is 'error', otherwise None
+'''
+
+def _expression(variables, terms):
+    # Algebraic expression for the linear and bilinear parts of a row
+    e = {}
+    for i, c in terms.get('linear', ()):
+        e[(variables[i],)] = e.get((variables[i],), 0.0) + c
+    for i, j, c in terms.get('bilinear', ()):
+        key = (variables[i], variables[j])
+        e[key] = e.get(key, 0.0) + c
+    if terms.get('constant'):
+        e[()] = terms['constant']
+    return expression(e)
+
+def _status(solution):
+    # Status string for a solution, as in batch_result
+    for status in ('optimal', 'infeasible', 'unbounded', 'inforunbd'):
+        if getattr(solution, status):
+            return status
+    return 'stopped'
+
+def _solve(index, model):
+    # Builds and solves a single model description
+    from zibopt._solver import solver as scip_solver
+
+    solver = scip_solver()
+    variables = [solver.variable(**v) for v in model.get('variables', ())]
+
+    # Linear rows go to SCIP in a single block.  Rows with bilinear terms
+    # have to be built up algebraically.
+    inf = float('inf')
+    indptr, indices, data = array('l', [0]), array('l'), array('d')
+    lower, upper = array('d'), array('d')
+
+    for row in model.get('constraints', ()):
+        lo, hi = row.get('lower'), row.get('upper')
+        if row.get('bilinear'):
+            expr = _expression(variables, row)
+            if lo is not None and hi is not None:
+                solver += lo <= expr <= hi
+            elif lo is not None:
+                solver += expr >= lo
+            else:
+                solver += expr <= hi
+
+        else:
+            for i, c in row.get('linear', ()):
+                indices.append(variables[i].index)
+                data.append(c)
+            indptr.append(len(indices))
+            lower.append(-inf if lo is None else lo)
+            upper.append(inf if hi is None else hi)
+
+    if len(indptr) > 1:
+        solver.add_constraints_csr(indptr, indices, data, lower, upper)
+
+    kwds = dict(model.get('limits', {}))
+    if 'objective' in model:
+        kwds['objective'] = _expression(variables, model['objective'])
+
+    if model.get('sense', 'min') == 'max':
+        solution = solver.maximize(**kwds)
+    else:
+        solution = solver.minimize(**kwds)
+
+    # Only the model's own variables, not any the objective needed
+    values = solution.values_array(variables) if solution else None
+    return batch_result(index, _status(solution), solution.objective, values, None)
+
+def _solve_chunk(chunk):
+    # A bad model gets an error record instead of losing the whole chunk
+    results = []
+    for index, model in chunk:
+        try:
+            results.append(_solve(index, model))
+        except Exception as e:
+            message = '%s: %s' % (type(e).__name__, e)
+            results.append(batch_result(index, 'error', None, None, message))
+    return results
+
+def batch_solve(models, workers=None, chunksize=1, executor=None):
+    '''
+    Solves independent models in worker processes and yields a
+    batch_result for each one, in the order they finish.  A model that
+    can't be built or solved gets a record with status 'error' and the
+    rest of the batch carries on.  Parameters:
+
+        - models:         iterable of model dictionaries (see above)
+        - workers=None:   number of worker processes.  Defaults to the
+          number of CPUs.
+        - chunksize=1:    number of models sent to a worker at a time.
+          Larger chunks cut down on overhead for very small models.
+        - executor=None:  concurrent.futures executor to use instead of
+          starting a new process pool.  Passing the same executor to
+          several calls keeps the worker processes warm between them.
+    '''
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        futures = []
+        chunk = []
+        for index, model in enumerate(models):
+            chunk.append((index, model))
+            if len(chunk) >= chunksize:
+                futures.append(executor.submit(_solve_chunk, chunk))
+                chunk = []
+        if chunk:
+            futures.append(executor.submit(_solve_chunk, chunk))
+
+        for future in as_completed(futures):
+            for result in future.result():
+                yield result
+
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
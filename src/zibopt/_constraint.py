@@ -1,11 +1,96 @@
 from algebraic import expression
 from zibopt import _cons
+from zibopt._linexpr import linexpr
 from zibopt._variable import variable
+import weakref
 
-__all__ = 'constraint', 'ConstraintError'
+__all__ = 'constraint', 'constraint_block', 'ConstraintError'
 
 ConstraintError = _cons.error
 
+def _normalize(expr):
+    '''
+    Moves every term of a bounded expression to the middle, and returns
+    (expression, lower, upper), with numbers or None for bounds
+    '''
+    expr_lower = expr_upper = None
+
+    # Make sure we are in the middle if there are two bounds
+    if expr.expr_lower is None and expr.expr_upper and expr.expr_upper.expr_upper:
+        expr = expr.expr_upper
+    elif expr.expr_upper is None and expr.expr_lower and expr.expr_lower.expr_lower:
+        expr = expr.expr_lower
+
+    # Cancel out terms from lhs/rhs and keep constants
+    if expr.expr_lower and expr.expr_upper is expr.expr_lower:
+        # Special case where x == y.  This keeps from double-counting
+        # one side of the constraint.
+        expr = expr - expr.expr_lower
+        expr_lower = expr_upper = -expr.terms.pop((), 0.0)
+        expr.expr_lower = expr_lower
+        expr.expr_upper = expr_upper
+
+    else:
+        # Logic for constraints constructed via <= and >=
+        if expr.expr_lower:
+            e = expr - expr.expr_lower
+            e.expr_lower = expr.expr_lower
+            e.expr_upper = expr.expr_upper
+            expr = e
+            expr_lower = -expr.terms.pop((), 0.0) # just the constant
+
+        if expr.expr_upper:
+            e = expr - expr.expr_upper
+            e.expr_lower = expr.expr_lower
+            e.expr_upper = expr.expr_upper
+            expr = e
+            expr_upper = -expr.terms.pop((), 0.0) # just the constant
+
+    return expr, expr_lower, expr_upper
+
+def _one_variable(expr):
+    '''
+    Checks whether a bounded expression and its bounds mention no more
+    than one variable between them, without building any new expressions
+    '''
+    found = set()
+    seen = set()
+    pending = [expr]
+    while pending:
+        e = pending.pop()
+        if not isinstance(e, expression) or id(e) in seen:
+            continue
+        seen.add(id(e))
+        for term in e.terms:
+            found.update(term)
+            if len(found) > 1:
+                return False
+        pending.append(e.expr_lower)
+        pending.append(e.expr_upper)
+    return True
+
+def _single_bound(expr):
+    '''
+    Returns (variable, lower, upper) if a bounded expression only bounds
+    a single variable, like 2 <= 3*x <= 9, or None if it doesn't.  
+    Bounds are None where there aren't any.
+    '''
+    if not isinstance(expr, expression) or not _one_variable(expr):
+        return None
+    expr, expr_lower, expr_upper = _normalize(expr)
+    if len(expr.terms) != 1 or (expr_lower is None and expr_upper is None):
+        return None
+
+    (term, coef), = expr.terms.items()
+    if len(term) != 1 or not coef:
+        return None
+
+    lower = None if expr_lower is None else float(expr_lower) / coef
+    upper = None if expr_upper is None else float(expr_upper) / coef
+    if coef < 0:
+        lower, upper = upper, lower
+    return term[0], lower, upper
+
 class constraint(_cons.constraint):
     '''
     Stores bounds and coefficients for problem formulations.  Valid
@@ -14,40 +99,21 @@ class constraint(_cons.constraint):
         solver += 4 * (x + y) * (x + z) <= 10
         solver += 3*x**2 - 4*x >= 5*y
         solver += 3 <= 4*y <= 5
-    '''
-    def __init__(self, solver, expr):
-        expr_lower = expr_upper = None
 
-        # Make sure we are in the middle if there are two bounds
-        if expr.expr_lower is None and expr.expr_upper and expr.expr_upper.expr_upper:
-            expr = expr.expr_upper
-        elif expr.expr_upper is None and expr.expr_lower and expr.expr_lower.expr_lower:
-            expr = expr.expr_lower
-
-        # Cancel out terms from lhs/rhs and keep constants
-        if expr.expr_lower and expr.expr_upper is expr.expr_lower:
-            # Special case where x == y.  This keeps from double-counting
-            # one side of the constraint.
-            expr = expr - expr.expr_lower
-            expr_lower = expr_upper = -expr.terms.pop((), 0.0)
-            expr.expr_lower = expr_lower
-            expr.expr_upper = expr_upper
+    Constraints keep a copy of their coefficients, as a dictionary of 
+    terms like expression.terms.  Constraints built from a linexpr, or for
+    solvers created with lean=True, don't.  Their constraint.coefficients 
+    reads the terms back out of SCIP instead when it is accessed.
 
-        else:
-            # Logic for constraints constructed via <= and >=
-            if expr.expr_lower:
-                e = expr - expr.expr_lower
-                e.expr_lower = expr.expr_lower
-                e.expr_upper = expr.expr_upper
-                expr = e
-                expr_lower = -expr.terms.pop((), 0.0) # just the constant
-    
-            if expr.expr_upper:
-                e = expr - expr.expr_upper
-                e.expr_lower = expr.expr_lower
-                e.expr_upper = expr.expr_upper
-                expr = e
-                expr_upper = -expr.terms.pop((), 0.0) # just the constant
+    Each constraint has an index, which is its position in the order 
+    constraints were created for the solver.
+    '''
+    def __init__(self, solver, expr, lean=False):
+        if isinstance(expr, linexpr):
+            self._init_linexpr(solver, expr)
+            return
+
+        expr, expr_lower, expr_upper = _normalize(expr)
 
         # Make sure we have at least one bound
         if expr_lower is None and expr_upper is None:
@@ -106,5 +172,86 @@ class constraint(_cons.constraint):
         # Keep this information so we can look it up later
         self.lower = expr_lower
         self.upper = expr_upper
-        self.coefficients = expr.terms.copy()
+        if lean:
+            self._coefficients = None
+            self._solver = weakref.ref(solver)
+        else:
+            self._coefficients = expr.terms.copy()
 
+    def _init_linexpr(self, solver, expr):
+        '''Passes the arrays in a linexpr straight through to SCIP'''
+        expr_lower = expr_upper = None
+        if expr.expr_lower is not None:
+            expr_lower = expr.expr_lower - expr.constant
+        if expr.expr_upper is not None:
+            expr_upper = expr.expr_upper - expr.constant
+
+        if expr_lower is None and expr_upper is None:
+            raise ConstraintError('at least one bound is required')
+        if expr_upper is not None and expr_lower is not None and expr_upper < expr_lower:
+            raise ConstraintError('invalid constraint: expr_upper < expr_lower')
+
+        self._init_arrays(
+            solver, expr.indices, expr.coefficients, [], [], [], expr_lower, expr_upper
+        )
+
+        # The linexpr can be reused once its bounds are cleared off
+        expr.expr_lower = expr.expr_upper = None
+
+    def _init_arrays(self, solver, indices, coefficients, bilin_var1,
+        bilin_var2, bilin_coef, lower=None, upper=None):
+        '''
+        Creates the constraint from an array of linear variable indices, 
+        an array of their coefficients, and lists of bilinear terms.  There
+        are no variable objects for the linear terms, so coefficients come
+        from SCIP.
+        '''
+        kwds = {}
+        if lower is not None:
+            kwds['lower'] = lower
+        if upper is not None:
+            kwds['upper'] = upper
+
+        super(constraint, self).__init__(
+            solver, indices, coefficients, bilin_var1, bilin_var2, bilin_coef, **kwds
+        )
+
+        self.lower = lower
+        self.upper = upper
+        self._coefficients = None
+        self._solver = weakref.ref(solver)
+
+    @classmethod
+    def _from_solver(cls, solver, i):
+        '''Builds the object for constraint i, if it came from a file'''
+        c = cls.__new__(cls)
+        c.lower, c.upper = solver.assign_constraint(c, i)
+        c._coefficients = None
+        c._solver = weakref.ref(solver)
+        return c
+
+    @property
+    def coefficients(self):
+        if self._coefficients is not None:
+            return self._coefficients
+
+        solver = self._solver()
+        if solver is None:
+            raise ConstraintError('solver no longer exists')
+
+        variables = solver.variables
+        terms = {}
+        for indices, coef in self.terms():
+            term = tuple(variables[i] for i in indices)
+            terms[term] = terms.get(term, 0.0) + coef
+        return expression(terms).terms
+
+
+class constraint_block(_cons.constraint_block):
+    '''
+    A block of linear constraints created in a single call by
+    solver.add_constraints_csr(...).  The rows are handed straight to SCIP
+    without building expressions or constraint objects for them.
+    '''
+    def __len__(self):
+        return self.size
@@ -0,0 +1,117 @@
+'''
+Collections of variables and constraints stored by their solver index.
+Variables and constraints are numbered densely in the order they are
+created, so a list with one slot per index gives ordered iteration,
+positional access, and membership tests that don't depend on hashing.
+'''
+
+try:
+    from collections.abc import MutableSet
+except ImportError:
+    from collections import MutableSet
+
+__all__ = 'indexed_set', 'lazy_range'
+
+class lazy_range(object):
+    '''
+    Members start through start+size-1 of an indexed_set, such as 
+    variables and constraints read from a file, whose Python objects are 
+    built by build(index) when they are first accessed.
+    '''
+    def __init__(self, start, size, build):
+        self.start = start
+        self.size = size
+        self.build = build
+
+    def _build(self, i):
+        return self.build(self.start + i)
+
+class _unbuilt(object):
+    '''Placeholder for the members of a block that aren't built yet'''
+    __slots__ = 'block',
+
+    def __init__(self, block):
+        self.block = block
+
+class indexed_set(MutableSet):
+    '''
+    Set of objects with an index attribute, such as constraints.  Behaves
+    like a regular set, except that iteration is in order of index and
+    s[i] returns the member with index i.
+
+    Whole blocks of members can be added with s.add_block(block), where
+    block has start and size attributes.  Their objects are only built, 
+    by block._build(i - block.start), once they are accessed.  This is 
+    how variables in a variable_block are members from the start.
+    '''
+    def __init__(self, items=()):
+        self._items = []
+        self._len = 0
+        self.update(items)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for i, item in enumerate(self._items):
+            if type(item) is _unbuilt:
+                yield self[i]
+            elif item is not None:
+                yield item
+
+    def __contains__(self, item):
+        i = getattr(item, 'index', None)
+        return isinstance(i, int) and 0 <= i < len(self._items) and self._items[i] is item
+
+    def __getitem__(self, i):
+        item = self._items[i]
+        if item is None:
+            raise KeyError(i)
+        if type(item) is _unbuilt:
+            if i < 0:
+                i += len(self._items)
+            block = item.block
+            item = self._items[i] = block._build(i - block.start)
+        return item
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, list(self))
+
+    def add(self, item):
+        i = item.index
+        if i >= len(self._items):
+            self._items.extend([None] * (i + 1 - len(self._items)))
+        if self._items[i] is not item:
+            if self._items[i] is None:
+                self._len += 1
+            self._items[i] = item
+
+    def add_block(self, block):
+        '''Adds all the members of a block, after any existing ones'''
+        self._items.extend([None] * (block.start - len(self._items)))
+        self._items.extend([_unbuilt(block)] * block.size)
+        self._len += block.size
+
+    def lazy_copy(self, build):
+        '''
+        Returns a set with members at the same indices, whose objects are
+        built by build(index) when they are first accessed
+        '''
+        other = type(self)()
+        block = _unbuilt(lazy_range(0, len(self._items), build))
+        other._items = [None if item is None else block for item in self._items]
+        other._len = self._len
+        return other
+
+    def discard(self, item):
+        if item in self:
+            self._items[item.index] = None
+            self._len -= 1
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def difference_update(self, items):
+        for item in items:
+            self.discard(item)
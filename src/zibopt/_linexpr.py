@@ -0,0 +1,183 @@
+'''
+Building long linear expressions.  Adding up variables with sum(...) or +
+creates a new python-algebraic expression and copies all of its terms at
+every step, so building a row of n terms takes O(n**2) time.  A linexpr
+accumulates terms in place in arrays of variable indices and coefficients
+instead, and the solver hands those arrays straight to SCIP::
+
+    solver += scip.quicksum(arcs[i][j] for j in range(i)) == 2
+
+    row = scip.linexpr(x, weights)  # x is a variable_block
+    row += 2*y
+    solver += row <= capacity
+'''
+
+from algebraic.expression import expression
+from array import array
+from zibopt import _scip
+from zibopt._variable import variable, variable_block
+
+__all__ = 'linexpr', 'quicksum'
+
+SolverError = _scip.error
+
+class linexpr(object):
+    '''
+    A linear expression stored as arrays.  Parameters:
+
+        - variables=():      variable_block or iterable of variables
+        - coefficients=None: their coefficients.  Can be a single number
+          or an iterable.  Defaults to 1 for each variable.
+        - constant=0.0:      constant term
+
+    Terms are added in place with +=, -=, and linexpr.add(...).  Variables,
+    numbers, linear algebraic expressions, and other linexprs can all be
+    added.  Bounds are set with <=, >=, and == against numbers, which
+    makes a linexpr usable with solver += ... and solver.constraint(...).
+    It can also be used as an objective function.  Repeated variables are
+    allowed and their coefficients add up.
+    '''
+    def __init__(self, variables=(), coefficients=None, constant=0.0):
+        self.indices = array('l')
+        self.coefficients = array('d')
+        self.constant = float(constant)
+        self.expr_lower = None
+        self.expr_upper = None
+        self.add(variables, coefficients)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def add(self, variables, coefficients=None):
+        '''
+        Adds terms for each of a sequence of variables, and returns the
+        linexpr.  Parameters:
+
+            - variables:         variable_block or iterable of variables
+            - coefficients=None: their coefficients, as a single number or
+              an iterable.  Defaults to 1 for each variable.
+        '''
+        start = len(self.indices)
+        if isinstance(variables, variable_block):
+            # No need to build variable objects
+            self.indices.extend(range(variables.start, variables.start + variables.size))
+        else:
+            try:
+                self.indices.extend(v.index for v in variables)
+            except AttributeError:
+                del self.indices[start:]
+                raise SolverError('linexpr terms must be solver variables')
+
+        n = len(self.indices) - start
+        if coefficients is None:
+            coefficients = 1.0
+        if isinstance(coefficients, (int, float)):
+            self.coefficients.extend(array('d', [coefficients]) * n)
+        else:
+            self.coefficients.extend(coefficients)
+
+        if len(self.coefficients) != len(self.indices):
+            del self.indices[start:]
+            del self.coefficients[start:]
+            raise SolverError('variables and coefficients must be the same length')
+
+        return self
+
+    def copy(self):
+        '''Returns a copy of the linexpr, without bounds'''
+        other = linexpr(constant=self.constant)
+        other.indices.extend(self.indices)
+        other.coefficients.extend(self.coefficients)
+        return other
+
+    def __iadd__(self, other):
+        if isinstance(other, variable):
+            self.indices.append(other.index)
+            self.coefficients.append(1.0)
+
+        elif isinstance(other, linexpr):
+            self.indices.extend(other.indices)
+            self.coefficients.extend(other.coefficients)
+            self.constant += other.constant
+
+        elif isinstance(other, expression):
+            for term, coef in other.terms.items():
+                if not term:
+                    self.constant += coef
+                elif len(term) == 1:
+                    self.indices.append(term[0].index)
+                    self.coefficients.append(coef)
+                else:
+                    raise SolverError('linexpr terms must be linear')
+
+        elif isinstance(other, (int, float)):
+            self.constant += other
+
+        else:
+            return NotImplemented
+
+        return self
+
+    def __isub__(self, other):
+        if isinstance(other, (int, float)):
+            self.constant -= other
+            return self
+        return self.__iadd__(-1.0 * other)
+
+    def __add__(self, other):
+        return self.copy().__iadd__(other)
+
+    def __sub__(self, other):
+        return self.copy().__isub__(other)
+
+    def __neg__(self):
+        return self * -1.0
+
+    def __mul__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        other = float(other)
+        result = linexpr(constant=self.constant * other)
+        result.indices.extend(self.indices)
+        result.coefficients.extend(c * other for c in self.coefficients)
+        return result
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def __rsub__(self, other):
+        return (-self).__iadd__(other)
+
+    # These set bounds, same as for algebraic expressions
+    def __le__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        self.expr_upper = other
+        return self
+
+    def __ge__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        self.expr_lower = other
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        self.expr_lower = self.expr_upper = other
+        return self
+
+    __hash__ = None
+
+def quicksum(terms):
+    '''
+    Adds up an iterable of variables, numbers, and linear expressions into
+    a linexpr.  This is a drop-in replacement for sum(...) that takes time
+    proportional to the number of terms::
+
+        solver += scip.quicksum(c[j] * x[j] for j in range(n)) <= 10
+    '''
+    result = linexpr()
+    for term in terms:
+        result += term
+    return result
@@ -0,0 +1,146 @@
+'''
+Solving pure linear programs straight through SCIP's LP interface.  A
+model with no integer variables doesn't need presolving, branch and bound,
+or any of the plugins a solver sets up, so scip.lp hands its rows and
+columns to the underlying LP solver and nothing else::
+
+    model = scip.lp('max')
+    x = model.add_columns(3, objective=array('d', [3, 2, 4]), upper=10)
+    model.add_rows(
+        array('i', [0, 3, 5]),
+        array('i', [x, x+1, x+2, x, x+2]),
+        array('d', [1, 1, 2, 1, 1]),
+        upper = array('d', [4, 5])
+    )
+    solution = model.solve()
+    print(solution.status, solution.objective, list(solution.values))
+
+The LP keeps its basis between solves, so changing a few bounds, sides,
+or objective coefficients and solving again starts from where the last
+solve ended instead of from scratch.  A basis can also be saved with
+model.basis() and given back later with model.set_basis(...) or
+model.solve(basis=...).
+'''
+
+from array import array
+from collections import namedtuple
+from zibopt import _lp
+
+__all__ = 'lp', 'lp_solution', 'lp_basis', 'LPError'
+
+LPError = _lp.error
+
+lp_solution = namedtuple('lp_solution', 'status objective values duals reduced_costs iterations')
+lp_solution.__doc__ = '''
+Result of lp.solve().  Fields:
+
+    - status:        'optimal', 'infeasible', 'unbounded', 'inforunbd', or
+      'stopped' if the LP solver hit one of its limits
+    - objective:     objective value
+    - values:        array('d') of column values
+    - duals:         array('d') of row dual values
+    - reduced_costs: array('d') of column reduced costs
+    - iterations:    number of simplex iterations
+'''
+
+lp_basis = namedtuple('lp_basis', 'columns rows')
+lp_basis.__doc__ = '''
+Basis of an LP, as given by lp.basis().  Fields are array('i') of basis
+statuses for each column and row, which are lp.LOWER, lp.BASIC, lp.UPPER,
+or lp.ZERO for free columns that aren't basic.
+'''
+
+class lp(_lp.lp):
+    '''
+    A linear program without integer variables.  Parameters:
+
+        - sense='min': 'max' or 'min'
+
+    Columns and rows are numbered in order of creation.  Column bounds
+    default to [0, inf].  Infinite bounds can be given as float('inf').
+    '''
+    LOWER = _lp.LOWER
+    BASIC = _lp.BASIC
+    UPPER = _lp.UPPER
+    ZERO  = _lp.ZERO
+
+    def __init__(self, sense='min'):
+        if sense not in ('max', 'min'):
+            raise LPError("sense must be 'max' or 'min'")
+        super(lp, self).__init__(_lp.MAXIMIZE if sense == 'max' else _lp.MINIMIZE)
+
+    def add_columns(self, n, objective=0.0, lower=0.0, upper=None):
+        '''
+        Adds n columns and returns the index of the first one.  Their
+        objective coefficients and bounds can be single numbers or arrays
+        of n numbers.  Parameters:
+
+            - n:             number of columns
+            - objective=0.0: objective coefficients
+            - lower=0.0:     lower bounds
+            - upper=None:    upper bounds.  Defaults to infinity.
+        '''
+        return super(lp, self).add_columns(n, objective, lower, upper)
+
+    def add_rows(self, indptr, indices, data, lower=None, upper=None):
+        '''
+        Adds rows in compressed sparse row format, the same as
+        solver.add_constraints_csr, and returns the index of the first
+        one.  Row r has coefficients data[indptr[r]:indptr[r+1]] for the
+        columns in indices[indptr[r]:indptr[r+1]].  Bounds are single
+        numbers or arrays with one element per row, and at least one of
+        them is required.
+        '''
+        return super(lp, self).add_rows(indptr, indices, data, lower, upper)
+
+    def change_bounds(self, columns, lower=None, upper=None):
+        '''
+        Changes bounds on an integer array of columns.  Bounds are single
+        numbers or arrays.  None leaves those bounds alone, and so do NaN
+        elements of an array.
+        '''
+        super(lp, self).change_bounds(columns, lower, upper)
+
+    def change_sides(self, rows, lower=None, upper=None):
+        '''Changes bounds on an integer array of rows, like change_bounds'''
+        super(lp, self).change_sides(rows, lower, upper)
+
+    def change_objective(self, columns, objective):
+        '''
+        Changes objective coefficients on an integer array of columns.  The
+        coefficients are a single number or an array.
+        '''
+        super(lp, self).change_objective(columns, objective)
+
+    def basis(self):
+        '''Returns the current basis as an lp_basis'''
+        columns = array('i', [0]) * self.ncols
+        rows = array('i', [0]) * self.nrows
+        self.fill_basis(columns, rows)
+        return lp_basis(columns, rows)
+
+    def set_basis(self, basis):
+        '''Sets the basis the next solve starts from, from an lp_basis'''
+        super(lp, self).set_basis(basis.columns, basis.rows)
+
+    def solve(self, method='dual', basis=None):
+        '''
+        Solves the LP and returns an lp_solution.  The GIL is released
+        while the LP solver works, so different LPs can be solved in
+        separate threads.  Parameters:
+
+            - method='dual': 'primal' or 'dual' simplex, or 'barrier'.
+              The dual simplex is usually fastest after changing bounds
+              or adding rows, and the primal after changing objectives.
+            - basis=None:    lp_basis to start from.  Defaults to the
+              basis the last solve ended with.
+        '''
+        if basis is not None:
+            self.set_basis(basis)
+        status = self.optimize(method)
+
+        values = array('d', [0.0]) * self.ncols
+        duals = array('d', [0.0]) * self.nrows
+        reduced_costs = array('d', [0.0]) * self.ncols
+        objective = self.fill_solution(values, duals, reduced_costs)
+        return lp_solution(status, objective, values, duals, reduced_costs, self.iterations)
@@ -0,0 +1,189 @@
+'''
+Reading model files written by solver.save(path).  A model file stores a
+problem as flat columns of 8-byte numbers, so it can be mapped into memory
+and handed to SCIP without parsing anything.  All numbers are in native
+byte order.  The file starts with a 48-byte header:
+
+    - magic:   the 8 bytes 'ZIBMODEL'
+    - version: int64, currently 1
+    - nvars:   int64 number of variables
+    - ncons:   int64 number of constraints
+    - nnz:     int64 number of linear terms in all constraints
+    - nbilin:  int64 number of bilinear terms in all constraints
+
+This is followed by these columns, one after another:
+
+    - vartype[nvars]:     int64 variable types, like scip.BINARY
+    - priority[nvars]:    int64 branching priorities
+    - lower[nvars]:       double lower bounds on variables
+    - upper[nvars]:       double upper bounds on variables
+    - coefficient[nvars]: double objective coefficients
+    - cons_lower[ncons]:  double lower bounds on constraints
+    - cons_upper[ncons]:  double upper bounds on constraints
+    - indptr[ncons+1]:    int64 CSR row offsets for linear terms
+    - indices[nnz]:       int64 variable indices of linear terms
+    - data[nnz]:          double coefficients of linear terms
+    - bilinptr[ncons+1]:  int64 row offsets for bilinear terms
+    - var1[nbilin]:       int64 index of the first variable in each term
+    - var2[nbilin]:       int64 index of the second variable in each term
+    - coef[nbilin]:       double coefficients of bilinear terms
+
+Infinite bounds are stored as IEEE infinities.  A square term like 3*x**2
+is a bilinear term with var1 == var2.
+'''
+
+from array import array
+from zibopt import _scip
+from zibopt._constraint import constraint
+import mmap, struct
+
+__all__ = 'load_model',
+
+SolverError = _scip.error
+
+MAGIC   = b'ZIBMODEL'
+VERSION = 1
+
+_header = struct.Struct('=8s5q')
+
+# Columns in file order, as (name, typecode, header field with the length)
+_columns = (
+    ('vartype',     'q', 'nvars'),
+    ('priority',    'q', 'nvars'),
+    ('lower',       'd', 'nvars'),
+    ('upper',       'd', 'nvars'),
+    ('coefficient', 'd', 'nvars'),
+    ('cons_lower',  'd', 'ncons'),
+    ('cons_upper',  'd', 'ncons'),
+    ('indptr',      'q', 'nrows'),
+    ('indices',     'q', 'nnz'),
+    ('data',        'd', 'nnz'),
+    ('bilinptr',    'q', 'nrows'),
+    ('var1',        'q', 'nbilin'),
+    ('var2',        'q', 'nbilin'),
+    ('coef',        'd', 'nbilin'),
+)
+
+def _view(buf, start, end, typecode):
+    '''Returns the bytes buf[start:end] as an array of typecode'''
+    try:
+        return memoryview(buf)[start:end].cast(typecode)
+    except AttributeError:
+        # Python 2 memoryviews can't be cast, so copy instead
+        return array('l' if typecode == 'q' else typecode, buf[start:end])
+
+def _read_columns(buf):
+    '''Checks the header and returns a dict of column views'''
+    if len(buf) < _header.size:
+        raise SolverError('not a model file')
+    magic, version, nvars, ncons, nnz, nbilin = _header.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise SolverError('not a model file')
+    if version != VERSION:
+        raise SolverError('unsupported model file version or byte order')
+
+    sizes = {
+        'nvars': nvars, 'ncons': ncons, 'nrows': ncons + 1,
+        'nnz': nnz, 'nbilin': nbilin
+    }
+    columns = {}
+    offset = _header.size
+    for name, typecode, size in _columns:
+        end = offset + 8 * sizes[size]
+        if end > len(buf):
+            raise SolverError('model file is truncated')
+        columns[name] = _view(buf, offset, end, typecode)
+        offset = end
+    return columns
+
+def load_model(solver, path):
+    '''
+    Adds the variables and constraints in a model file to a solver.  The
+    file is mapped into memory, and its columns are passed to SCIP as
+    buffers without copying them.  Variables of each type are added as
+    variable_blocks, and runs of linear constraints as constraint_blocks.
+    Constraints with bilinear terms get constraint objects, which are in
+    solver.constraints.  Constraints are added in the same order as they
+    are in the file.
+    '''
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            raise SolverError('not a model file')
+
+    # The map is closed once the last view of it goes away
+    columns = _read_columns(buf)
+    start = len(solver.variables)
+    nvars = len(columns['vartype'])
+    ncons = len(columns['cons_lower'])
+
+    # Runs of variables with the same type become variable blocks
+    vartype = columns['vartype']
+    first = 0
+    for i in range(1, nvars + 1):
+        if i == nvars or vartype[i] != vartype[first]:
+            solver.add_variables(
+                i - first, vartype[first],
+                coefficient = columns['coefficient'][first:i],
+                lower = columns['lower'][first:i],
+                upper = columns['upper'][first:i]
+            )
+            first = i
+
+    variables = solver.variables
+    for i, p in enumerate(columns['priority']):
+        if p:
+            variables[start+i].priority = p
+
+    if not ncons:
+        return
+
+    # Variable indices in the file start at zero, so they have to be
+    # shifted if the solver already had variables
+    indices = columns['indices']
+    if start:
+        indices = array('l', (j + start for j in indices))
+
+    # Runs of linear rows are added as constraint blocks, and rows with
+    # bilinear terms as constraints in between, so rows stay in file order.
+    # Row offsets don't have to start at zero, so each run just passes 
+    # its slice of indptr along with the whole index and data columns.
+    indptr, bilinptr = columns['indptr'], columns['bilinptr']
+    cons_lower, cons_upper = columns['cons_lower'], columns['cons_upper']
+    var1, var2, coef = columns['var1'], columns['var2'], columns['coef']
+    inf = float('inf')
+
+    if not len(coef):
+        solver.add_constraints_csr(indptr, indices, columns['data'], cons_lower, cons_upper)
+        return
+
+    first = 0
+    for r in range(ncons + 1):
+        if r < ncons and bilinptr[r] == bilinptr[r+1]:
+            continue
+
+        if first < r:
+            solver.add_constraints_csr(
+                indptr[first:r+1], indices, columns['data'],
+                cons_lower[first:r], cons_upper[first:r]
+            )
+        first = r + 1
+        if r == ncons:
+            break
+
+        a, b = bilinptr[r], bilinptr[r+1]
+        lower, upper = cons_lower[r], cons_upper[r]
+        cons = constraint.__new__(constraint)
+        cons._init_arrays(
+            solver,
+            indices[indptr[r]:indptr[r+1]],
+            columns['data'][indptr[r]:indptr[r+1]],
+            [variables[start+j] for j in var1[a:b]],
+            [variables[start+j] for j in var2[a:b]],
+            list(coef[a:b]),
+            None if lower == -inf else lower,
+            None if upper ==  inf else upper
+        )
+        solver.constrain(cons)
@@ -0,0 +1,192 @@
+'''
+Racing the same model with different settings in separate processes.
+How long SCIP takes on a model can depend a great deal on its settings,
+so it often pays to try several at once and keep whichever finishes
+first.  The model is built by a function that takes a solver and returns
+an objective, and each configuration changes solver settings::
+
+    def knapsack(solver):
+        x = solver.add_variables(100, scip.BINARY, coefficient=values)
+        solver += scip.linexpr(x, weights) <= capacity
+        return None # use variable coefficients
+
+    configs = [
+        {},
+        {'heuristics': {'octane': {'priority': 500}}},
+        {'branching': {'pscost': {'priority': 100000}}}
+    ]
+
+    result = scip.race(knapsack, configs, sense='max', workers=3)
+    print(configs[result.index], result.status, result.objective)
+
+A configuration is a dict of setting groups, as in solver.heuristics,
+keyed on plugin name and then attribute name.  It can also be a function
+that takes a solver and changes whatever it likes.  Builders and
+configuration functions are sent to worker processes, so they have to be
+picklable, such as functions defined at module level.
+'''
+
+from array import array
+from collections import namedtuple
+from zibopt import _scip
+from zibopt._batch import _status
+import time
+
+__all__ = 'race', 'race_result'
+
+SolverError = _scip.error
+
+race_result = namedtuple('race_result', 'index status objective values')
+race_result.__doc__ = '''
+Result of scip.race.  Fields:
+
+    - index:     position of the configuration that found the result, or
+      None if there isn't one
+    - status:    'optimal', 'infeasible', 'unbounded', 'inforunbd', or
+      'stopped' if the deadline passed first
+    - objective: objective value of the best solution, or None
+    - values:    array('d') of variable values in index order, or None
+'''
+
+def _configure(solver, config):
+    # Applies a configuration dict or function to a solver
+    if callable(config):
+        config(solver)
+        return
+
+    for group, plugins in config.items():
+        settings = getattr(solver, group)
+        for name, attributes in plugins.items():
+            for attribute, value in attributes.items():
+                setattr(settings[name], attribute, value)
+
+def _race(index, build, config, sense, primal, time_limit, queue):
+    # Builds and solves the model in a worker process.  New incumbents are
+    # reported as they are found, so the best one so far survives the
+    # worker being killed.
+    from zibopt._solver import solver as scip_solver
+
+    try:
+        solver = scip_solver()
+        objective = build(solver)
+        _configure(solver, config)
+
+        def report(incumbent):
+            # The values array is reused, and the queue pickles it later
+            queue.put(('incumbent', index, incumbent.objective, array('d', incumbent.values)))
+        solver.on_solution(report, values=True)
+
+        kwds = {}
+        if objective is not None:
+            kwds['objective'] = objective
+        if time_limit is not None:
+            kwds['time'] = time_limit
+        if primal is not None:
+            kwds['solution'] = primal
+
+        if sense == 'max':
+            solution = solver.maximize(**kwds)
+        else:
+            solution = solver.minimize(**kwds)
+
+        values = solution.values_array() if solution else None
+        queue.put(('done', index, _status(solution), solution.objective, values))
+
+    except Exception as e:
+        queue.put(('error', index, '%s: %s' % (type(e).__name__, e)))
+
+def race(build, configs, sense='min', workers=None, deadline=None):
+    '''
+    Solves the same model with each configuration in its own process and
+    returns a race_result for the first one to finish.  The rest are
+    killed.  Parameters:
+
+        - build:         function that adds variables and constraints to
+          a solver and returns the objective, or None to use variable
+          coefficients
+        - configs:       list of configuration dicts or functions
+        - sense='min':   'max' or 'min'
+        - workers=None:  number of processes to run at once.  Defaults to
+          one per configuration.  Further configurations start as others
+          stop at limits they set.
+        - deadline=None: wall-clock time, as from time.time(), by which to
+          stop.  The best solution found by then is returned with status
+          'stopped'.
+
+    Every incumbent a worker finds is sent back as it is found.  SCIP
+    can't take new solutions in the middle of a solve, so they can't be
+    passed to workers that are already running.  Instead, the best one so
+    far is used as a starting solution for each worker started later.
+    '''
+    import multiprocessing
+    try:
+        from queue import Empty
+    except ImportError:
+        from Queue import Empty
+
+    configs = list(configs)
+    if workers is None:
+        workers = len(configs)
+    if sense not in ('max', 'min'):
+        raise SolverError("sense must be 'max' or 'min'")
+
+    def better(a, b):
+        return b is None or (a > b if sense == 'max' else a < b)
+
+    queue = multiprocessing.Queue()
+    waiting = list(range(len(configs)))
+    running = {}
+    best = best_values = best_index = None
+    result = None
+
+    try:
+        while result is None and (waiting or running):
+            while waiting and len(running) < workers:
+                i = waiting.pop(0)
+                remaining = None if deadline is None else max(0.0, deadline - time.time())
+                p = multiprocessing.Process(target=_race, args=(
+                    i, build, configs[i], sense, best_values, remaining, queue
+                ))
+                p.daemon = True
+                p.start()
+                running[i] = p
+
+            # Wake up every so often to look for workers that crashed
+            timeout = 1.0
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.time())
+                if timeout <= 0:
+                    break
+
+            try:
+                message = queue.get(timeout=timeout)
+            except Empty:
+                for i, p in running.items():
+                    if p.exitcode:
+                        raise SolverError('configuration %d exited with code %d' % (i, p.exitcode))
+                continue
+
+            kind, i = message[:2]
+            if kind == 'incumbent':
+                if better(message[2], best):
+                    best, best_values, best_index = message[2], message[3], i
+
+            elif kind == 'done':
+                running.pop(i).join()
+                status, objective, values = message[2:]
+                if status != 'stopped':
+                    result = race_result(i, status, objective, values)
+                elif values is not None and better(objective, best):
+                    best, best_values, best_index = objective, values, i
+
+            else:
+                raise SolverError('configuration %d failed: %s' % (i, message[2]))
+
+    finally:
+        for p in running.values():
+            p.terminate()
+            p.join()
+
+    if result is None:
+        result = race_result(best_index, 'stopped', best, best_values)
+    return result
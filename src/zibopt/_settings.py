@@ -51,6 +51,12 @@ any other settings, and what they do.
 from zibopt import (
     _branch, _conflict, _disp, _heur, _nodesel, _presol, _prop, _sepa
 )
+import weakref
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
 __all__ = (
     'BranchingError', 
@@ -73,3 +79,43 @@ PropagatorError = _prop.error
 SelectorError   = _nodesel.error
 SeparatorError  = _sepa.error
 
+class settings_dict(Mapping):
+    '''
+    Read-only dictionary of setting objects for a solver, such as 
+    solver.branching.  SCIP has hundreds of these plugins, so the names
+    are only loaded when first needed, and the object for each setting
+    is only built when it is first accessed.
+    '''
+    def __init__(self, solver, setting_type, names):
+        # A weak reference avoids a cycle through the solver's __dict__,
+        # which would keep SCIP around until the garbage collector ran.
+        self._solver = weakref.ref(solver)
+        self._type = setting_type
+        self._names = names
+        self._keys = None
+        self._settings = {}
+
+    def _load_keys(self):
+        if self._keys is None:
+            self._keys = getattr(self._solver(), self._names)()
+            self._key_set = frozenset(self._keys)
+        return self._keys
+
+    def __getitem__(self, name):
+        try:
+            return self._settings[name]
+        except KeyError:
+            if name not in self:
+                raise
+            s = self._settings[name] = self._type(self._solver(), name)
+            return s
+
+    def __contains__(self, name):
+        self._load_keys()
+        return name in self._key_set
+
+    def __iter__(self):
+        return iter(self._load_keys())
+
+    def __len__(self):
+        return len(self._load_keys())
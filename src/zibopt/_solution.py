@@ -1,9 +1,76 @@
-from zibopt import _soln
+from array import array
+from collections import namedtuple
+from zibopt import _scip, _soln
 
-__all__ = 'solution', 'SolutionError'
+__all__ = (
+    'solution', 'incumbent', 'statistics', 'plugin_statistics', 'progress',
+    'SolutionError'
+)
 
 SolutionError = _soln.error
 
+incumbent = namedtuple('incumbent', 'objective gap time values')
+incumbent.__doc__ = '''
+New best solution found during a solve, as given to solver.on_solution
+callbacks.  Fields:
+
+    - objective: objective value of the solution
+    - gap:       gap between primal and dual bounds at the time
+    - time:      seconds spent solving so far
+    - values:    array('d') of variable values in index order, or None if
+      values were not asked for
+'''
+
+statistics = namedtuple('statistics', 'time presolving_time root_time '
+    'tree_time nodes lp_iterations root_lp_iterations primal_bound '
+    'dual_bound gap history heuristics separators propagators presolvers')
+statistics.__doc__ = '''
+Counters from a solve, as given by solution.statistics and 
+solver.statistics().  Fields:
+
+    - time:               seconds spent solving, including presolving
+    - presolving_time:    seconds spent presolving
+    - root_time:          seconds spent on the root node after presolving
+    - tree_time:          seconds spent after the root node
+    - nodes:              number of branch and bound nodes, including any
+      from before restarts
+    - lp_iterations:      number of simplex iterations
+    - root_lp_iterations: number of simplex iterations at the root
+    - primal_bound:       objective value of the best solution
+    - dual_bound:         best proven bound on the objective value
+    - gap:                gap between primal and dual bounds
+    - history:            list of (time, primal_bound, dual_bound) tuples,
+      one for each new incumbent
+    - heuristics:         dict of plugin_statistics by heuristic name
+    - separators:         same, by separator name
+    - propagators:        same, by propagator name
+    - presolvers:         same, by presolver name
+'''
+
+plugin_statistics = namedtuple('plugin_statistics', 'calls time found')
+plugin_statistics.__doc__ = '''
+Statistics for a single heuristic, separator, propagator, or presolver.
+Fields:
+
+    - calls: number of times it was called
+    - time:  seconds spent in it
+    - found: solutions found by a heuristic, cuts found by a separator,
+      domain reductions found by a propagator, or variables fixed or
+      aggregated plus constraints deleted by a presolver
+'''
+
+progress = namedtuple('progress', 'time primal_bound dual_bound gap nodes')
+progress.__doc__ = '''
+Samples of how a solve progressed, as given by solver.progress().  Each
+field is an array('d') with one element per sample, oldest first:
+
+    - time:         seconds spent solving
+    - primal_bound: objective value of the best solution so far
+    - dual_bound:   best proven bound on the objective value
+    - gap:          gap between primal and dual bounds
+    - nodes:        number of branch and bound nodes so far
+'''
+
 class solution(_soln.solution):
     '''
     A solution to a mixed integer program from SCIP.  Solution values can
@@ -24,10 +91,49 @@ class solution(_soln.solution):
         - solution.infeasible:  no feasible solution could be found
         - solution.unbounded:   solution is unbounded
         - solution.inforunbd:   solution is either infeasible or unbounded
+
+    Values for many variables at once are much faster to get as arrays::
+
+        x = solver.add_variables(100000)
+        ...
+        values = solution.values_array(x)
+        indices, values = solution.nonzeros(x)
+
+    LP dual values and reduced costs come the same way::
+
+        duals = solution.duals(rows)   # rows is a constraint_block
+        costs = solution.reduced_costs(x)
+
+    solution.statistics holds node counts, timings, and other statistics
+    about the solve that found the solution (see scip.statistics)::
+
+        print(solution.statistics.nodes, solution.statistics.time)
+        print(solution.statistics.heuristics['rounding'].found)
+
+    They are collected the first time solution.statistics is read, so
+    read them before solving again or changing the problem.
     '''
     def __init__(self, solver):
         super(solution, self).__init__(solver)
         self.solver = solver
+        self._statistics = None
+        self._nsolves = solver.nsolves
+
+    @property
+    def statistics(self):
+        '''
+        Statistics about the solve that found the solution.  Raises a 
+        SolutionError if the solver has solved again since, or if SCIP no
+        longer has them because the problem changed.
+        '''
+        if self._statistics is None:
+            if self.solver.nsolves != self._nsolves:
+                raise SolutionError('solver has solved again since this solution')
+            try:
+                self._statistics = self.solver.statistics()
+            except _scip.error:
+                raise SolutionError('problem has changed since this solution')
+        return self._statistics
 
     def __bool__(self):
         return not (self.infeasible or self.unbounded or self.inforunbd)
@@ -43,8 +149,80 @@ class solution(_soln.solution):
         return self.value(key)
     
     def values(self):
-        vals = {}
-        for v in self.solver.variables:
-            vals[v] = self.value(v)
-        return vals
+        # Variables iterate in order of index, same as the array
+        return dict(zip(self.solver.variables, self.values_array()))
+
+    def _size(self, variables):
+        if variables is None:
+            return self.solver.nvars
+        return len(variables)
+
+    def values_array(self, variables=None, out=None):
+        '''
+        Returns solution values for a set of variables as an array, using
+        a single call into SCIP.  Parameters:
+
+            - variables=None: variable_block, sequence of variables, or 
+              integer array of variable indices.  Defaults to all variables
+              in the solver, in order of their indices.
+            - out=None:       writable array of floats to store the values
+              in, such as a numpy array.  If it is a contiguous array of 
+              doubles, SCIP writes into it directly.  A new array('d') is
+              created if not given.
+        '''
+        if out is None:
+            out = array('d', [0.0]) * self._size(variables)
+        self.fill_values(variables, out)
+        return out
+
+    def nonzeros(self, variables=None):
+        '''
+        Returns only the nonzero values for a set of variables, as a pair
+        of arrays (indices, values).  Indices are positions within the
+        variables given, or variable indices if variables is None.  Takes
+        the same variables argument as solution.values_array.
+        '''
+        n = self._size(variables)
+        indices = array('l', [0]) * n
+        values = array('d', [0.0]) * n
+        nnz = self.fill_nonzeros(variables, indices, values)
+        del indices[nnz:]
+        del values[nnz:]
+        return indices, values
+
+    def duals(self, constraints=None, out=None):
+        '''
+        Returns LP dual values for a set of linear constraints as an array,
+        in a single pass through SCIP.  Dual values are signed the same 
+        way as constraint.dual_sol_linear.  Constraints that presolving
+        removed have duals of zero, and those that aren't linear, or that
+        presolving turned into some other kind of constraint, have NaN.
+        Parameters:
+
+            - constraints=None: constraint_block, sequence of constraints,
+              or integer array of constraint indices.  Defaults to every
+              constraint created with solver.constraint(...) or solver +=,
+              in order of their indices.
+            - out=None:         writable array of floats to store the 
+              values in, such as a numpy array.  A new array('d') is 
+              created if not given.
+
+        Transformed constraints are looked up once per solve, so reading
+        duals again after the same solve is faster.
+        '''
+        if out is None:
+            n = self.solver.nconss if constraints is None else len(constraints)
+            out = array('d', [0.0]) * n
+        self.fill_duals(constraints, out)
+        return out
 
+    def reduced_costs(self, variables=None, out=None):
+        '''
+        Returns LP reduced costs for a set of variables as an array.  
+        Variables that presolving fixed or aggregated have reduced costs
+        of zero.  Takes the same arguments as solution.values_array.
+        '''
+        if out is None:
+            out = array('d', [0.0]) * self._size(variables)
+        self.fill_redcosts(variables, out)
+        return out
@@ -1,11 +1,20 @@
 from algebraic.expression import expression
+from array import array
+from contextlib import contextmanager
+from functools import partial
 from zibopt import _scip
 from zibopt import (
     _branch, _conflict, _disp, _heur, _nodesel, _presol, _prop, _sepa
 )
-from zibopt._constraint import constraint
-from zibopt._solution import solution
-from zibopt._variable import variable
+from zibopt._constraint import constraint, constraint_block, _single_bound
+from zibopt._indexed import indexed_set, lazy_range
+from zibopt._linexpr import linexpr
+from zibopt._model import load_model
+from zibopt._settings import settings_dict
+from zibopt._solution import (
+    solution, incumbent, statistics, plugin_statistics, progress
+)
+from zibopt._variable import variable, variable_block
 import sys
 
 __all__ = 'solver', 'SolverError', 'BINARY', 'INTEGER', 'IMPLINT', 'CONTINUOUS'
@@ -17,29 +26,84 @@ CONTINUOUS = _scip.CONTINUOUS
 
 SolverError = _scip.error
 
+def _linear_row(expr):
+    '''Converts a linear constraint to (indices, coefficients, lower, upper)'''
+    if expr.expr_lower is None and expr.expr_upper is None:
+        raise SolverError('lazy constraints must have bounds')
+
+    indices = array('l')
+    coefficients = array('d')
+    constant = 0.0
+    for term, coef in expr.terms.items():
+        if not term:
+            constant += coef
+        elif len(term) == 1:
+            indices.append(term[0].index)
+            coefficients.append(coef)
+        else:
+            raise SolverError('lazy constraints must be linear')
+
+    inf = float('inf')
+    lower = -inf if expr.expr_lower is None else expr.expr_lower - constant
+    upper =  inf if expr.expr_upper is None else expr.expr_upper - constant
+    return indices, coefficients, lower, upper
+
 class solver(_scip.solver):
     '''
     Instantiates a A SCIP mixed integer programming solver with default 
     settings.  Parameters:
     
         - quiet=True: turns the SCIP solver output off
+        - lean=False: keeps constraints from storing copies of their 
+          coefficients, which SCIP already has.  This saves a good deal of
+          memory on large models, but makes constraint.coefficients slower.
+        - drop_tolerance=0.0: leaves terms with coefficients smaller than 
+          this out of new constraints.  Terms with zero coefficients are 
+          always left out.
+
+    Terms in each new constraint are sorted by variable, and repeated
+    variables or pairs of variables, like x*y and y*x, are merged into one
+    term.  solver.ndropped counts the terms this has saved SCIP from
+    storing, and so does constraint.ndropped for each constraint.
 
     Normal behavior is to instantiate a solver, define variables and 
     constraints for it, and then maximize or minimize an objective function.
+
+    The GIL is released while SCIP solves, so independent solvers can be 
+    run in separate threads.  A solver that is busy solving in one thread
+    raises an error if another thread tries to use it (see solver.busy).
+
+    Solving again with a different objective only changes the coefficients
+    that differ.  If nothing about the model has changed since a solve
+    that stopped at a time or gap limit, SCIP picks up where it left off,
+    so it can be continued by calling maximize again.  Solves that ran to
+    the end start over, so settings and callbacks changed since then
+    take effect.
+
+    solver.variables and solver.constraints are sets that iterate in order 
+    of creation.  Every variable and constraint has an index, and 
+    solver.variables[i] is the variable with index i.
     '''
     def __init__(self, *args, **kwds):
+        self.lean = kwds.pop('lean', False)
         super(solver, self).__init__(*args, **kwds)
-        self.variables = set()
-        self.constraints = set()
-
-        self.branching   = {n:_branch.branching_rule(self, n) for n in self.branching_names()}
-        self.conflict    = {n:_conflict.conflict(self, n) for n in self.conflict_names()}
-        self.display     = {n:_disp.display_column(self, n) for n in self.display_names()}
-        self.heuristics  = {n:_heur.heuristic(self, n) for n in self.heuristic_names()}
-        self.presolvers  = {n:_presol.presolver(self, n) for n in self.presolver_names()}
-        self.propagators = {n:_prop.propagator(self, n) for n in self.propagator_names()}
-        self.selectors   = {n:_nodesel.selector(self, n) for n in self.selector_names()}
-        self.separators  = {n:_sepa.separator(self, n) for n in self.separator_names()}
+        self.variables = indexed_set()
+        self.constraints = indexed_set()
+        self._pending = None # constraints waiting on the end of a batch
+        self._objective_offset = 0.0 # constant term of an objective read from a file
+        self._names = False # whether names came from a file
+        self._solution_callbacks = []
+        self._lazy_callbacks = []
+
+        # Settings objects are only built when they are accessed
+        self.branching   = settings_dict(self, _branch.branching_rule, 'branching_names')
+        self.conflict    = settings_dict(self, _conflict.conflict, 'conflict_names')
+        self.display     = settings_dict(self, _disp.display_column, 'display_names')
+        self.heuristics  = settings_dict(self, _heur.heuristic, 'heuristic_names')
+        self.presolvers  = settings_dict(self, _presol.presolver, 'presolver_names')
+        self.propagators = settings_dict(self, _prop.propagator, 'propagator_names')
+        self.selectors   = settings_dict(self, _nodesel.selector, 'selector_names')
+        self.separators  = settings_dict(self, _sepa.separator, 'separator_names')
 
     def __iadd__(self, expr):
         '''
@@ -49,6 +113,10 @@ class solver(_scip.solver):
 
             solver += 1 <= x1 + 2*x2 <= 2
 
+        Constraints on a single variable, like 2*x1 <= 4, tighten its
+        bounds instead of adding a constraint, unless they conflict with
+        the bounds it already has.
+
         Alternatively, if the constraint already exists in a variable and
         has been removed, it may be reintroduced into the solver this way.:
 
@@ -57,6 +125,9 @@ class solver(_scip.solver):
         if isinstance(expr, constraint):
             # Is already a constraint
             self.constrain(expr)
+        elif self._tighten_bounds(expr):
+            # Was a bound on one variable
+            pass
         else:
             # Create a new one
             self.constraint(expr)
@@ -76,11 +147,58 @@ class solver(_scip.solver):
         self.unconstrain(constraint)
         return self
 
+    def _tighten_bounds(self, expr):
+        '''
+        Turns a constraint on a single variable into tighter bounds on it.
+        Returns False if it isn't one, or if the bounds would conflict.
+        '''
+        bound = _single_bound(expr)
+        if bound is None:
+            return False
+
+        v, lower, upper = bound
+        try:
+            super(solver, self).set_bounds([v], lower, upper, 1)
+        except SolverError:
+            return False
+
+        # Same as for constraints, bounds on expressions don't stick
+        expr._clear_bounds()
+        return True
+
+    def set_bounds(self, variables, lower=None, upper=None):
+        '''
+        Changes bounds on many variables in one call.  Bounds can be 
+        relaxed as well as tightened.  Returns the number of bounds that
+        changed.  Parameters:
+
+            - variables:  variable_block, integer array of variable 
+              indices, or sequence of variables
+            - lower=None: new lower bounds
+            - upper=None: new upper bounds
+
+        Bounds can be single numbers, which apply to every variable, or
+        arrays with one element per variable.  None leaves those bounds
+        alone, and so do NaN elements of an array::
+
+            x = solver.add_variables(1000, scip.INTEGER, upper=10)
+            solver.set_bounds(x, upper=array('d', limits))
+            solver.set_bounds(array('l', fixed), fixed_values, fixed_values)
+
+        If any lower bound would end up above its upper bound, nothing is
+        changed and a SolverError is raised.  SCIP goes back to the 
+        original problem once if anything changes.
+        '''
+        return super(solver, self).set_bounds(variables, lower, upper)
+
     def _update_coefficients(self, expr, opt_type):
         '''Allows use of algebraic format for objective functions'''
-        # Clear out old coefficients.  This may require freeing the transformed
-        # problem, thus the restart.
-        self.restart()
+        # Coefficients in a linexpr can go straight to SCIP
+        if isinstance(expr, linexpr):
+            if expr.expr_upper is not None or expr.expr_lower is not None:
+                raise SolverError('objective functions should not have bounds')
+            self.set_objective(expr.indices, expr.coefficients)
+            return
 
         # Make sure it's actually an expression.  It could be a constant.
         if isinstance(expr, int) or isinstance(expr, float):
@@ -107,12 +225,179 @@ class solver(_scip.solver):
                 expr = expression({(z,):1.0})
                 break
 
-        # Now set linear coefficients on the objective function
-        for v in self.variables:
-            try:
-                v.set_coefficient(expr[(v,)])
-            except:
-                v.set_coefficient(0.0)
+        # Now set linear coefficients on the objective function.  Anything
+        # not in the expression, including unaccessed block variables, is 0.
+        # SCIP only sees the coefficients that changed, and if none did, 
+        # an interrupted solve is picked up where it left off.
+        indices = array('l')
+        coefficients = array('d')
+        for term, coef in expr.terms.items():
+            if len(term) == 1 and term[0] in self.variables:
+                indices.append(term[0].index)
+                coefficients.append(coef)
+        self.set_objective(indices, coefficients)
+
+    def _set_primal_solutions(self, kwds):
+        '''Turns solution and incumbent instances into arrays of values'''
+        def values(s):
+            if isinstance(s, solution):
+                return s.values_array()
+            elif isinstance(s, incumbent):
+                return s.values
+            return s
+
+        solutions = kwds.get('solution')
+        if isinstance(solutions, list) or (isinstance(solutions, tuple) and 
+            not isinstance(solutions, incumbent)):
+            kwds['solution'] = [values(s) for s in solutions]
+        elif solutions is not None:
+            kwds['solution'] = values(solutions)
+
+    def _set_incumbent_callback(self, kwds):
+        '''Sets up calls to solver.on_solution callbacks for a solve'''
+        callbacks = list(self._solution_callbacks)
+        if not callbacks:
+            return
+
+        # One array is shared by every callback and incumbent
+        values = None
+        if any(want_values for _, want_values in callbacks):
+            values = array('d', [0.0]) * self.nvars
+
+        def incumbent_callback(objective, gap, time):
+            for callback, want_values in callbacks:
+                callback(incumbent(objective, gap, time, values if want_values else None))
+
+        kwds['incumbent'] = incumbent_callback
+        kwds['incumbent_values'] = values
+
+    def _set_lazy_callback(self, kwds):
+        '''Sets up calls to solver.lazy_constraints callbacks for a solve'''
+        callbacks = list(self._lazy_callbacks)
+        if not callbacks:
+            return
+
+        values = array('d', [0.0]) * self.nvars
+
+        def lazy_callback(mode):
+            rows = []
+            for callback, separate in callbacks:
+                if mode == 'separate' and not separate:
+                    continue
+                for expr in callback(values) or ():
+                    rows.append(_linear_row(expr))
+            return rows
+
+        kwds['lazy'] = lazy_callback
+        kwds['lazy_values'] = values
+        kwds['lazy_separate'] = any(separate for _, separate in callbacks)
+
+    def lazy_constraints(self, callback, separate=False):
+        '''
+        Registers a function that generates constraints as they are needed
+        during a single solve, instead of solving, adding constraints, and
+        starting over.  It is called with an array('d') of candidate 
+        values for every variable in index order, and returns a list of
+        linear constraints the candidate violates, if any::
+
+            def capacity(values):
+                if values[x1.index] + values[x2.index] > 3:
+                    return [x1 + x2 <= 3]
+            solver.lazy_constraints(capacity)
+
+        Candidates are integral solutions about to be accepted, and SCIP
+        keeps solving with any violated constraints added.  Constraints
+        returned that the candidate does not violate are ignored.  Added
+        constraints last until the solver restarts.  Parameters:
+
+            - callback:       function taking an array of values, or None to
+              remove all callbacks
+            - separate=False: also call it with fractional LP solutions, so
+              constraints can be added before integral candidates are found
+
+        Like solver.on_solution callbacks, these run while the solver is
+        busy, and an exception stops the solve and is raised from maximize
+        or minimize.  Returns the callback, so this can be used as a 
+        decorator.
+        '''
+        if callback is None:
+            del self._lazy_callbacks[:]
+        else:
+            self._lazy_callbacks.append((callback, separate))
+        return callback
+
+    def on_solution(self, callback, values=False):
+        '''
+        Registers a function to call each time SCIP finds a new best 
+        solution while solving.  It is called with an incumbent instance,
+        which has the objective, gap, solving time, and optionally the 
+        values of the solution::
+
+            def report(incumbent):
+                print(incumbent.objective, incumbent.gap, incumbent.time)
+            solver.on_solution(report)
+
+        Parameters:
+
+            - callback:     function taking an incumbent, or None to remove
+              all callbacks
+            - values=False: also pass the values of every variable as an
+              array('d') in index order.  The same array is overwritten for
+              each new incumbent, so copy it to keep it.
+
+        Callbacks run in the thread doing the solve while the solver is 
+        busy.  They may call solver.interrupt() to stop early.  If one 
+        raises an exception, the solve stops and maximize or minimize 
+        raises it.  Returns the callback, so this can be used as a 
+        decorator.
+        '''
+        if callback is None:
+            del self._solution_callbacks[:]
+        else:
+            self._solution_callbacks.append((callback, values))
+        return callback
+
+    def statistics(self):
+        '''
+        Returns a statistics instance with node counts, timings, and plugin
+        counters for the last solve.  These are the same counters SCIP 
+        keeps anyway, so collecting them is cheap.  Raises a SolverError
+        if the problem has changed since it was solved.
+        '''
+        stats = super(solver, self).statistics()
+        for key in ('heuristics', 'separators', 'propagators', 'presolvers'):
+            stats[key] = dict(
+                (name, plugin_statistics(*s)) for name, s in stats[key].items()
+            )
+        return statistics(**stats)
+
+    def record_progress(self, interval=1.0, nodes=0, size=10000):
+        '''
+        Starts sampling the primal bound, dual bound, gap, and node count
+        during each solve.  Samples are kept in a ring buffer allocated up
+        front, so only the most recent ones are kept, and recording them 
+        doesn't create any Python objects.  Read them with 
+        solver.progress() after solving.  Parameters:
+
+            - interval=1.0: seconds between samples
+            - nodes=0:      also take a sample every this many nodes, if
+              it is greater than zero
+            - size=10000:   number of samples to keep.  Zero stops 
+              recording.
+
+        Samples are also taken at each new incumbent and at the end of
+        the solve.  Intervals are checked as nodes are solved.
+        '''
+        self.set_progress(size, interval, nodes)
+
+    def progress(self):
+        '''
+        Returns a progress instance with arrays of the samples taken during
+        the last solve, if solver.record_progress(...) was called first.
+        '''
+        fields = [array('d', [0.0]) * self.nsamples for _ in progress._fields]
+        self.fill_progress(*fields)
+        return progress(*fields)
 
     def variable(self, vartype=CONTINUOUS, coefficient=0, lower=0, **kwds):
         '''
@@ -128,6 +413,55 @@ class solver(_scip.solver):
         self.variables.add(v)
         return v
 
+    def add_variables(self, n, vartype=CONTINUOUS, coefficient=0, lower=0, **kwds):
+        '''
+        Adds n variables to the SCIP solver in one call and returns them
+        as a variable_block.  Parameters:
+
+            - n:                  number of variables to add
+            - vartype=CONTINUOUS: type of the variables
+            - coefficient=0:      objective function coefficients
+            - lower=0:            lower bounds on the variables
+            - upper=+inf:         upper bounds on the variables
+
+        Coefficients and bounds can be single numbers, which apply to every
+        variable in the block, or arrays of length n that support the 
+        buffer protocol, like array.array('d', ...) or numpy arrays.
+        '''
+        block = variable_block(self, n, vartype, coefficient, lower, **kwds)
+        self.variables.add_block(block)
+        return block
+
+    def add_constraints_csr(self, indptr, indices, data, lower=None, upper=None):
+        '''
+        Adds linear constraints stored as a sparse matrix in compressed
+        sparse row (CSR) format and returns them as a constraint_block.
+        Row r has coefficients data[indptr[r]:indptr[r+1]] on the variables
+        with solver indices indices[indptr[r]:indptr[r+1]].  For variables
+        in a variable_block, that index is block.start + i.  Parameters:
+
+            - indptr:     integer array of row offsets, with one more 
+              element than there are rows
+            - indices:    integer array of variable indices
+            - data:       array of coefficients
+            - lower=None: lower bounds on the rows
+            - upper=None: upper bounds on the rows
+
+        Bounds can be single numbers or arrays with one element per row.
+        At least one of lower or upper is required.  For instance, this 
+        adds x[0] + 2*x[1] <= 4 and x[1] + x[2] <= 3::
+
+            from array import array
+            x = solver.add_variables(3)
+            solver.add_constraints_csr(
+                array('i', [0, 2, 4]),
+                array('i', [x.start, x.start+1, x.start+1, x.start+2]),
+                array('d', [1, 2, 1, 1]),
+                upper = array('d', [4, 3])
+            )
+        '''
+        return constraint_block(self, indptr, indices, data, lower, upper)
+
     def constraint(self, expression):
         '''
         Adds a constraint to the solver.  Returns the constraint. The user 
@@ -146,11 +480,16 @@ class solver(_scip.solver):
                 )
             )
 
+        Long linear constraints are much faster to build as a linexpr, which
+        is passed to SCIP without converting it to an expression::
+
+            solver.constraint(scip.quicksum(x[i] for i in range(n)) <= 4)
+
         Parameters:
         
-            - expression: python-algebraic expression instance
+            - expression: python-algebraic expression or linexpr instance
         '''
-        cons = constraint(self, expression)
+        cons = constraint(self, expression, self.lean)
         self.constrain(cons)
         return cons
 
@@ -160,20 +499,219 @@ class solver(_scip.solver):
 
             - constraint: constraint instance to reinstall
         '''
-        if constraint not in self.constraints:
+        if self._pending is not None:
+            self._pending.append(constraint)
+        elif constraint not in self.constraints:
             constraint.register()
             self.constraints.add(constraint)
 
+    def add_many(self, constraints):
+        '''
+        Adds many constraints to the solver at once, and returns a list of
+        them.  If the solver has already solved, it only has to go back 
+        to the original problem once, instead of once per constraint.
+        Parameters:
+
+            - constraints: iterable of expressions, linexprs, or constraint
+              instances to add or reinstall
+        '''
+        result = []
+        new = []
+        seen = set()
+        for c in constraints:
+            if not isinstance(c, constraint):
+                c = constraint(self, c, self.lean)
+            result.append(c)
+            if c not in self.constraints and c not in seen:
+                seen.add(c)
+                new.append(c)
+
+        self.add_constraints(new)
+        self.constraints.update(new)
+        return result
+
+    @contextmanager
+    def batch(self):
+        '''
+        Context manager that holds onto constraints added with solver += 
+        or solver.constraint(...) and adds them all at once at the end of 
+        the block, like solver.add_many(...)::
+
+            with solver.batch():
+                for i in range(n):
+                    solver += x[i] + y[i] <= 1
+
+        Constraints are also added if the block raises an exception, or
+        when maximize or minimize is called inside it.
+        '''
+        if self._pending is not None:
+            # Already in a batch, which will add everything
+            yield self
+            return
+
+        self._pending = []
+        try:
+            yield self
+        finally:
+            self._add_pending(done=True)
+
+    def _add_pending(self, done=False):
+        '''Adds constraints waiting on the end of a batch'''
+        pending = self._pending
+        self._pending = None if done else []
+        if pending:
+            self.add_many(pending)
+
     def unconstrain(self, constraint):
         '''
         Removes a constraint from the solver.  Returns None.  Parameters:
             
             - constraint: constraint instance to remove
         '''
+        if self._pending and constraint in self._pending:
+            self._pending.remove(constraint)
         if constraint in self.constraints:
             self.constraints.remove(constraint)
             super(solver, self).unconstrain(constraint)
 
+    def remove_many(self, constraints):
+        '''
+        Removes many constraints from the solver at once.  Returns None.
+        If the solver has already solved, it only has to go back to the
+        original problem once, instead of once per constraint.  Constraints
+        that aren't in the solver are ignored, as with solver -= ...
+        Parameters:
+
+            - constraints: iterable of constraint instances to remove
+        '''
+        removed = indexed_set(constraints)
+        if self._pending:
+            self._pending = [c for c in self._pending if c not in removed]
+
+        removed = [c for c in removed if c in self.constraints]
+        super(solver, self).remove_constraints(removed)
+        self.constraints.difference_update(removed)
+
+    def save(self, path):
+        '''
+        Writes the variables and constraints to a model file, which 
+        scip.solver.load(path) reads back much faster than the model can
+        be built from scratch.  Variable types, bounds, objective
+        coefficients, and branching priorities are kept, as are linear 
+        and bilinear constraint terms and bounds.  Settings, solutions, 
+        and the objective sense are not.  The format is described in 
+        zibopt/_model.py.
+        '''
+        if self._pending:
+            self._add_pending()
+        super(solver, self).save(path)
+
+    @classmethod
+    def load(cls, path, **kwds):
+        '''
+        Returns a new solver with the model in a file written by 
+        solver.save(path).  The file is mapped into memory and passed to
+        SCIP in bulk, without building a Python object for every variable
+        and constraint.  Keyword arguments go to the solver constructor::
+
+            solver = scip.solver.load('model.bin', quiet=False)
+            x = solver.variables[0]
+
+        Linear constraints are added as a constraint_block, so they don't
+        show up in solver.constraints.  Constraints with bilinear terms do.
+        '''
+        s = cls(**kwds)
+        load_model(s, path)
+        return s
+
+    def read(self, path, format=None):
+        '''
+        Reads a problem from a file with one of SCIP's readers, such as
+        MPS, LP, CIP, or ZIMPL files, and returns the solver.  The solver 
+        has to be empty.  Parameters:
+
+            - path:        file to read
+            - format=None: file extension of the format, like 'mps' or 
+              'lp'.  Defaults to the extension of the path.
+
+        Python objects for the variables and constraints are only built 
+        when they are accessed through solver.variables and
+        solver.constraints, in the order they appear in the file whatever
+        their types, so variable i is also element i of 
+        solution.values_array().  Their objective coefficients are kept, 
+        so the problem can be solved with solver.minimize() or 
+        solver.maximize() and no objective.  The objective sense in the 
+        file is not kept.
+
+        Constraints of types besides linear and quadratic, which some
+        formats allow, can be solved and removed, but their terms can't 
+        be read.
+        '''
+        start, n, offset = super(solver, self).read(path, format)
+        self.variables.add_block(
+            lazy_range(0, self.nvars, partial(variable._from_solver, self))
+        )
+        self.constraints.add_block(
+            lazy_range(start, n, partial(constraint._from_solver, self))
+        )
+        self._objective_offset = offset
+        self._names = True
+        return self
+
+    def write(self, path, format=None, names=None):
+        '''
+        Writes the problem to a file with one of SCIP's writers, which 
+        stream it straight to disk.  This is handy for looking at a model
+        or passing it to other solvers.  Parameters:
+
+            - path:        file to write
+            - format=None: file extension of the format, like 'mps', 'lp',
+              or 'cip'.  Defaults to the extension of the path.
+            - names=None:  keep variable and constraint names.  Defaults
+              to True if the problem was read from a file, and False 
+              otherwise, since constraints built in Python don't have 
+              names.  Generic names like x1 and c1 are used instead.
+
+        The objective is whatever the last solve used, with its sense.
+        '''
+        if names is None:
+            names = self._names
+        if self._pending:
+            self._add_pending()
+        super(solver, self).write(path, format, 0 if names else 1)
+
+    def clone(self, **kwds):
+        '''
+        Returns an independent copy of the solver, with the same variables,
+        constraints, objective, and settings.  This is much faster than
+        building the model again, and the copy can be changed and solved
+        in another thread without affecting the original::
+
+            scenario = solver.clone()
+            x = scenario.variables[capacity.index]
+            scenario += x <= 90
+            solution = scenario.maximize()
+
+        Variables and constraints in the copy have the same indices as in
+        the original, so scenario.variables[v.index] is the copy of v.  
+        Their Python objects are only built when they are accessed.
+        Keyword arguments go to the solver constructor.  Callbacks from 
+        solver.on_solution(...) and solver.lazy_constraints(...) aren't 
+        copied, and neither are solutions.
+        '''
+        if self._pending:
+            self._add_pending()
+        kwds.setdefault('lean', self.lean)
+        kwds.setdefault('drop_tolerance', self.drop_tolerance)
+        other = type(self)(**kwds)
+        self.copy(other)
+
+        other.variables = self.variables.lazy_copy(partial(variable._from_solver, other))
+        other.constraints = self.constraints.lazy_copy(partial(constraint._from_solver, other))
+        other._objective_offset = self._objective_offset
+        other._names = self._names
+        return other
+
     def maximize(self, *args, **kwds):
         '''
         Maximizes the objective function and returns a solution instance.
@@ -181,23 +719,61 @@ class solver(_scip.solver):
 
             - objective:   optional algebraic representation of objective
               function.  Can also use variable coefficients.
-            - solution={}: optional primal solution dictionary.  Raises a
-              SolverError if the solution is infeasible.
+            - solution={}: optional primal solution, or list of them, to
+              start from.  Raises a SolverError if none are feasible.
             - time=inf:    optional time limit for solving
             - gap=0.0:     optional gap percentage to stop solving (ex: 0.05)
             - absgap=0.0:  optional primal/dual gap to stop solving
             - nsol=-1:     number of solutions to find before stopping
+
+        Primal solutions can be dictionaries of variables and values, or 
+        arrays of values in order of variable index, like those from
+        solution.values_array() and solver.on_solution(...).  Solution and
+        incumbent instances can be passed as well.  Solutions may be 
+        partial.  Variables left out of a dictionary, past the end of an 
+        array, or given NaN values are set to whichever value within their
+        bounds is closest to zero.
         '''
+        self._set_primal_solutions(kwds)
+        if self._pending:
+            self._add_pending()
         if 'objective' in kwds:
             try:
                 if isinstance(kwds['objective'], expression):
                     kwds['offset'] = kwds['objective'].terms[()]
+                elif isinstance(kwds['objective'], linexpr):
+                    kwds['offset'] = kwds['objective'].constant
             except KeyError:
                 pass
             self._update_coefficients(kwds.pop('objective'), 'max')
+            self._objective_offset = 0.0
+        else:
+            kwds.setdefault('offset', self._objective_offset)
+        self._set_incumbent_callback(kwds)
+        self._set_lazy_callback(kwds)
         super(solver, self).maximize(*args, **kwds)
         return solution(self)
         
+    def maximize_async(self, *args, **kwds):
+        '''
+        Coroutine version of solver.maximize(...) for use with asyncio 
+        (Python 3.5+).  The solve runs in a worker thread so the event loop
+        keeps running, and the result is the same solution instance::
+
+            solution = await solver.maximize_async(objective=x1+x2)
+
+        Cancelling the task interrupts SCIP and waits for it to stop, so
+        the solver can be used again afterward.  Takes the same parameters
+        as solver.maximize(...), plus:
+
+            - deadline=None: wall-clock time, as from time.time(), by which
+              the solve should stop.  This tightens any time limit given.
+            - executor=None: concurrent.futures executor to solve in, 
+              instead of the event loop's default executor.
+        '''
+        from zibopt._async import optimize_async
+        return optimize_async(self, self.maximize, *args, **kwds)
+
     def minimize(self, *args, **kwds):
         '''
         Minimizes the objective function and returns a solution instance.
@@ -205,20 +781,39 @@ class solver(_scip.solver):
 
             - objective:   optional algebraic representation of objective
               function.  Can also use variable coefficients.
-            - solution={}: optional primal solution dictionary.  Raises a
-              SolverError if the solution is infeasible.
+            - solution={}: optional primal solution, or list of them, to
+              start from.  See solver.maximize(...) for details.
             - time=inf:    optional time limit for solving
             - gap=0.0:     optional gap percentage to stop solving (ex: 0.05)
             - absgap=0.0:  optional primal/dual gap to stop solving
             - nsol=-1:     number of solutions to find before stopping
         '''
+        self._set_primal_solutions(kwds)
+        if self._pending:
+            self._add_pending()
         if 'objective' in kwds:
             try:
                 if isinstance(kwds['objective'], expression):
                     kwds['offset'] = kwds['objective'].terms[()]
+                elif isinstance(kwds['objective'], linexpr):
+                    kwds['offset'] = kwds['objective'].constant
             except KeyError:
                 pass
             self._update_coefficients(kwds.pop('objective'), 'min')
+            self._objective_offset = 0.0
+        else:
+            kwds.setdefault('offset', self._objective_offset)
+        self._set_incumbent_callback(kwds)
+        self._set_lazy_callback(kwds)
         super(solver, self).minimize(*args, **kwds)
         return solution(self)
-        
+
+    def minimize_async(self, *args, **kwds):
+        '''
+        Coroutine version of solver.minimize(...) for use with asyncio 
+        (Python 3.5+).  See solver.maximize_async(...) for details::
+
+            solution = await solver.minimize_async(objective=x1+x2)
+        '''
+        from zibopt._async import optimize_async
+        return optimize_async(self, self.minimize, *args, **kwds)
@@ -1,7 +1,7 @@
 from algebraic import variable as algvar
 from zibopt import _vars
 
-__all__ = 'variable', 'VariableError'
+__all__ = 'variable', 'variable_block', 'VariableError'
 
 VariableError = _vars.error
 
@@ -11,3 +11,44 @@ class variable(_vars.variable, algvar):
         _vars.variable.__init__(self, *args, **kwds)
         algvar.__init__(self, *args, **kwds)
 
+    @classmethod
+    def _from_solver(cls, solver, i):
+        '''Builds the object for variable i, if it came from a file'''
+        v = cls.__new__(cls)
+        solver.assign_variable(v, i)
+        algvar.__init__(v)
+        return v
+
+
+class variable_block(_vars.variable_block):
+    '''
+    A contiguous block of variables created by solver.add_variables(...).
+    The variables live in SCIP, and Python variable objects are only built
+    for elements that are actually accessed::
+
+        x = solver.add_variables(1000, scip.BINARY, coefficient=costs)
+        solver += x[0] + x[1] <= 1
+
+    Variable i of the block has solver index block.start + i, which is
+    what solver.add_constraints_csr(...) expects in its indices array.
+    '''
+    def __init__(self, solver, *args, **kwds):
+        super(variable_block, self).__init__(solver, *args, **kwds)
+        self.solver = solver
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError('variable index out of range')
+        return self.solver.variables[self.start + i]
+
+    def _build(self, i):
+        '''Builds the Python object for variable i of the block'''
+        v = variable.__new__(variable)
+        self.assign(v, i)
+        algvar.__init__(v)
+        return v
@@ -41,7 +41,8 @@ Translated to python-zibopt this becomes::
     x2 = solver.variable(scip.INTEGER)
     x3 = solver.variable(scip.INTEGER)
 
-    # x1 has an upper bound of 2
+    # x1 has an upper bound of 2.  This changes its bound in SCIP rather
+    # than adding a constraint.
     solver += x1 <= 2
 
     # Add a constraint such that:  x1 + x2 + 3*x3 <= 3
@@ -61,7 +62,11 @@ Translated to python-zibopt this becomes::
 '''
 
 # This provide more convenient namespacing
+from ._batch import *
 from ._constraint import *
+from ._linexpr import *
+from ._linprog import *
+from ._race import *
 from ._settings import *
 from ._solution import *
 from ._solver import *